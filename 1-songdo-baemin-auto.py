@@ -21,8 +21,28 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-# WebDriver Manager
-from webdriver_manager.chrome import ChromeDriverManager
+# chromedriver 고정 캐시 (오프라인)
+from driver_resolver import resolve_chromedriver
+
+# Chrome 워밍 풀 / 로그인 세션 저장소 / 요청 차단 / 팝업 자동 닫기
+from chrome_pool import lease_driver
+from session_store import restore_or_login
+from request_blocking import block_requests
+from popup_dismisser import (
+    install_popup_dismisser, popup_dismisser_paused, wait_popups_cleared, log_dismissed_popups
+)
+
+# 조건 기반 대기 (DOM 안정 / 네트워크 유휴 감지)
+from waits import (
+    wait_until, wait_dom_settled, element_present, any_of, css, log_wait_summary
+)
+from network_idle import network_idle, enable_network_log, log_network_summary
+# WebDriver 명령 수 계측
+from command_budget import instrument, log_command_summary
+# 주문내역 API 응답 캡처 (행 펼치기 대신)
+from baemin_api import OrderApiCapture, is_canceled, looks_complete
+# 대체 셀렉터 중 지난번에 맞은 후보부터 시도
+from selector_cache import find_first_match, is_usable, log_selector_stats
 
 # Google Sheets
 import gspread
@@ -101,18 +121,6 @@ def safe_click(driver, element):
     time.sleep(0.2)
     driver.execute_script("arguments[0].click();", element)
 
-# ======================================
-# 팝업 자동 닫기
-# ======================================
-def close_popup_if_exists(driver):
-    try:
-        backdrop = driver.find_element(By.CSS_SELECTOR, 'div.Dialog_b_c9kn_3pnjmu3')
-        safe_click(driver, backdrop)
-        time.sleep(0.5)
-        logging.info("팝업 닫기 성공")
-    except NoSuchElementException:
-        logging.info("팝업 없음")
-    
 def wait_and_click(driver, by, value, timeout=10):
     """
     element click intercepted 문제 해결용
@@ -177,6 +185,13 @@ class SeleniumDriverManager:
         self.driver = None
     
     def __enter__(self):
+        # 워밍 풀이 떠 있으면 탭을 임대하고, 없으면 새 Chrome 실행
+        self.driver = lease_driver(user_agent=self.user_agent, window_size=(1180, 980))
+        if self.driver:
+            block_requests(self.driver, "baemin")
+            install_popup_dismisser(self.driver, "baemin")
+            return self.driver
+
         options = webdriver.ChromeOptions()
         
         # 헤드리스 모드
@@ -191,6 +206,9 @@ class SeleniumDriverManager:
         options.add_argument(f"user-agent={self.user_agent}")
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-infobars")
+
+        # 네트워크 유휴 대기용 성능 로그
+        enable_network_log(options)
         
         # 예시: user-data-dir (원한다면 사용)
         # unique_dir = f"/tmp/chrome-user-data-{uuid.uuid4()}"
@@ -198,14 +216,16 @@ class SeleniumDriverManager:
 
         try:
             self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
+                service=Service(resolve_chromedriver()),
                 options=options
             )
             logging.info("WebDriver 초기화 성공")
         except WebDriverException as e:
             logging.error("WebDriver 초기화 실패")
             raise e
-        
+
+        block_requests(self.driver, "baemin")
+        install_popup_dismisser(self.driver, "baemin")
         return self.driver
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -283,6 +303,26 @@ class GoogleSheetsManager:
             logging.error(f"배치 업데이트 실패: {e}")
             raise e
     
+    def values_batch_clear(self, ranges):
+        """여러 시트의 범위를 API 한 번으로 비운다 (범위는 '시트명'!A1 형식)"""
+        try:
+            self.spreadsheet.values_batch_clear(body={"ranges": ranges})
+            logging.info(f"다음 범위를 Clear 완료: {ranges}")
+        except Exception as e:
+            logging.error(f"범위 Clear 실패: {e}")
+            raise e
+
+    def values_batch_update(self, data_list):
+        """여러 시트의 셀을 API 한 번으로 쓴다 (range는 '시트명'!A1 형식)"""
+        try:
+            self.spreadsheet.values_batch_update(
+                body={"valueInputOption": "USER_ENTERED", "data": data_list}
+            )
+            logging.info(f"배치 업데이트 완료 ({len(data_list)}개 범위)")
+        except Exception as e:
+            logging.error(f"배치 업데이트 실패: {e}")
+            raise e
+
     def format_cells_number(self, worksheet, cell_range):
         try:
             fmt = CellFormat(
@@ -298,6 +338,11 @@ class GoogleSheetsManager:
 ###############################################################################
 # 기능별 함수 (배민 사이트 크롤링)
 ###############################################################################
+# 로그인 후에만 보이는 화면 틀 (session_store의 baemin ready_marker와 동일)
+BAEMIN_READY_SELECTOR = "div.frame-container"
+CAPTCHA_SELECTOR = "#recaptcha-anchor, .g-recaptcha, iframe[src*='recaptcha'], iframe[title*='reCAPTCHA']"
+
+
 def login_and_close_popup(driver, wait, username, password):
     """
     배민 로그인 안정화 버전.
@@ -308,7 +353,8 @@ def login_and_close_popup(driver, wait, username, password):
     3. reCAPTCHA가 iframe 안에 있거나 동적으로 생성되는 경우를 고려.
     4. 자동으로 CAPTCHA를 우회하지 않고, 표시되면 사용자가 직접 확인할 시간을 제공.
     5. 로그인 버튼은 존재/클릭 가능 상태를 기다린 후 클릭.
-    6. 로그인 성공 여부를 URL 또는 로그인 화면 소멸로 확인.
+    6. 로그인 성공 여부를 로그인 후 화면, URL 또는 로그인 화면 소멸로 확인.
+    :return: 로그인 확인 여부 (False면 세션을 저장하지 않음)
     """
 
     driver.get("https://self.baemin.com/")
@@ -336,24 +382,9 @@ def login_and_close_popup(driver, wait, username, password):
         "input[autocomplete='username']",
     ]
 
-    username_element = None
-
-    for selector in username_selectors:
-        try:
-            elements = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-            )
-
-            for element in elements:
-                if element.is_displayed() and element.is_enabled():
-                    username_element = element
-                    break
-
-            if username_element:
-                break
-
-        except TimeoutException:
-            continue
+    username_element = find_first_match(
+        driver, "baemin.login.username", username_selectors, timeout=5, predicate=is_usable
+    )
 
     if username_element is None:
         raise RuntimeError("배민 로그인 아이디 입력창을 찾지 못했습니다.")
@@ -371,24 +402,9 @@ def login_and_close_popup(driver, wait, username, password):
         "input[autocomplete='current-password']",
     ]
 
-    password_element = None
-
-    for selector in password_selectors:
-        try:
-            elements = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-            )
-
-            for element in elements:
-                if element.is_displayed() and element.is_enabled():
-                    password_element = element
-                    break
-
-            if password_element:
-                break
-
-        except TimeoutException:
-            continue
+    password_element = find_first_match(
+        driver, "baemin.login.password", password_selectors, timeout=5, predicate=is_usable
+    )
 
     if password_element is None:
         raise RuntimeError("배민 로그인 비밀번호 입력창을 찾지 못했습니다.")
@@ -397,7 +413,15 @@ def login_and_close_popup(driver, wait, username, password):
     password_element.send_keys(password)
     logging.info("비밀번호 입력 완료")
 
-    time.sleep(5)
+    # reCAPTCHA가 뜨거나 로그인 버튼이 눌릴 수 있는 상태가 될 때까지 (고정 5초 대기 대체)
+    wait_until(
+        driver,
+        any_of(
+            element_present(css(CAPTCHA_SELECTOR)),
+            lambda d: any(b.is_enabled() for b in d.find_elements(By.CSS_SELECTOR, "form button")),
+        ),
+        5, "배민 로그인 입력"
+    )
 
     # ------------------------------------------------------------------
     # 4. CAPTCHA 확인
@@ -413,7 +437,7 @@ def login_and_close_popup(driver, wait, username, password):
         # 현재 문서에서 reCAPTCHA 관련 요소가 있는지 확인
         captcha_candidates = driver.find_elements(
             By.CSS_SELECTOR,
-            "#recaptcha-anchor, .g-recaptcha, iframe[src*='recaptcha'], iframe[title*='reCAPTCHA']"
+            CAPTCHA_SELECTOR
         )
 
         visible_captcha = [
@@ -439,7 +463,7 @@ def login_and_close_popup(driver, wait, username, password):
                     el.is_displayed()
                     for el in d.find_elements(
                         By.CSS_SELECTOR,
-                        "#recaptcha-anchor, .g-recaptcha, iframe[src*='recaptcha'], iframe[title*='reCAPTCHA']"
+                        CAPTCHA_SELECTOR
                     )
                 )
             )
@@ -458,24 +482,9 @@ def login_and_close_popup(driver, wait, username, password):
         "button[type='submit']",
     ]
 
-    login_button = None
-
-    for selector in login_button_selectors:
-        try:
-            elements = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-            )
-
-            for element in elements:
-                if element.is_displayed() and element.is_enabled():
-                    login_button = element
-                    break
-
-            if login_button:
-                break
-
-        except TimeoutException:
-            continue
+    login_button = find_first_match(
+        driver, "baemin.login.button", login_button_selectors, timeout=5, predicate=is_usable
+    )
 
     if login_button is None:
         raise RuntimeError("배민 로그인 버튼을 찾지 못했습니다.")
@@ -493,60 +502,154 @@ def login_and_close_popup(driver, wait, username, password):
     logging.info("로그인 버튼 클릭")
 
     # ------------------------------------------------------------------
-    # 6. 로그인 결과 대기
+    # 6. 로그인 결과 대기 (로그인 후 화면 표시 또는 로그인 화면 소멸)
     # ------------------------------------------------------------------
-    time.sleep(2)
-
-    try:
-        WebDriverWait(driver, 15).until(
+    logged_in = wait_until(
+        driver,
+        any_of(
+            element_present(css(BAEMIN_READY_SELECTOR)),
             lambda d: (
                 "self.baemin.com" in d.current_url
-                and not d.find_elements(
-                    By.CSS_SELECTOR,
-                    "input[type='password']"
-                )
-            )
-            or "/login" not in d.current_url.lower()
-        )
+                and not d.find_elements(By.CSS_SELECTOR, "input[type='password']")
+            ),
+        ),
+        15, "배민 로그인"
+    )
+    if logged_in:
         logging.info("로그인 화면 종료 확인")
-    except TimeoutException:
+    else:
         logging.warning(
             f"로그인 결과 확인 시간 초과. 현재 URL: {driver.current_url}"
         )
 
     # ------------------------------------------------------------------
     # 7. 로그인 후 팝업 닫기
+    #
+    # 팝업은 페이지 안 자동 닫기 스크립트(popup_dismisser)가 뜨는 즉시 닫으므로
+    # 이미 떠 있는 팝업이 닫혔는지만 확인합니다.
     # ------------------------------------------------------------------
-    popup_close_selectors = [
-        (
-            "div.OverlayHeader_b_r4ax_5xyph31."
-            "c_qx9u_13c33de0."
-            "c_qx9u_13ysz3p2."
-            "c_qx9u_13ysz3p0 "
-            "div:nth-child(1) > button"
-        )
+    if wait_popups_cleared(driver, "baemin"):
+        logging.info("팝업 없음 또는 자동으로 닫힘")
+    else:
+        logging.warning("팝업이 아직 남아 있음 → 그대로 진행")
+
+    return bool(logged_in)
+
+# ==============================
+# 주문내역 딥링크 (메뉴 클릭 + 필터 적용 생략)
+# ==============================
+# 직접 지정할 때: BAEMIN_ORDER_HISTORY_URL="https://self.baemin.com/...?startDate={ymd_dash}&endDate={ymd_dash}"
+ORDER_HISTORY_URL = os.getenv("BAEMIN_ORDER_HISTORY_URL")
+# 지정이 없으면 클릭 경로로 필터를 적용한 뒤의 주소에서 오늘 날짜를 자리표시자로 바꿔 기억해 둔다
+DEEPLINK_FILE = os.path.join(os.path.expanduser("~"), ".cache", "mugung-baemin-deeplink.json")
+FILTER_CONTAINER_SELECTOR = "div.FilterContainer-module___Rxt"
+
+
+def today_date_tokens(today=None):
+    today = today or datetime.datetime.now()
+    return {
+        "ymd_dash": today.strftime("%Y-%m-%d"),
+        "ymd_dot": today.strftime("%Y.%m.%d"),
+        "ymd": today.strftime("%Y%m%d"),
+    }
+
+
+def load_order_history_template():
+    if ORDER_HISTORY_URL:
+        return ORDER_HISTORY_URL
+    try:
+        with open(DEEPLINK_FILE, encoding="utf-8") as f:
+            return json.load(f).get("order_history")
+    except (OSError, ValueError):
+        return None
+
+
+def remember_order_history_url(driver):
+    """클릭 경로로 '오늘' 필터가 적용된 주소에 날짜가 들어 있으면 다음 실행용 딥링크로 저장"""
+    url = driver.current_url
+    template = url
+    for key, value in today_date_tokens().items():
+        template = template.replace(value, "{" + key + "}")
+    if template == url:
+        logging.info("주문내역 주소에 날짜가 없음 → 딥링크 저장 안 함 (클릭 경로 유지)")
+        return
+    if template == load_order_history_template():
+        return
+    os.makedirs(os.path.dirname(DEEPLINK_FILE), exist_ok=True)
+    with open(DEEPLINK_FILE, "w", encoding="utf-8") as f:
+        json.dump({"order_history": template, "learned_at": str(datetime.datetime.now())}, f, ensure_ascii=False)
+    logging.info(f"주문내역 딥링크 저장: {template}")
+
+
+def filter_shows_date(day=None):
+    """필터 영역에 day(기본 오늘) 날짜가 표시되면 참"""
+    day = day or datetime.date.today()
+    labels = list(today_date_tokens(day).values()) + [
+        f"{day.month}월 {day.day}일", day.strftime("%m.%d")
     ]
 
-    for popup_selector in popup_close_selectors:
-        try:
-            close_btn = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, popup_selector)
-                )
-            )
-            close_btn.click()
-            logging.info("팝업 닫기 성공")
-        except TimeoutException:
-            logging.info("팝업이 없거나 이미 닫힘")
-        except Exception as e:
-            logging.warning(f"팝업 닫기 실패: {e}")
+    def _condition(d):
+        text = d.find_element(By.CSS_SELECTOR, FILTER_CONTAINER_SELECTOR).text
+        return any(label in text for label in labels)
+    return _condition
+
+
+def open_order_history_deeplink(driver, capture=None, day=None):
+    """
+    day(기본 오늘) 날짜로 채운 주문내역 주소로 바로 이동하고, 필터 표시로 적용 여부를 확인한다.
+    :return: 성공하면 True (False면 메뉴 클릭 + 필터 적용 경로로 진행)
+    """
+    template = load_order_history_template()
+    if not template:
+        return False
+
+    url = template
+    for key, value in today_date_tokens(day).items():
+        url = url.replace("{" + key + "}", value)
+    if capture:
+        capture.clear()
+    with network_idle(driver, label="주문내역 딥링크"):
+        driver.get(url)
+    if wait_until(driver, filter_shows_date(day), 5, "딥링크 필터 확인"):
+        logging.info(f"주문내역 딥링크 이동 완료: {url}")
+        return True
+
+    logging.warning(f"딥링크 필터가 {day or '오늘'}로 확인되지 않음 ({url})")
+    return False
+
+
+def open_filtered_order_history(driver, wait, capture=None, day=None):
+    """
+    day(기본 오늘) 필터가 적용된 주문내역 화면을 연다 (딥링크 → 실패 시 메뉴 클릭 + 필터 적용).
+    클릭 경로는 '일・주'(오늘)만 고를 수 있으므로, 지난 날짜는 딥링크로만 연다.
+    """
+    if open_order_history_deeplink(driver, capture, day):
+        return
+    if day and day != datetime.date.today():
+        if load_order_history_template() is None:
+            # 아직 딥링크를 모르면 오늘 필터를 클릭 경로로 한 번 적용해 주소를 배운 뒤 다시 시도
+            logging.info("딥링크 없음 → 오늘 필터로 주소를 먼저 저장")
+            open_filtered_order_history(driver, wait)
+            if open_order_history_deeplink(driver, capture, day):
+                return
+        raise RuntimeError(f"{day} 주문내역으로 이동하지 못함 (주문내역 주소에 날짜가 없거나 딥링크 필터 확인 실패)")
+    with network_idle(driver, label="주문내역 진입"):
+        navigate_to_order_history(driver, wait)
+    if capture:
+        capture.clear()  # 필터 적용 전 기본 목록 응답은 버림
+    # 필터 시트도 다이얼로그라 적용하는 동안은 자동 닫기를 멈춤
+    with popup_dismisser_paused(driver):
+        set_daily_filter(driver, wait)
+    remember_order_history_url(driver)
+
 
 def navigate_to_order_history(driver, wait):
     menu_button_selector = "#root > div.Frame.medium > div.Container_c_qx9u_1utdzds5.MobileHeader-module__Zr4m > div > div > div:nth-child(1) > button"
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, menu_button_selector)))
     driver.find_element(By.CSS_SELECTOR, menu_button_selector).click()
 
-    time.sleep(3)
+    # 왼쪽 메뉴가 펼쳐지는 애니메이션/렌더링이 끝날 때까지
+    wait_dom_settled(driver, "div.frame-aside", quiet_ms=300, timeout=5, label="메뉴 펼침")
     order_history_selector = "#root > div.Frame.medium > div.frame-container.lnb-open > div.frame-aside > div > nav > div.LNBList-module__DDx5.LNB-module__whjk > div.Container_c_qx9u_1utdzds5 > a:nth-child(18) > button"
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, order_history_selector)))
     driver.find_element(By.CSS_SELECTOR, order_history_selector).click()
@@ -579,9 +682,10 @@ def set_daily_filter(driver, wait):
         apply_button = wait.until(EC.element_to_be_clickable((By.XPATH, apply_button_xpath)))
         driver.execute_script("arguments[0].scrollIntoView(true);", apply_button)
         time.sleep(0.3)
-        driver.execute_script("arguments[0].click();", apply_button)
-    
-        time.sleep(3)
+        # 필터 조회 요청이 끝나고 주문내역이 다시 그려질 때까지 대기
+        with network_idle(driver, label="일・주 필터 조회"):
+            driver.execute_script("arguments[0].click();", apply_button)
+        wait_dom_settled(driver, "div.OrderHistoryPage-module__R0bB", quiet_ms=200, timeout=5, label="일・주 필터 적용")
         logging.info("날짜 필터 '일・주' 적용 완료")
     except Exception as e:
         logging.warning(f"[set_daily_filter] 날짜 필터 적용 중 오류 발생: {e}")
@@ -597,10 +701,10 @@ def extract_order_summary(driver, wait):
     ]
 
     last_err = None
-    for css in selectors:
+    for selector in selectors:
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
-            text = driver.find_element(By.CSS_SELECTOR, css).text.strip()
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            text = driver.find_element(By.CSS_SELECTOR, selector).text.strip()
             if text:
                 logging.info(f"주문 요약 데이터: {text}")
                 return text
@@ -613,114 +717,412 @@ def extract_order_summary(driver, wait):
 # ==============================
 # 주문 상세 메뉴/수량 추출
 # ==============================
-def extract_sales_details(driver, wait):
-    price_tail_re = re.compile(r"\s*\([^)]*원\)\s*")
+ORDER_TABLE_XPATH = '//*[@id="root"]/div[1]/div[2]/div[2]/div/div[4]/div/div/table'
+
+# 주문 테이블을 실제 행 수대로 훑는다: 주문 n은 tr[2n-1](펼치기 버튼) + tr[2n](상세).
+# 메뉴 칸은 section[1]/div[3]/div[1, 4, 7, ...]이고 있는 칸 끝까지 읽는다 (9칸 제한 없음).
+# 주문별 펼침 상태는 상세 행이 보이고 내용(section)이 그려졌는지로 판단한다 (메뉴 수와 무관).
+# expand면 접혀 있는 주문의 버튼만 누른다 (이미 열린 주문은 메뉴를 못 읽어도 누르지 않음).
+# 주문번호는 주문 행(tr[2n-1]) 글자에서 orderNoPattern으로 찾는다 (못 찾거나 페이지 안에서 겹치면 null).
+# seen(체크포인트)에 있는 주문이 나오면 그 주문부터는 읽지도 펼치지도 않는다 (주문은 최신순).
+ORDER_TABLE_JS = """
+const [tableXPath, slotStep, expand, orderNoPattern, seen] = arguments;
+const first = (xpath, ctx) => document.evaluate(
+    xpath, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const all = (xpath, ctx) => {
+    const snap = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: snap.snapshotLength}, (_, i) => snap.snapshotItem(i));
+};
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const table = first(tableXPath, document);
+if (!table) return null;
+
+const rows = all('tbody/tr', table);
+const orderNoRe = new RegExp(orderNoPattern);
+const ids = [];
+for (let i = 0; i < rows.length; i += 2) {
+    if (!first('td/div', rows[i])) break;
+    const match = rows[i].innerText.match(orderNoRe);
+    ids.push(match ? match[0] : null);
+}
+const orderIds = ids.map(id => id && ids.indexOf(id) === ids.lastIndexOf(id) ? id : null);
+
+const lines = [], itemCounts = [], expanded = [];
+let clicked = 0, reachedSeen = false;
+for (let orderNo = 1; orderNo <= orderIds.length; orderNo++) {
+    if (orderIds[orderNo - 1] && seen.includes(orderIds[orderNo - 1])) { reachedSeen = true; break; }
+    const toggle = first('td/div', rows[2 * orderNo - 2]);
+    const detail = rows[2 * orderNo - 1];
+    const open = !!detail && visible(detail) && !!first('td/div/div/section', detail);
+    const slots = open ? all('td/div/div/section[1]/div[3]/div', detail) : [];
+
+    let found = 0;
+    for (let i = 0; i < slots.length; i += slotStep) {
+        const name = first('span[1]/div/span[1]', slots[i]);
+        const qty = first('span[1]/div/span[2]', slots[i]);
+        if (!name || !qty) break;
+        lines.push([orderNo, name.innerText, qty.innerText]);
+        found++;
+    }
+    if (!open && expand) { toggle.click(); clicked++; }
+    itemCounts.push(found);
+    expanded.push(open);
+}
+return {orders: itemCounts.length, lines, itemCounts, expanded, clicked,
+        orderIds: orderIds.slice(0, itemCounts.length), reachedSeen};
+"""
+ORDER_ITEM_SLOT_STEP = 3
+# 주문 행에서 주문번호로 볼 글자 (영문 대문자+숫자 10~20자, 숫자와 영문이 모두 있음)
+ORDER_NO_PATTERN = os.getenv("BAEMIN_ORDER_NO_PATTERN", r"\b(?=[A-Z0-9]*\d)(?=[A-Z0-9]*[A-Z])[A-Z0-9]{10,20}\b")
+ORDER_EXPAND_TIMEOUT = 5
+
+# 이전 방식 비교용 추정치 (측정값 아님): 페이지당 주문 10건을 가정하고, 없는 주문마다
+# 공용 WebDriverWait(30초)를 다 기다린 뒤 연속 2회 실패에서 멈췄다.
+LEGACY_ORDERS_PER_PAGE = 10
+LEGACY_WAIT_TIMEOUT = 30
+
+
+PRICE_TAIL_RE = re.compile(r"\s*\([^)]*원\)\s*")
+
+# dom: 항상 행 펼치기 / api: 주문내역 API 응답으로 집계 (실패하면 행 펼치기로 대체)
+# 응답 필드 이름이 실제 캡처로 확인되기 전까지는 dom이 기본값
+ORDER_SOURCE = os.getenv("BAEMIN_ORDER_SOURCE", "dom")
+
+
+def normalize_item_name(raw_name: str) -> str:
+    """'메뉴명 (12,000원)' → '메뉴명' (공백 정리 포함)"""
+    return re.sub(r"\s+", " ", PRICE_TAIL_RE.sub("", raw_name)).strip()
+
+
+def extract_qty(text: str) -> int:
+    m = re.search(r"\d+", text.replace(",", ""))
+    return int(m.group()) if m else 0
+
+
+def add_sales(sales_data, raw_name, qty, verbose=True):
+    item_name = normalize_item_name(raw_name)
+    if qty == 0:
+        return
+    if item_name in ITEM_TO_CELL:
+        cell = ITEM_TO_CELL[item_name]
+        sales_data[cell] = sales_data.get(cell, 0) + qty
+        if verbose:
+            logging.info(f"[집계] {item_name} → {cell} +{qty}")
+
+
+# ==============================
+# 당일 주문 체크포인트 (이미 집계한 주문은 다시 읽지 않음)
+#   {주문번호: [[메뉴명, 수량], ...]}를 매장/날짜별로 저장하고,
+#   다음 실행은 이미 본 주문이 나오는 곳에서 멈춘 뒤 새 주문만 더한다.
+#   주문번호는 API 응답 또는 주문 행 글자(ORDER_NO_PATTERN)에서 읽고, 행에서 못 읽은 주문이 있으면
+#   체크포인트 없이 전체 집계한다.
+#   (취소가 늦게 반영된 주문까지 다시 맞추려면 BAEMIN_CHECKPOINT=0으로 전체 집계)
+# ==============================
+CHECKPOINT_ENABLED = os.getenv("BAEMIN_CHECKPOINT", "1") == "1"
+CHECKPOINT_DIR = os.getenv(
+    "BAEMIN_CHECKPOINT_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mugung-baemin")
+)
+
+
+def checkpoint_path(store, day=None):
+    day = day or datetime.date.today()
+    return os.path.join(CHECKPOINT_DIR, f"{store}-{day:%Y%m%d}.json")
+
+
+def load_checkpoint(store, day=None):
+    if not CHECKPOINT_ENABLED:
+        return {}
+    try:
+        with open(checkpoint_path(store, day), encoding="utf-8") as f:
+            return json.load(f)["orders"]
+    except (OSError, ValueError, KeyError):
+        return {}
 
-    def normalize_text(s: str) -> str:
-        return re.sub(r"\s+", " ", s).strip()
 
-    def extract_qty(text: str) -> int:
-        m = re.search(r"\d+", text.replace(",", ""))
-        return int(m.group()) if m else 0
+def save_checkpoint(store, orders, day=None):
+    if not CHECKPOINT_ENABLED:
+        return
+    path = checkpoint_path(store, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"updated_at": str(datetime.datetime.now()), "orders": orders}, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
 
+
+def discard_checkpoint(store, day=None):
+    try:
+        os.remove(checkpoint_path(store, day))
+    except OSError:
+        pass
+
+
+def aggregate_orders(orders):
+    """체크포인트 형식 주문 → {셀: 수량}"""
     sales_data = {}
+    for lines in orders.values():
+        for name, qty in lines:
+            add_sales(sales_data, name, qty, verbose=False)
+    return sales_data
 
-    while True:  # 페이지 루프
 
-        detail_tr = 2
-        fail_count = 0  # ⭐ 연속 실패 카운트
+def go_to_next_page(driver):
+    """다음 페이지로 이동. 마지막 페이지면 False"""
+    next_btn_xpath = (
+        '//*[@id="root"]/div[1]/div[2]/div[2]/div/div[5]'
+        '/div/div[2]/span/button'
+    )
+    try:
+        next_btn = driver.find_element(By.XPATH, next_btn_xpath)
+    except NoSuchElementException:
+        logging.info("다음 페이지 없음 → 종료")
+        return False
 
-        for order_no in range(1, 11):
+    if "disabled" in next_btn.get_attribute("class"):
+        logging.info("마지막 페이지 → 종료")
+        return False
 
-            # ==============================
-            # 주문 펼치기
-            # ==============================
-            if order_no > 1:
-                toggle_tr = detail_tr - 1
-                toggle_xpath = (
-                    f'//*[@id="root"]/div[1]/div[2]/div[2]/div/div[4]/div/div/'
-                    f'table/tbody/tr[{toggle_tr}]/td/div'
-                )
-                try:
-                    btn = wait.until(EC.presence_of_element_located((By.XPATH, toggle_xpath)))
-                    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                    time.sleep(0.2)
-                    driver.execute_script("arguments[0].click();", btn)
-                    time.sleep(0.4)
-
-                    fail_count = 0  # ⭐ 성공 시 초기화
-
-                except Exception:
-                    fail_count += 1
-                    logging.warning(f"{order_no}번째 펼치기 실패 (연속 {fail_count})")
-
-                    # ⭐⭐⭐ 핵심: 2번 실패하면 전체 종료
-                    if fail_count >= 2:
-                        logging.info("연속 2회 실패 → 전체 크롤링 종료")
-                        logging.info(f"최종 집계 데이터: {sales_data}")
-                        return sales_data
-
-            # ==============================
-            # 메뉴/수량 추출
-            # ==============================
-            for i in range(1, 26, 3):
-                name_xpath = (
-                    f'//*[@id="root"]/div[1]/div[2]/div[2]/div/div[4]/div/div/'
-                    f'table/tbody/tr[{detail_tr}]/td/div/div/section[1]/div[3]/div[{i}]'
-                    f'/span[1]/div/span[1]'
-                )
-                qty_xpath = (
-                    f'//*[@id="root"]/div[1]/div[2]/div[2]/div/div[4]/div/div/'
-                    f'table/tbody/tr[{detail_tr}]/td/div/div/section[1]/div[3]/div[{i}]'
-                    f'/span[1]/div/span[2]'
-                )
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", next_btn)
+    time.sleep(0.3)
+    with network_idle(driver, label="다음 페이지 조회"):
+        driver.execute_script("arguments[0].click();", next_btn)
+    wait_dom_settled(driver, "div.OrderHistoryPage-module__R0bB", quiet_ms=200, timeout=5, label="다음 페이지")
 
-                try:
-                    raw_name = driver.find_element(By.XPATH, name_xpath).text
-                    raw_qty = driver.find_element(By.XPATH, qty_xpath).text
-                except NoSuchElementException:
-                    break
+    logging.info("다음 페이지 이동")
+    return True
 
-                item_name = normalize_text(price_tail_re.sub("", raw_name))
-                qty = extract_qty(raw_qty)
 
-                if qty == 0:
-                    continue
+def read_order_table(driver, expand=False, seen=()):
+    """
+    현재 페이지의 주문 테이블을 execute_script 한 번으로 읽는다 (expand면 접힌 주문 펼치기까지).
+    seen에 있는 주문번호가 나오면 그 앞의 주문까지만 다룬다.
+    :return: {"orders": 주문 수, "lines": [[주문 순번, 메뉴명 원문, 수량 원문], ...],
+              "itemCounts": 주문별 메뉴 수, "expanded": 주문별 상세 펼침 여부, "clicked": 누른 펼치기 수,
+              "orderIds": 주문별 주문번호(못 읽으면 None), "reachedSeen": seen 주문에서 멈췄는지}
+             테이블이 없으면 None
+    """
+    return driver.execute_script(
+        ORDER_TABLE_JS, ORDER_TABLE_XPATH, ORDER_ITEM_SLOT_STEP, expand, ORDER_NO_PATTERN, list(seen)
+    )
 
-                if item_name in ITEM_TO_CELL:
-                    cell = ITEM_TO_CELL[item_name]
-                    sales_data[cell] = sales_data.get(cell, 0) + qty
-                    logging.info(f"[집계] {item_name} → {cell} +{qty}")
 
-            detail_tr += 2
+def read_expanded_page(driver, seen=()):
+    """
+    접힌 주문을 모두 펼치고 메뉴를 읽는다. 화면에 있는 주문 행만 다루므로 없는 행을 기다리지 않는다.
+    :return: (read_order_table 결과 또는 None, 펼침 대기 시간(초), execute_script 호출 수)
+    """
+    table = read_order_table(driver, expand=True, seen=seen)
+    calls = 1
+    if not table or not table["clicked"]:
+        return table, 0.0, calls
+
+    # 메뉴를 못 읽는 주문이 있어도 상세가 열렸으면 더 기다리지 않는다
+    def _all_expanded(d):
+        nonlocal calls
+        calls += 1
+        current = read_order_table(d, seen=seen)
+        return current if current and all(current["expanded"]) else False
+
+    started = time.time()
+    expanded = wait_until(driver, _all_expanded, ORDER_EXPAND_TIMEOUT, "주문 상세 펼침")
+    waited = time.time() - started
+    if expanded:
+        table = expanded
+    else:
+        table = read_order_table(driver, seen=seen)
+        calls += 1
+        collapsed = [n for n, ok in enumerate(table["expanded"] if table else [], 1) if not ok]
+        logging.warning(f"주문 {collapsed}번 상세를 펼치지 못함 → 해당 주문 메뉴 누락 가능")
 
-        # ==============================
-        # 다음 페이지 이동
-        # ==============================
-        try:
-            next_btn_xpath = (
-                '//*[@id="root"]/div[1]/div[2]/div[2]/div/div[5]'
-                '/div/div[2]/span/button'
-            )
-            next_btn = driver.find_element(By.XPATH, next_btn_xpath)
+    empty = [n for n, (ok, count) in enumerate(zip(table["expanded"], table["itemCounts"]), 1)
+             if ok and not count] if table else []
+    if empty:
+        logging.warning(f"주문 {empty}번 상세에서 메뉴를 읽지 못함 → 해당 주문 메뉴 누락 가능")
+    return table, waited, calls
+
+
+def extract_sales_details_from_api(driver, capture, seen=()):
+    """
+    필터 적용 후 받아 둔 주문내역 API 응답을 읽고, 페이지 이동 응답도 이어서 받는다.
+    주문은 최신순이므로 seen(체크포인트)에 있는 주문이 나온 페이지에서 멈춘다.
+    :return: (새 주문 {주문번호: [[메뉴명, 수량], ...]}, 끝까지 읽었는지)
+             응답을 못 받았거나 필드를 못 찾은 페이지에서 멈추면 False
+    """
+    new_orders = {}
+    page = 1
+    canceled = 0
+
+    while True:
+        orders = capture.take_new()
+        if not looks_complete(orders):
+            logging.warning(f"[배민 API] {page}페이지 주문 응답 없음/필드 불일치 → 이 페이지부터 행 펼치기로 대체")
+            return new_orders, False
+
+        reached_seen = False
+        for order in orders:
+            if order["order_no"] in seen:
+                reached_seen = True
+                continue
+            if is_canceled(order):
+                canceled += 1
+                continue
+            new_orders[order["order_no"]] = [[item["name"], item["qty"]] for item in order["items"]]
+        logging.info(f"[배민 API] {page}페이지: 주문 {len(orders)}건 (행 펼치기 없음)")
+
+        if reached_seen:
+            logging.info(f"[체크포인트] {page}페이지에서 이미 집계한 주문 도달 → 페이지 이동 중단")
+            break
+        if not go_to_next_page(driver):
+            break
+        page += 1
+
+    logging.info(f"[배민 API] 새 주문 {len(new_orders)}건 (취소 {canceled}건 제외)")
+    return new_orders, True
+
+
+def extract_sales_details(driver, wait, sales_data=None, seen=()):
+    """
+    현재 페이지부터 주문을 펼쳐 메뉴/수량을 집계 (sales_data가 있으면 이어서 더함).
+    seen(체크포인트)에 있는 주문이 나오면 그 앞에서 멈춘다.
+    :return: (집계 {셀: 수량}, 새 주문 {주문번호: [[메뉴명, 수량], ...]} 또는 주문번호를 못 읽었으면 None)
+    """
+    sales_data = {} if sales_data is None else sales_data
+    new_orders = {}
+    page = 1
+    waited_total = legacy_total = 0.0
 
-            if "disabled" in next_btn.get_attribute("class"):
-                logging.info("마지막 페이지 → 종료")
-                break
+    while True:  # 페이지 루프
 
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", next_btn)
-            time.sleep(0.3)
-            driver.execute_script("arguments[0].click();", next_btn)
-            time.sleep(1.5)
+        # ==============================
+        # 주문 펼치기 + 메뉴/수량 추출 (화면의 실제 주문 수 기준)
+        # ==============================
+        table, waited, calls = read_expanded_page(driver, seen)
+        if not table or not table["orders"]:
+            if table and table["reachedSeen"]:
+                logging.info(f"[체크포인트] {page}페이지 첫 주문부터 이미 집계함 → 종료")
+            else:
+                logging.info("주문 행 없음 → 종료")
+            break
 
-            logging.info("다음 페이지 이동")
+        # 새 주문이 들어와 앞 페이지 주문이 밀려 내려온 것은 다시 세지 않는다
+        repeated = {n for n, order_id in enumerate(table["orderIds"], 1)
+                    if new_orders and order_id in new_orders}
+        if new_orders is not None and not all(
+            order_id and count for order_id, count in zip(table["orderIds"], table["itemCounts"])
+        ):
+            # 주문번호나 메뉴를 못 읽은 주문이 있으면 체크포인트로 남길 수 없음
+            new_orders = None
+        for order_no, raw_name, raw_qty in table["lines"]:
+            if order_no in repeated:
+                continue
+            qty = extract_qty(raw_qty)
+            add_sales(sales_data, raw_name, qty)
+            if new_orders is not None:
+                new_orders.setdefault(table["orderIds"][order_no - 1], []).append([raw_name, qty])
+        if repeated:
+            logging.info(f"[추출] {page}페이지 주문 {sorted(repeated)}번은 앞 페이지에서 읽은 주문 → 건너뜀")
+
+        # 이전 방식이 이 페이지의 없는 주문 행에서 시간 초과로 버렸을 시간 (추정치)
+        legacy = min(2, max(LEGACY_ORDERS_PER_PAGE - table["orders"], 0)) * LEGACY_WAIT_TIMEOUT
+        waited_total += waited
+        legacy_total += legacy
+        # 칸마다 메뉴명/수량 find_element 2회 + 주문마다 빈 칸 확인 1회였던 것과 비교
+        per_element = sum(2 * n + 1 for n in table["itemCounts"])
+        logging.info(
+            f"[추출] {page}페이지: 주문 {table['orders']}건, 메뉴 {len(table['lines'])}줄 "
+            f"(주문별 {table['itemCounts']}), 펼침 대기 {waited:.1f}s"
+            + (f" (이전 방식 끝 확인 대기 추정 {legacy}s)" if legacy else "")
+        )
+        logging.info(
+            f"[추출] {page}페이지: WebDriver 왕복 {per_element}회 → {calls}회 "
+            f"({per_element - calls}회 절약)"
+        )
 
-        except NoSuchElementException:
-            logging.info("다음 페이지 없음 → 종료")
+        # ==============================
+        # 다음 페이지 이동
+        # ==============================
+        if table["reachedSeen"]:
+            logging.info(f"[체크포인트] {page}페이지에서 이미 집계한 주문 도달 → 페이지 이동 중단")
+            break
+        if not go_to_next_page(driver):
             break
+        page += 1
 
+    logging.info(f"[추출] 펼침 대기 합계 {waited_total:.1f}s (이전 방식 끝 확인 대기 추정 {legacy_total:.0f}s)")
     logging.info(f"최종 집계 데이터: {sales_data}")
-    return sales_data
+    return sales_data, new_orders
+# ==============================
+# 지난 날짜 백필 (한 번 로그인해서 여러 날짜 집계)
+#   BAEMIN_BACKFILL_FROM=2026-10-01 [BAEMIN_BACKFILL_TO=2026-10-15, 기본 오늘]
+#   날짜 열(U3:U33)이 한 달 기준이므로 같은 달 안의 날짜만 받는다.
+#   재고 시트는 오늘 하루치 칸이므로 오늘 집계가 있을 때만 지우고 채운다 (지난 날짜는 V열만).
+# ==============================
+def target_days():
+    """집계할 날짜 목록 (백필 설정이 없으면 오늘 하루)"""
+    today = datetime.date.today()
+    start = os.getenv("BAEMIN_BACKFILL_FROM")
+    if not start:
+        return [today]
+
+    end = os.getenv("BAEMIN_BACKFILL_TO")
+    start = datetime.date.fromisoformat(start)
+    end = datetime.date.fromisoformat(end) if end else today
+    if start > end or end > today:
+        raise ValueError(f"백필 기간이 올바르지 않습니다: {start} ~ {end}")
+    if (start.year, start.month) != (end.year, end.month):
+        raise ValueError(f"백필은 같은 달 안에서만 가능합니다 (U3:U33 일자 기준): {start} ~ {end}")
+    return [start + datetime.timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def scrape_day(driver, wait, store, day):
+    """
+    하루치 주문내역을 열어 총 결제금액과 메뉴별 판매 수량을 모은다.
+    :return: (총 결제금액 텍스트, {재고 셀: 수량})
+    """
+    # 주문내역 & 날짜 필터 (API 모드면 화면이 받아 오는 주문 JSON을 함께 캡처)
+    capture = OrderApiCapture(driver).start() if ORDER_SOURCE == "api" else None
+    try:
+        open_filtered_order_history(driver, wait, capture, day)
+
+        # 요약 & 판매량
+        order_summary = extract_order_summary(driver, wait)
+        checkpoint = load_checkpoint(store, day)
+        new_orders, complete = {}, False
+        if capture:
+            new_orders, complete = extract_sales_details_from_api(driver, capture, seen=checkpoint)
+    finally:
+        if capture:
+            capture.stop()
+
+    if not complete:
+        # 처음부터(또는 API 응답이 끊긴 페이지부터) 행 펼치기, 주문번호는 주문 행에서 읽음
+        sales_details, dom_orders = extract_sales_details(
+            driver, wait, aggregate_orders(new_orders), seen=checkpoint
+        )
+        if dom_orders is None:
+            discard_checkpoint(store, day)
+            if not checkpoint:
+                return order_summary, sales_details
+            # 체크포인트에서 멈췄을 수 있으므로 섞지 않고 첫 페이지부터 다시 전체 집계
+            logging.warning("[체크포인트] 주문번호를 못 읽은 주문이 있음 → 첫 페이지부터 전체 집계")
+            open_filtered_order_history(driver, wait, day=day)
+            return order_summary, extract_sales_details(driver, wait)[0]
+        new_orders.update(dom_orders)
+
+    checkpoint.update(new_orders)
+    save_checkpoint(store, checkpoint, day)
+    sales_details = aggregate_orders(checkpoint)
+    logging.info(f"[체크포인트] 새 주문 {len(new_orders)}건, {day} 누적 {len(checkpoint)}건")
+    logging.info(f"최종 집계 데이터: {sales_details}")
+    return order_summary, sales_details
+
+
+def summary_amount(order_summary):
+    """'126,000' → 126000 (빈 문자열이면 0)"""
+    digits_only = re.sub(r'[^\d]', '', order_summary)
+    return int(digits_only) if digits_only else 0
+
+
 ###############################################################################
 # 메인 함수
 ###############################################################################
@@ -730,25 +1132,45 @@ def main():
     
     # 1) 환경 변수
     baemin_id, baemin_pw, service_account_json_b64 = get_environment_variables()
+    days = target_days()
+    results = {}  # 날짜 -> (총 결제금액 텍스트, {재고 셀: 수량})
+    if len(days) > 1:
+        logging.info(f"백필: {days[0]} ~ {days[-1]} ({len(days)}일)")
     
     # 2) Selenium
     with SeleniumDriverManager(headless=True) as driver:
+        instrument(driver, "1-songdo-baemin-auto")
         wait = WebDriverWait(driver, 30)
         try:
-            # 로그인 & 팝업
-            login_and_close_popup(driver, wait, baemin_id, baemin_pw)
-            
-            # 주문내역 & 날짜 필터
-            navigate_to_order_history(driver, wait)
-            set_daily_filter(driver, wait)
-            
-            # 요약 & 판매량
-            order_summary = extract_order_summary(driver, wait)
-            sales_details = extract_sales_details(driver, wait)
+            # 로그인 & 팝업 (저장된 세션이 살아 있으면 로그인 생략)
+            restored = restore_or_login(
+                driver, "songdo", "baemin",
+                lambda: login_and_close_popup(driver, wait, baemin_id, baemin_pw)
+            )
+            if restored:
+                wait_popups_cleared(driver, "baemin")
+
+            # 날짜별 요약 & 판매량 (백필이면 로그인 한 번으로 날짜만 바꿔 가며)
+            for day in days:
+                logging.info(f"--- {day} 주문내역 ---")
+                try:
+                    results[day] = scrape_day(driver, wait, "songdo", day)
+                except Exception as e:
+                    if len(days) == 1:
+                        raise
+                    logging.error(f"{day} 집계 실패 → 건너뜀: {e}")
+            if not results:
+                return
         except Exception as e:
             logging.error(f"에러 발생: {e}")
             traceback.print_exc()
             return
+        finally:
+            log_dismissed_popups(driver)
+            log_network_summary()
+            log_wait_summary("1-songdo-baemin-auto")
+            log_command_summary()
+            log_selector_stats()
     
     # 3) Google Sheets 인증 & 열기
     sheets_manager = GoogleSheetsManager(service_account_json_b64)
@@ -760,43 +1182,44 @@ def main():
     
     sheets_manager.open_spreadsheet(SPREADSHEET_NAME)
     mu_gung_sheet = sheets_manager.get_worksheet(MU_GUNG_SHEET_NAME)
-    inventory_sheet = sheets_manager.get_worksheet(INVENTORY_SHEET_NAME)
     
     try:
-        # 날짜 행에 요약 데이터 기록
-        today = datetime.datetime.now()
-        day = str(today.day)
-        
+        # 날짜 행(U3:U33)을 찾아 V열에 총 결제금액 기록
         date_cells = mu_gung_sheet.range('U3:U33')
         day_values = [cell.value for cell in date_cells]
-        
-        if day in day_values:
-            row_index = day_values.index(day) + 3
-            target_cell = f"V{row_index}"
-            
-            # 빈 문자열 방지
-            digits_only = re.sub(r'[^\d]', '', order_summary)
-            if not digits_only:
-                digits_only = "0"
-            
-            extracted_num = int(digits_only)
-            sheets_manager.update_cell_value(mu_gung_sheet, target_cell, extracted_num)
-            sheets_manager.format_cells_number(mu_gung_sheet, 'V3:V33')
-        else:
-            logging.warning(f"시트에 오늘({day}) 날짜를 찾을 수 없음 (U3:U33 범위)")
-        
-        # 재고 시트 특정 범위 삭제
+
+        batch_data = []
+        for day, (order_summary, _) in sorted(results.items()):
+            if str(day.day) in day_values:
+                row_index = day_values.index(str(day.day)) + 3
+                batch_data.append({
+                    'range': f"'{MU_GUNG_SHEET_NAME}'!V{row_index}",
+                    'values': [[summary_amount(order_summary)]]
+                })
+            else:
+                logging.warning(f"시트에 {day}({day.day}) 날짜를 찾을 수 없음 (U3:U33 범위)")
+
+        # 재고 시트는 오늘 하루치이므로 오늘 집계가 있을 때만 지우고 채움
+        # (지난 날짜만 백필했거나 오늘 집계가 실패했으면 재고는 그대로 두고 V열만 기록)
         ranges_to_clear = ['E38:E45', 'P38:P45', 'AD38:AD45', 'AP38:AP45', 'BA38:BA45']
-        sheets_manager.batch_clear(inventory_sheet, ranges_to_clear)
-        
-        # 판매 디테일 기록
-        if sales_details:
-            batch_data = []
-            for cell_addr, qty in sales_details.items():
-                batch_data.append({'range': cell_addr, 'values': [[qty]]})
-            sheets_manager.batch_update(inventory_sheet, batch_data)
+        today = datetime.date.today()
+        if today in results:
+            sales_details = results[today][1]
+            if sales_details:
+                for cell_addr, qty in sales_details.items():
+                    batch_data.append({'range': f"'{INVENTORY_SHEET_NAME}'!{cell_addr}", 'values': [[qty]]})
+            else:
+                logging.info("판매 수량 데이터가 없습니다.")
+            sheets_manager.values_batch_clear(
+                [f"'{INVENTORY_SHEET_NAME}'!{r}" for r in ranges_to_clear]
+            )
         else:
-            logging.info("판매 수량 데이터가 없습니다.")
+            logging.warning(f"오늘({today}) 집계가 없어 재고 시트는 건드리지 않음")
+
+        # V열 + 재고 칸을 한 번에 기록
+        if batch_data:
+            sheets_manager.values_batch_update(batch_data)
+            sheets_manager.format_cells_number(mu_gung_sheet, 'V3:V33')
     
     except Exception as e:
         logging.error(f"구글 시트 처리 중 에러: {e}")
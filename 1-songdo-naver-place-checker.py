@@ -7,11 +7,16 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    NoSuchElementException,
     TimeoutException,
     WebDriverException
 )
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
+from chrome_pool import lease_driver
+from request_blocking import block_requests
+# 대체 셀렉터 중 지난번에 맞은 후보부터 시도
+from selector_cache import find_first_match, has_text, log_selector_stats
+# WebDriver 명령 수 계측
+from command_budget import instrument, log_command_summary
 
 # =========================
 # 설정
@@ -41,22 +46,28 @@ sheet = spreadsheet.worksheet("예약&마케팅")
 # =========================
 # Selenium 초기화 (모바일/헤드리스)
 # =========================
-options = webdriver.ChromeOptions()
-options.add_argument("--headless=new")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-gpu")
-options.add_argument("--disable-software-rasterizer")
-options.add_argument("--remote-debugging-port=9222")
-options.add_argument("--lang=ko-KR")
-options.add_argument("--window-size=412,915")  # 모바일 화면 비율(갤럭시S급)
-options.add_argument(f"user-agent={user_agent}")
-options.page_load_strategy = "eager"
-
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=options
-)
+# 워밍 풀이 떠 있으면 탭 임대 (모바일 UA/화면은 탭 단위로 적용)
+driver = lease_driver(user_agent=user_agent, window_size=(412, 915), page_load_strategy="eager")
+
+if driver is None:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--remote-debugging-port=9222")
+    options.add_argument("--lang=ko-KR")
+    options.add_argument("--window-size=412,915")  # 모바일 화면 비율(갤럭시S급)
+    options.add_argument(f"user-agent={user_agent}")
+    options.page_load_strategy = "eager"
+
+    driver = webdriver.Chrome(
+        service=Service(resolve_chromedriver()),
+        options=options
+    )
+block_requests(driver, "naver_map")  # 폰트/이미지/지도 타일/로그 차단
+instrument(driver, "1-songdo-naver-place-checker")
 driver.set_page_load_timeout(40)
 
 # =========================
@@ -75,16 +86,11 @@ def switch_into_search_iframe(driver, timeout=15):
         "//iframe[contains(@src, '/search2/')]",
         "//iframe[contains(@name, 'search') or contains(@id, 'search')]"
     ]
-    for _ in range(timeout):
-        for xp in iframe_xpaths:
-            try:
-                iframe = driver.find_element(By.XPATH, xp)
-                driver.switch_to.frame(iframe)
-                return True
-            except NoSuchElementException:
-                continue
-        time.sleep(1)
-    return False
+    iframe = find_first_match(driver, "naver.search_iframe", iframe_xpaths, timeout=timeout, by=By.XPATH)
+    if iframe is None:
+        return False
+    driver.switch_to.frame(iframe)
+    return True
 
 
 def find_first(driver, selectors, single=False, root=None):
@@ -120,14 +126,9 @@ def robust_scroll_mobile_first():
         "div#ct div.list_container",              # 추정
         "div#ct",                                 # 최후 fallback
     ]
-    scroll_container = None
-    for sel in container_candidates:
-        try:
-            el = driver.find_element(By.CSS_SELECTOR, sel)
-            scroll_container = el
-            break
-        except NoSuchElementException:
-            continue
+    scroll_container = find_first_match(
+        driver, "naver.list_container", container_candidates, catch_all=("div#ct",)
+    )
 
     if not scroll_container:
         print("🚨 리스트 컨테이너를 찾지 못했습니다.")
@@ -139,6 +140,7 @@ def robust_scroll_mobile_first():
         "ul>li",              # 일반
         "li",                 # 최후
     ]
+    item_catch_all = ("ul>li", "li")
 
     previous_count = 0
     max_attempts = 60
@@ -148,14 +150,9 @@ def robust_scroll_mobile_first():
     time.sleep(1.0)
 
     while attempts < max_attempts:
-        places = []
-        for item_css in item_selectors:
-            try:
-                places = scroll_container.find_elements(By.CSS_SELECTOR, item_css)
-            except Exception:
-                places = []
-            if places:
-                break
+        places = find_first_match(
+            scroll_container, "naver.list_item", item_selectors, single=False, catch_all=item_catch_all
+        )
 
         current_count = len(places)
         if current_count == 0:
@@ -178,14 +175,9 @@ def robust_scroll_mobile_first():
         time.sleep(0.8)
 
     # 최종 아이템 다시 수집
-    final_places = []
-    for item_css in item_selectors:
-        try:
-            final_places = scroll_container.find_elements(By.CSS_SELECTOR, item_css)
-        except Exception:
-            final_places = []
-        if final_places:
-            break
+    final_places = find_first_match(
+        scroll_container, "naver.list_item", item_selectors, single=False, catch_all=item_catch_all
+    )
 
     return final_places
 
@@ -202,13 +194,12 @@ def extract_name_from_place(place):
         "a strong",              # fallback
         "div a",                 # fallback
     ]
-    for ns in name_selectors:
-        try:
-            txt = place.find_element(By.CSS_SELECTOR, ns).text.strip()
-            if txt:
-                return txt
-        except Exception:
-            continue
+    name_el = find_first_match(
+        place, "naver.place_name", name_selectors, predicate=has_text,
+        catch_all=("a span", "a strong", "div a")
+    )
+    if name_el is not None:
+        return name_el.text.strip()
 
     # 요소 자체 텍스트에서 1줄 시도
     try:
@@ -303,6 +294,9 @@ try:
 except Exception as e:
     print(f"🚨 배치 업데이트 중 오류 발생: {e}")
 
+log_selector_stats(log=print)
+log_command_summary(log=print)
+
 try:
     driver.quit()
 except Exception:
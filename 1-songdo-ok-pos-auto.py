@@ -10,9 +10,57 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
+from chrome_pool import lease_driver
+from session_store import restore_or_login
+from popup_dismisser import install_popup_dismisser, wait_popups_cleared, log_dismissed_popups
+from waits import wait_until, element_present, css, log_wait_summary
+from network_idle import network_idle, enable_network_log, log_network_summary
+from command_budget import instrument, log_command_summary
 TIMEOUT = 10
 
+# 일별종합 / 재고 화면 그리드 (내부 iframe의 IBSheet 객체 이름, 표 id는 mySheet1-table)
+GRID_SHEET_ID = "mySheet1"
+
+# 그리드 열은 위치 대신 헤더 이름으로 찾는다 (후보 중 같은 이름 우선, 없으면 포함하는 이름)
+# 포함하는 이름이 여러 열에 걸리면 어느 열인지 모르므로 못 찾은 것으로 본다 (셀 XPath로 대체)
+SUMMARY_HEADERS = {
+    "현금": ("현금",),
+    "현금영수증": ("현금영수증",),
+    "테이블수": ("테이블수", "테이블 수"),
+    "총매출": ("총매출", "총매출액"),
+}
+INVENTORY_HEADERS = {
+    "code": ("상품코드", "코드"),
+    "qty": ("수량", "판매수량"),
+    "price": ("총매출", "매출액", "판매금액", "금액"),
+}
+# 같은 이름만 허용하는 키 ("코드"를 포함하는 바코드 열을 상품코드로 읽지 않게)
+INVENTORY_EXACT_KEYS = ("code",)
+
+# 헤더 / 행 수 / 셀 값을 IBSheet API로 한 번에 꺼낸다 (셀마다 XPath 왕복 없음)
+GRID_EXPORT_JS = """
+const [sheetId] = arguments;
+const sheet = window[sheetId];
+if (!sheet || typeof sheet.GetCellValue !== 'function') return null;
+const headerRows = sheet.HeaderRows();
+const lastRow = sheet.LastRow();
+const lastCol = sheet.LastCol();
+const headers = [];
+for (let c = 0; c <= lastCol; c++) {
+    const names = [];
+    for (let r = 0; r < headerRows; r++) names.push(String(sheet.GetCellText(r, c) || '').trim());
+    headers.push(names);
+}
+const rows = [];
+for (let r = headerRows; r <= lastRow; r++) {
+    const row = [];
+    for (let c = 0; c <= lastCol; c++) row.push(String(sheet.GetCellValue(r, c) ?? ''));
+    rows.push(row);
+}
+return {headers, rows};
+"""
+
 # =====================================================
 # 숫자 안전 추출
 # =====================================================
@@ -24,46 +72,52 @@ def get_int(driver, xpath, default=0):
         return int(txt) if txt.isdigit() else default
     except:
         return default
+
+def to_int(value, default=0):
+    txt = str(value).replace(",", "").strip()
+    if txt.endswith(".0"):
+        txt = txt[:-2]
+    return int(txt) if txt.lstrip("-").isdigit() else default
 # =====================================================
-# OKPOS 공지 / 팝업 닫기
-# =====================================================
-# =====================================================
-# OKPOS 모든 팝업 닫기 (안전 버전)
-# =====================================================
-# =====================================================
-# OKPOS 팝업 + 배경 완전 제거
+# IBSheet 그리드 한 번에 읽기 (내부 iframe에서 호출)
 # =====================================================
-def close_okpos_popup(driver):
-    driver.switch_to.default_content()
-
-    popup_buttons = [
-        "#divPopupCloseButton0 > button",
-        "#divPopupCloseButton1 > button"
-    ]
-
-    # 버튼은 있으면 무조건 누른다 (여러 번 시도)
-    for _ in range(3):
-        for sel in popup_buttons:
-            try:
-                btn = WebDriverWait(driver, TIMEOUT).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, sel))
-                )
-                driver.execute_script("arguments[0].click();", btn)
-                time.sleep(0.3)
-                print(f"[INFO] 팝업 닫기 클릭: {sel}")
-            except:
-                pass
-
-    # ✅ 배경 오버레이가 사라질 때까지 대기
+def export_grid(driver):
+    """
+    IBSheet 객체에서 헤더와 전체 데이터 행을 execute_script 한 번으로 꺼낸다.
+    :return: {"headers": [[헤더 행별 텍스트], ...], "rows": [[셀 값, ...], ...]}, 객체가 없으면 None
+    """
     try:
-        WebDriverWait(driver, TIMEOUT).until(
-            EC.invisibility_of_element_located(
-                (By.CSS_SELECTOR, "[id^='divPopupBackground']")
-            )
-        )
-        print("[INFO] 팝업 배경 제거 완료")
-    except:
-        print("[WARN] 팝업 배경 대기 타임아웃 (진행)")
+        return driver.execute_script(GRID_EXPORT_JS, GRID_SHEET_ID)
+    except Exception as e:
+        print(f"[WARN] IBSheet 읽기 실패: {e}")
+        return None
+
+def find_columns(headers, candidates, exact_keys=()):
+    """{키: 열 번호}. 헤더 이름 후보로 찾지 못한 키가 있으면 None (exact_keys는 같은 이름만)"""
+    def matching(name, exact):
+        return [col for col, texts in enumerate(headers)
+                if any(text == name if exact else name in text for text in texts)]
+
+    columns = {}
+    for key, names in candidates.items():
+        columns[key] = None
+        for exact in ((True,) if key in exact_keys else (True, False)):
+            for name in names:
+                cols = matching(name, exact)
+                if not exact and len(cols) > 1:
+                    print(f"[ERROR] 그리드 헤더 '{name}'(이)가 여러 열에 있어 {key} 열을 정할 수 없음: "
+                          f"{[headers[col] for col in cols]}")
+                    return None
+                if cols:
+                    columns[key] = cols[0]
+                    break
+            if columns[key] is not None:
+                break
+    missing = [key for key, col in columns.items() if col is None]
+    if missing:
+        print(f"[WARN] 그리드 헤더에서 열을 찾지 못함: {missing} (헤더: {headers})")
+        return None
+    return columns
 # =====================================================
 # OKPOS fnSearch 안전 실행 (MainFrm 내부 iframe 대응)
 # =====================================================
@@ -88,9 +142,9 @@ def okpos_fn_search(driver):
         )
     )
 
-    # 3️⃣ fnSearch 실행 (이제 정의되어 있음)
-    driver.execute_script("fnSearch();")
-    time.sleep(2)
+    # 3️⃣ fnSearch 실행 (이제 정의되어 있음) → 조회 요청이 끝날 때까지 대기
+    with network_idle(driver, label="OKPOS 일별종합 조회"):
+        driver.execute_script("fnSearch();")
 
     print("[INFO] fnSearch 실행 완료 (inner iframe)")
 
@@ -115,14 +169,35 @@ def okpos_fn_search2(driver):
         )
     )
 
-    # 3️⃣ fnSearch 실행 (이제 정의되어 있음)
-    driver.execute_script("fnSearch(1);")
-    time.sleep(2)
+    # 3️⃣ fnSearch 실행 (이제 정의되어 있음) → 조회 요청이 끝날 때까지 대기
+    with network_idle(driver, label="OKPOS 재고 조회"):
+        driver.execute_script("fnSearch(1);")
 
     print("[INFO] fnSearch 실행 완료 (inner iframe)")
 # =====================================================
 # 일별종합 데이터 추출
 # =====================================================
+def read_summary_from_grid(driver):
+    """일별종합 그리드 첫 데이터 행에서 헤더 이름으로 값을 꺼낸다 (실패 시 None)"""
+    grid = export_grid(driver)
+    if not grid or not grid["rows"]:
+        return None
+    columns = find_columns(grid["headers"], SUMMARY_HEADERS)
+    if columns is None:
+        return None
+    row = grid["rows"][0]
+    return {k: to_int(row[col]) for k, col in columns.items()}
+
+def read_summary_from_cells(driver):
+    """이전 방식: 값마다 셀 XPath 대기"""
+    data_map = {
+        "현금": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[21]',
+        "현금영수증": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[22]',
+        "테이블수": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[9]',
+        "총매출": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[4]'
+    }
+    return {k: get_int(driver, xp) for k, xp in data_map.items()}
+
 def extract_daily_summary(driver, sheet):
     driver.switch_to.default_content()
     WebDriverWait(driver, TIMEOUT).until(
@@ -134,17 +209,12 @@ def extract_daily_summary(driver, sheet):
         )
     )
     driver.switch_to.frame(inner_iframe)
-    data_map = {
-        "현금": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[21]',
-        "현금영수증": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[22]',
-        "테이블수": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[9]',
-        "총매출": '//*[@id="mySheet1-table"]/tbody/tr[3]/td[2]/div/div[1]/table/tbody/tr[2]/td[4]'
-    }
 
-    # 1️⃣ 값 수집
-    values = {}
-    for k, xp in data_map.items():
-        values[k] = get_int(driver, xp)
+    # 1️⃣ 값 수집 (IBSheet 한 번에 → 실패 시 셀 XPath)
+    values = read_summary_from_grid(driver)
+    if values is None:
+        print("[WARN] 그리드 일괄 읽기 실패 → 셀 XPath로 읽음")
+        values = read_summary_from_cells(driver)
 
     total = values["총매출"]
     cash = values["현금"]
@@ -167,6 +237,57 @@ def extract_daily_summary(driver, sheet):
 # =====================================================
 # 재고 처리
 # =====================================================
+def read_inventory_from_grid(driver):
+    """재고 그리드 전체 행 → [(상품코드, 수량, 금액)] (헤더 이름으로 열을 찾음, 실패 시 None)"""
+    grid = export_grid(driver)
+    if grid is None:
+        return None
+    columns = find_columns(grid["headers"], INVENTORY_HEADERS, INVENTORY_EXACT_KEYS)
+    if columns is None:
+        return None
+    print(f"[INFO] 재고 그리드 {len(grid['rows'])}행 일괄 읽기")
+    return [
+        ("".join(row[columns["code"]].split()), to_int(row[columns["qty"]]), to_int(row[columns["price"]]))
+        for row in grid["rows"]
+    ]
+
+def read_inventory_from_cells(driver, code_to_cell):
+    """이전 방식: 행마다 셀 XPath (첫 데이터 행은 병합 셀 때문에 열이 하나 밀림)"""
+    base = '//*[@id="mySheet1-table"]/tbody/tr[3]/td/div/div[1]/table/tbody'
+
+    # 🔥 행 개수 자동 감지
+    rows = driver.find_elements(By.XPATH, f"{base}/tr")
+
+    result = []
+    for row in range(2, len(rows)+1):
+
+        if row == 2:
+            code_col = 6
+            qty_col = 8
+            price_col = 9
+        else:
+            code_col = 5
+            qty_col = 7
+            price_col = 8
+
+        try:
+            code = "".join(driver.find_element(
+                By.XPATH, f"{base}/tr[{row}]/td[{code_col}]"
+            ).text.split())
+
+            if code not in code_to_cell:
+                continue
+
+            result.append((
+                code,
+                get_int(driver, f"{base}/tr[{row}]/td[{qty_col}]"),
+                get_int(driver, f"{base}/tr[{row}]/td[{price_col}]"),
+            ))
+
+        except Exception as e:
+            print(f"row {row} 오류:", e)
+    return result
+
 def process_inventory(driver, sheet_inventory):
 
     code_to_cell = {
@@ -201,48 +322,28 @@ def process_inventory(driver, sheet_inventory):
         "000030": 18000, "000031": 18000
     }
 
-    base = '//*[@id="mySheet1-table"]/tbody/tr[3]/td/div/div[1]/table/tbody'
-
-    # 🔥 행 개수 자동 감지
-    rows = driver.find_elements(By.XPATH, f"{base}/tr")
+    # 1️⃣ 행 수집 (IBSheet 한 번에 → 실패 시 셀 XPath)
+    rows = read_inventory_from_grid(driver)
+    if rows is None:
+        print("[WARN] 그리드 일괄 읽기 실패 → 셀 XPath로 읽음")
+        rows = read_inventory_from_cells(driver, code_to_cell)
 
     # 셀 합산용
     cell_qty_map = {cell: 0 for cell in set(code_to_cell.values())}
 
-    for row in range(2, len(rows)+1):
+    for code, qty_value, price_value in rows:
+        if code not in code_to_cell:
+            continue
 
-        if row == 2:
-            code_col = 6
-            qty_col = 8
-            price_col = 9
+        if code in special_prices:
+            qty = price_value // special_prices[code] if price_value else 0
         else:
-            code_col = 5
-            qty_col = 7
-            price_col = 8
+            qty = qty_value
 
-        try:
-            code = "".join(driver.find_element(
-                By.XPATH, f"{base}/tr[{row}]/td[{code_col}]"
-            ).text.split())
+        cell = code_to_cell[code]
+        cell_qty_map[cell] += qty   # 🔥 합산
 
-            if code not in code_to_cell:
-                continue
-
-            qty_value = get_int(driver, f"{base}/tr[{row}]/td[{qty_col}]")
-            price_value = get_int(driver, f"{base}/tr[{row}]/td[{price_col}]")
-
-            if code in special_prices:
-                qty = price_value // special_prices[code] if price_value else 0
-            else:
-                qty = qty_value
-
-            cell = code_to_cell[code]
-            cell_qty_map[cell] += qty   # 🔥 합산
-
-            print(f"OKPOS → {code} → {qty} → {cell}")
-
-        except Exception as e:
-            print(f"row {row} 오류:", e)
+        print(f"OKPOS → {code} → {qty} → {cell}")
 
     # 🔥 모든 셀 기록 (0도 포함)
     updates = []
@@ -253,6 +354,48 @@ def process_inventory(driver, sheet_inventory):
 
     print("[INFO] 재고 시트 업데이트 완료")
 # =====================================================
+# OKPOS 로그인
+# =====================================================
+def login_okpos(driver):
+    try:
+        driver.get("https://okasp.okpos.co.kr/login/login_form.jsp")
+    except Exception:
+        print("[WARN] 페이지 로드 타임아웃, DOM 기준 진행")
+
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "user_id")))
+    driver.find_element(By.ID, "user_id").send_keys(os.getenv("SONGDO_OK_POS_ID"))
+    driver.find_element(By.ID, "user_pwd").send_keys(os.getenv("SONGDO_OK_POS_PW"))
+    driver.find_element(By.CSS_SELECTOR, "#loginForm > div:nth-child(4) > div:nth-child(5) > img").click()
+    # 로그인 후 상단 메뉴가 뜨면 바로 진행
+    wait_until(driver, element_present(css("#divTopFrameHead")), 15, "OKPOS 로그인")
+# =====================================================
+# Chrome 실행 (풀을 쓰지 않을 때)
+# =====================================================
+def create_okpos_driver():
+    options = webdriver.ChromeOptions()
+
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1720,1080")
+
+    # 🔥 렌더링 안정화 핵심 옵션
+    options.page_load_strategy = "eager"
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+
+    # 🔥 fnSearch 조회 완료 감지용 성능 로그
+    enable_network_log(options)
+
+    options.binary_location = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+
+    return webdriver.Chrome(
+        service=ChromeService(resolve_chromedriver()),
+        options=options
+    )
+# =====================================================
 # 메인
 # =====================================================
 def main():
@@ -276,42 +419,27 @@ def main():
 
         sheet_report = spreadsheet.worksheet("송도")
         sheet_inventory = spreadsheet.worksheet("재고")
-        options = webdriver.ChromeOptions()
-
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1720,1080")
 
-        # 🔥 렌더링 안정화 핵심 옵션
-        options.page_load_strategy = "eager"
-        options.add_argument("--disable-features=VizDisplayCompositor")
-        options.add_argument("--disable-software-rasterizer")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--blink-settings=imagesEnabled=false")
-
-        options.binary_location = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-
-        driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=options
-        )
+        # 워밍 풀이 떠 있으면 탭 임대, 없으면 새 Chrome 실행
+        driver = lease_driver(window_size=(1720, 1080), page_load_strategy="eager")
+        if driver is None:
+            driver = create_okpos_driver()
+        instrument(driver, "1-songdo-ok-pos-auto")
 
         driver.set_page_load_timeout(120)
 
-        try:
-            driver.get("https://okasp.okpos.co.kr/login/login_form.jsp")
-        except Exception:
-            print("[WARN] 페이지 로드 타임아웃, DOM 기준 진행")
+        # 공지 팝업 닫기 버튼/배경은 페이지 안 스크립트가 뜨는 즉시 처리
+        install_popup_dismisser(driver, "okpos")
 
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "user_id")))
-        driver.find_element(By.ID, "user_id").send_keys(os.getenv("SONGDO_OK_POS_ID"))
-        driver.find_element(By.ID, "user_pwd").send_keys(os.getenv("SONGDO_OK_POS_PW"))
-        driver.find_element(By.CSS_SELECTOR, "#loginForm > div:nth-child(4) > div:nth-child(5) > img").click()
-        time.sleep(5)
+        # 저장된 세션이 살아 있으면 로그인 생략
+        restore_or_login(driver, "songdo", "okpos", lambda: login_okpos(driver))
 
-        # ✅ 팝업 전부 닫기
-        close_okpos_popup(driver)
+        # ✅ 이미 떠 있는 팝업이 닫혔는지만 확인 (팝업이 뜨기를 기다리지 않음)
+        driver.switch_to.default_content()
+        if wait_popups_cleared(driver, "okpos"):
+            print("[INFO] 팝업 정리 확인")
+        else:
+            print("[WARN] 팝업이 남아 있음 (진행)")
 
         # 즐겨찾기 → 일별종합
         top_menu = WebDriverWait(driver, TIMEOUT).until(
@@ -320,7 +448,6 @@ def main():
             )
         )
         driver.execute_script("arguments[0].click();", top_menu)
-        time.sleep(3)
         driver.switch_to.default_content()
         WebDriverWait(driver, TIMEOUT).until(
             EC.frame_to_be_available_and_switch_to_it("MyMenuFrm")
@@ -347,7 +474,11 @@ def main():
 
     finally:
         if driver:
+            log_dismissed_popups(driver, log=print)
             driver.quit()
+        log_network_summary(log=print)
+        log_wait_summary("1-songdo-ok-pos-auto", log=print)
+        log_command_summary(log=print)
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ import base64
 import json
 import uuid
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # -----------------------------
 # Selenium
@@ -24,12 +25,36 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
+
+# Chrome 워밍 풀 / 로그인 세션 저장소 / 요청 차단 / 팝업 자동 닫기
+from chrome_pool import lease_driver
+from session_store import restore_or_login
+from request_blocking import block_requests
+from popup_dismisser import (
+    install_popup_dismisser, popup_dismisser_paused, wait_popups_cleared, log_dismissed_popups
+)
+
+# 조건 기반 대기 (고정 sleep 대체)
+from waits import (
+    wait_until, wait_dom_settled, element_present, element_gone, text_of, text_changed, css,
+    log_wait_summary
+)
+# 주문내역 API 응답 캡처 (성능 로그 이벤트)
+from network_idle import enable_network_log
+from yogiyo_api import OrderApiCapture, is_canceled, looks_complete
+# 매장별 셀렉터 / 정산서 설정 (YOGIYO_STORES로 한 로그인에서 여러 매장)
+from yogiyo_stores import STORES, target_stores
+# WebDriver 명령 수 계측
+from command_budget import instrument, log_command_summary
 
 # Google Sheets
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
+# 이 스크립트의 기본 매장 (세션 저장소 키 / YOGIYO_STORES가 없을 때 집계할 매장)
+STORE = "songdo"
+
 ###############################################################################
 # 0. 공백 제거를 위한 함수
 ###############################################################################
@@ -93,16 +118,26 @@ def get_environment_variables():
 # 3. Chrome 드라이버 세팅 (고유 프로필 사용)
 ###############################################################################
 def get_chrome_driver(use_profile=False):
+    user_agent = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/110.0.5481.77 Safari/537.36"
+    )
+
+    # 워밍 풀이 떠 있으면 탭 임대 (없으면 새 Chrome 실행)
+    driver = lease_driver(user_agent=user_agent, window_size=(1200, 700))
+    if driver:
+        hide_webdriver_flag(driver)
+        block_requests(driver, "yogiyo")
+        install_popup_dismisser(driver, "yogiyo")
+        return driver
+
     chrome_options = webdriver.ChromeOptions()
     # 필요 시 headless 모드 주석 해제
     chrome_options.add_argument("--headless")
 
     # User-Agent 변경
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/110.0.5481.77 Safari/537.36"
-    )
+    chrome_options.add_argument(f"user-agent={user_agent}")
 
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--disable-infobars")
@@ -111,24 +146,37 @@ def get_chrome_driver(use_profile=False):
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1200,700")
 
-    service = Service(ChromeDriverManager().install())
+    # 주문내역 API 응답 캡처용 성능 로그
+    enable_network_log(chrome_options)
+
+    service = Service(resolve_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
 
     # 웹드라이버 탐지 방지 스크립트
+    hide_webdriver_flag(driver)
+    block_requests(driver, "yogiyo")
+    install_popup_dismisser(driver, "yogiyo")
+    logging.info("ChromeDriver 초기화 성공")
+    return driver
+
+def hide_webdriver_flag(driver):
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
         {
             "source": "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
         }
     )
-    logging.info("ChromeDriver 초기화 성공")
-    return driver
 
 ###############################################################################
 # 4. 요기요 로그인 및 페이지 이동
 ###############################################################################
+YOGIYO_HOME_URL = "https://ceo.yogiyo.co.kr/self-service-home/"
+# 매장 셀렉터 버튼 (지금 고른 매장 이름이 보임)
+STORE_SELECTOR_XPATH = "//*[@id='root']/div/div[2]/div[2]/div[1]/div/div"
+
+
 def login_yogiyo(driver, yogiyo_id, yogiyo_pw):
-    driver.get("https://ceo.yogiyo.co.kr/self-service-home/")
+    driver.get(YOGIYO_HOME_URL)
     logging.info("요기요 사장님 사이트 로그인 페이지 접속 완료")
 
     id_selector = "#root > div > div.LoginLayout__Container-sc-1dkvjmn-1.cFYxDO > div > div.Login__Container-sc-11eppm3-0.eVSjOb > form > div:nth-child(1) > div > div.sc-fEOsli.iqThlJ > div.sc-bjUoiL.LLOzV > input"
@@ -143,43 +191,49 @@ def login_yogiyo(driver, yogiyo_id, yogiyo_pw):
         logging.info("비밀번호 입력")
         driver.find_element(By.CSS_SELECTOR, login_btn_selector).click()
         logging.info("로그인 버튼 클릭")
+        # 로그인 폼이 사라지고 메인 화면이 뜨면 바로 진행
+        wait_until(driver, element_present(css("#common-layout-wrapper-id")), 15, "요기요 로그인")
     except TimeoutException:
         logging.warning("로그인 페이지 로딩 Timeout")
-    time.sleep(5)
-
-def close_popup_if_exist(driver):
-    popup_close_selector = "#portal-root > div > div > div.FullScreenModal__Header-sc-7lyzl-1.eQqjUi > svg"
-    try:
-        close_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, popup_close_selector))
-        )
-        close_btn.click()
-        logging.info("팝업 닫기 완료")
-    except TimeoutException:
-        logging.info("팝업이 나타나지 않음(혹은 이미 닫힘)")
-    except Exception as e:
-        logging.warning(f"팝업 닫기 중 예외 발생: {e}")
-    time.sleep(2)
 
 def go_store_selector(driver):
-    store_xpath = "//*[@id='root']/div/div[2]/div[2]/div[1]/div/div"
+    store_xpath = STORE_SELECTOR_XPATH
     try:
         WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, store_xpath)))
         driver.find_element(By.XPATH, store_xpath).click()
         logging.info("스토어 셀렉터 버튼 클릭")
+        # 매장 목록이 펼쳐질 때까지 대기
+        wait_until(driver, element_present(
+            (By.XPATH, "//*[@id='root']/div/div[2]/div[2]/div[1]/div/div[2]/ul/li")
+        ), 5, "매장 목록 펼침")
     except TimeoutException:
         logging.warning("스토어 셀렉터 버튼을 찾지 못함")
-    time.sleep(3)
 
-def go_songdo_selector(driver):
-    songdo_xpath = "//*[@id='root']/div/div[2]/div[2]/div[1]/div/div[2]/ul/li[1]/ul/li"
+def select_store(driver, store):
+    """
+    매장 셀렉터를 펼쳐 store(yogiyo_stores 키) 매장을 고른다.
+    고르지 못하면 RuntimeError (이전 매장 주문을 다음 매장 시트에 쓰지 않도록)
+    """
+    config = STORES[store]
+    store_xpath = f"{STORE_SELECTOR_XPATH}[2]/ul/li[{config['selector_index']}]/ul/li"
     try:
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, songdo_xpath)))
-        driver.find_element(By.XPATH, songdo_xpath).click()
-        logging.info("송도점 선택 완료")
+        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, store_xpath)))
+        driver.find_element(By.XPATH, store_xpath).click()
+        logging.info(f"{config['name']} 선택 완료")
+        # 매장 목록이 닫히면 (선택 반영) 바로 진행
+        wait_until(driver, element_gone((By.XPATH, store_xpath)), 5, "매장 선택")
     except TimeoutException:
-        logging.warning("송도점 버튼을 찾지 못함")
-    time.sleep(3)
+        raise RuntimeError(f"{config['name']} 버튼을 찾지 못함")
+    check_selected_store(driver, store, timeout=5)
+
+
+def check_selected_store(driver, store, timeout=0):
+    """매장 셀렉터에 store 매장 이름이 보이는지 확인 (아니면 RuntimeError)"""
+    name = STORES[store]["name"]
+    locator = (By.XPATH, STORE_SELECTOR_XPATH)
+    if not wait_until(driver, lambda d: name in (text_of(d, locator) or ""), timeout, "선택 매장 확인"):
+        shown = (text_of(driver, locator) or "").strip()
+        raise RuntimeError(f"선택된 매장이 {name}이(가) 아님 (화면: '{shown}')")
 
 def go_order_history(driver):
     order_btn_xpath = "//*[@id='root']/div/div[2]/div[2]/div[2]/div[1]/button[1]"
@@ -193,7 +247,11 @@ def go_order_history(driver):
             WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.XPATH, order_btn_xpath)))
             driver.find_element(By.XPATH, order_btn_xpath).click()
             logging.info("주문내역 버튼 클릭 완료")
-            time.sleep(3)  # 페이지 전환 대기
+            # 주문 테이블이 그려지고 멈출 때까지 대기
+            wait_dom_settled(
+                driver, "#common-layout-wrapper-id", quiet_ms=400, timeout=8,
+                label="주문내역 테이블", require_change=True
+            )
             return  # 성공하면 함수 종료
 
         except TimeoutException:
@@ -204,7 +262,7 @@ def go_order_history(driver):
                 driver.refresh()  # 페이지 새로고침
                 time.sleep(5)  # 새로고침 후 대기
 
-    logging.error("3회 시도 후에도 주문내역 버튼을 찾지 못함 → 스크립트 종료")
+    raise RuntimeError("3회 시도 후에도 주문내역 버튼을 찾지 못함")
 
 ###############################################################################
 # 5. 상품명 정규화 함수 (앞뒤 공백 제거 포함)
@@ -226,70 +284,204 @@ def normalize_product_name(product_text):
 def parse_yogiyo_order_date(date_text):
     """
     예) "02.06(목) 오후 04:31:59" -> '02.06' 부분만 파싱.
-         (year는 현재 연도)
+         (year는 현재 연도, 오늘보다 뒤 날짜면 작년 주문 - 1월 초에 보이는 12월 주문)
     """
-    current_year = datetime.date.today().year
+    today = datetime.date.today()
     match = re.search(r'(\d{2})\.(\d{2})', date_text)
     if not match:
         return None
     month = int(match.group(1))
     day   = int(match.group(2))
     try:
-        return datetime.date(current_year, month, day)
+        parsed = datetime.date(today.year, month, day)
+        return parsed if parsed <= today else datetime.date(today.year - 1, month, day)
     except ValueError:
         return None
 
 ###############################################################################
-# 7. 주문 상세 정보 추출 (오늘 날짜 기준)
+# 7. 주문내역 페이지 순회 (오늘 주문만, 날짜 경계에서 중단)
 ###############################################################################
-def get_todays_orders(driver):
+ORDER_TABLE_XPATH = "//*[@id='common-layout-wrapper-id']/div[1]/div/div/div[1]/div/div[2]/div/div/div/div[4]/table"
+MAX_ORDER_PAGES = 50
+PAGE_WAIT_TIMEOUT = 10
+
+# 현재 페이지 모든 행의 날짜(td[1]) / 상태(td[2]) 텍스트
+ORDER_ROWS_JS = """
+const [tableXPath] = arguments;
+const table = document.evaluate(tableXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!table) return null;
+return Array.from(table.querySelectorAll(':scope > tbody > tr')).map(tr => {
+    const cells = tr.querySelectorAll(':scope > td');
+    const text = i => cells[i] ? cells[i].innerText.trim() : '';
+    return {date: text(0), status: text(1)};
+});
+"""
+
+# 테이블 바깥에서 현재 페이지 번호를 찾아 다음 번호(없으면 '다음' 버튼)를 누른다
+NEXT_PAGE_JS = """
+const [tableXPath] = arguments;
+const table = document.evaluate(tableXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!table) return {page: null, clicked: false};
+const disabled = el => el.disabled || el.getAttribute('aria-disabled') === 'true' || /disabled/i.test(el.className);
+const isNext = el => /next|다음/i.test((el.getAttribute('aria-label') || '') + (el.getAttribute('title') || ''))
+    || ['>', '›', '다음'].includes(el.textContent.trim());
+for (let scope = table.parentElement; scope && scope !== document.body; scope = scope.parentElement) {
+    const controls = Array.from(scope.querySelectorAll('button, a, li, span'))
+        .filter(el => !table.contains(el) && el.offsetParent !== null);
+    const current = controls.find(el => el.getAttribute('aria-current') === 'page'
+        || /(^|[^a-z])(active|selected|current)/i.test(el.className));
+    const page = current ? parseInt(current.textContent.trim(), 10) : NaN;
+    if (isNaN(page)) continue;
+    const next = controls.find(el => el.textContent.trim() === String(page + 1)) || controls.find(isNext);
+    if (!next || disabled(next) || (next.closest('button') && disabled(next.closest('button')))) {
+        return {page, clicked: false};
+    }
+    (next.closest('button, a') || next).click();
+    return {page, clicked: true};
+}
+return {page: null, clicked: false};
+"""
+
+
+def read_order_rows(driver):
+    """현재 페이지 주문 행의 날짜/상태 텍스트를 execute_script 한 번으로 읽는다 (테이블이 없으면 None)"""
+    return driver.execute_script(ORDER_ROWS_JS, ORDER_TABLE_XPATH)
+
+
+def go_to_next_order_page(driver):
+    """다음 주문 페이지로 이동해 첫 행이 바뀔 때까지 대기. 마지막 페이지면 False"""
+    first_row = (By.XPATH, f"{ORDER_TABLE_XPATH}/tbody/tr[1]")
+    before = text_of(driver, first_row)
+    result = driver.execute_script(NEXT_PAGE_JS, ORDER_TABLE_XPATH)
+    if not result["clicked"]:
+        logging.info("다음 주문 페이지 없음 → 종료")
+        return False
+    if not wait_until(driver, text_changed(first_row, before), PAGE_WAIT_TIMEOUT, "다음 주문 페이지"):
+        logging.warning(f"{result['page'] + 1}페이지 주문 목록이 바뀌지 않음 → 종료")
+        return False
+    logging.info(f"주문내역 {result['page'] + 1}페이지 이동")
+    return True
+
+
+def iter_todays_order_rows(driver, page=1):
     """
-    오늘 날짜의 주문만 가져와서,
-    - 총 주문금액 (fee)
-    - 판매 품목(제품명, 수량)
-    을 리스트로 반환.
+    주문내역을 현재 페이지부터 넘겨 가며 오늘 주문 행만 내준다.
+    최신순이므로 오늘 이전 주문이 나오면 그 자리에서 멈추고, 취소 주문은 열지 않고 건너뛴다.
+    :yield: (페이지, 행 번호(1부터), 날짜 텍스트)
     """
-    result_data = []
     today_date = datetime.date.today()
-
-    for i in range(1, 11):  # 최대 10개의 주문 확인
-        # (1) 주문 날짜 확인
-        row_date_xpath = f"//*[@id='common-layout-wrapper-id']/div[1]/div/div/div[1]/div/div[2]/div/div/div/div[4]/table/tbody/tr[{i}]/td[1]/div"
-        try:
-            date_elem = WebDriverWait(driver, 5).until(
-                EC.visibility_of_element_located((By.XPATH, row_date_xpath))
-            )
-            raw_date_text = date_elem.text.strip()
-            parsed_date = parse_yogiyo_order_date(raw_date_text)
+    for page in range(page, MAX_ORDER_PAGES + 1):
+        rows = read_order_rows(driver) or []
+        for i, row in enumerate(rows, start=1):
+            parsed_date = parse_yogiyo_order_date(row["date"])
             if not parsed_date:
-                logging.info(f"{i}번째 행: '{raw_date_text}' → 날짜 파싱 실패 → 스킵")
+                logging.info(f"{page}페이지 {i}번째 행: '{row['date']}' → 날짜 파싱 실패 → 스킵")
                 continue
-
-            if parsed_date != today_date:
-                logging.info(f"{i}번째 행: {raw_date_text} (파싱결과: {parsed_date}) 오늘 주문 아님 → 스킵")
+            if parsed_date < today_date:
+                logging.info(f"{page}페이지 {i}번째 행: {row['date']} → 오늘 이전 주문 도달, 순회 종료")
+                return
+            if "취소" in row["status"]:
+                logging.info(f"{page}페이지 {i}번째 행: 상태가 '{row['status']}' → 취소 주문 → 스킵")
                 continue
+            yield page, i, row["date"]
 
-            # (1-추가) 상태 확인: 취소 여부 체크
-            status_xpath = f"//*[@id='common-layout-wrapper-id']/div[1]/div/div/div[1]/div/div[2]/div/div/div/div[4]/table/tbody/tr[{i}]/td[2]/div/div"
-            status_elem = WebDriverWait(driver, 5).until(
-                EC.visibility_of_element_located((By.XPATH, status_xpath))
-            )
-            order_status = status_elem.text.strip()
-            if "취소" in order_status:
-                logging.info(f"{i}번째 행: 상태가 '{order_status}' → 취소 주문 → 스킵")
+        if not rows or not go_to_next_order_page(driver):
+            return
+    logging.warning(f"주문내역 {MAX_ORDER_PAGES}페이지까지 오늘 주문 → 순회 중단")
+
+###############################################################################
+# 8. 주문 상세 정보 추출 (오늘 날짜 기준)
+###############################################################################
+# api: 주문내역 API 응답으로 집계 (실패하면 상세 팝업으로 대체) / modal: 항상 행마다 상세 팝업
+# 응답 필드 이름이 실제 캡처로 확인되기 전까지는 modal이 기본값
+ORDER_SOURCE = os.getenv("YOGIYO_ORDER_SOURCE", "modal")
+
+
+def get_todays_orders(driver, capture=None):
+    """
+    오늘 주문의 총 주문금액 / 판매 품목을 모은다.
+    화면이 받아 온 주문 API 응답이 있으면 그것으로, 응답이 끊긴 페이지부터는 행마다 상세 팝업을 열어 읽는다.
+    """
+    result_data, page = [], 1
+    if capture:
+        result_data, complete, page = get_todays_orders_from_api(driver, capture)
+        if complete:
+            return result_data
+
+    # 주문 상세 팝업을 직접 열고 닫으므로 자동 닫기는 잠시 멈춤
+    with popup_dismisser_paused(driver):
+        return result_data + get_todays_orders_from_modals(driver, page)
+
+
+def get_todays_orders_from_api(driver, capture):
+    """
+    주문내역 화면이 그리면서 받은 주문 JSON에서 오늘 주문을 꺼낸다 (팝업 열기 없음).
+    페이지를 넘기며 받은 응답도 이어서 읽고, 오늘 이전 주문이 나온 페이지에서 멈춘다.
+    :return: (get_todays_orders_from_modals와 같은 형식의 리스트, 끝까지 읽었는지, 멈춘 페이지)
+             응답을 못 받았거나 필드를 못 찾은 페이지에서 멈추면 False
+    """
+    today_date = datetime.date.today()
+    result_data = []
+    seen = set()
+    canceled = 0
+
+    for page in range(1, MAX_ORDER_PAGES + 1):
+        orders = [order for order in capture.take_new() if order["order_no"] not in seen]
+        if not looks_complete(orders):
+            logging.warning(f"[요기요 API] {page}페이지 주문 응답 없음/필드 불일치 → 이 페이지부터 상세 팝업으로 대체")
+            return result_data, False, page
+
+        reached_boundary = False
+        for order in orders:
+            seen.add(order["order_no"])
+            if order["date"] < today_date:
+                reached_boundary = True
+                continue
+            if order["date"] != today_date:
+                continue
+            if is_canceled(order):
+                canceled += 1
                 continue
 
-        except TimeoutException:
-            logging.warning(f"{i}번째 행 날짜 또는 상태 정보 찾기 실패 → 스킵")
-            continue
+            products = {}
+            for item in order["items"]:
+                name = normalize_product_name(item["name"])
+                products[name] = products.get(name, 0) + item["qty"]
+
+            result_data.append({
+                "order_no": order["order_no"],
+                "fee": order["total"],
+                "products": products
+            })
+        logging.info(f"[요기요 API] {page}페이지: 주문 {len(orders)}건 (상세 팝업 없음)")
+
+        if reached_boundary:
+            logging.info(f"[요기요 API] {page}페이지에서 오늘 이전 주문 도달 → 페이지 이동 중단")
+            break
+        if not go_to_next_order_page(driver):
+            break
+
+    logging.info(f"[요기요 API] 오늘 주문 {len(result_data)}건 (취소 {canceled}건 제외)")
+    return result_data, True, page
+
+
+def get_todays_orders_from_modals(driver, page=1):
+    """
+    오늘 날짜의 주문만 (page 페이지부터) 가져와서,
+    - 총 주문금액 (fee)
+    - 판매 품목(제품명, 수량)
+    을 리스트로 반환.
+    """
+    result_data = []
 
+    for page, i, raw_date_text in iter_todays_order_rows(driver, page):
         # (2) 상세보기 팝업 열기
-        row_menu_xpath = f"//*[@id='common-layout-wrapper-id']/div[1]/div/div/div[1]/div/div[2]/div/div/div/div[4]/table/tbody/tr[{i}]/td[9]"
+        row_menu_xpath = f"{ORDER_TABLE_XPATH}/tbody/tr[{i}]/td[9]"
         try:
             row_elem = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, row_menu_xpath))
             )
-            logging.info(f"--- {i}번째 행 (날짜: {parsed_date}) 클릭 시도 ---")
+            logging.info(f"--- {page}페이지 {i}번째 행 (날짜: {raw_date_text}) 클릭 시도 ---")
             driver.execute_script("arguments[0].scrollIntoView(true);", row_elem)
             row_elem.click()
             time.sleep(3)  # 팝업 열림 대기
@@ -383,6 +575,7 @@ def get_todays_orders(driver):
 
         # result_data 저장
         result_data.append({
+            "page": page,
             "row_index": i,
             "fee": fee_value,
             "products": products
@@ -391,24 +584,27 @@ def get_todays_orders(driver):
     return result_data
 
 ###############################################################################
-# 8. Google Sheets 업데이트 함수
+# 9. Google Sheets 업데이트 함수
 ###############################################################################
-def update_google_sheets(total_order_amount, aggregated_products):
-    """
-    - "송도 일일/월말 정산서" 스프레드시트의 "송도" 시트에서 U3:U33(날짜)와 W3:W33(주문 총액)을 업데이트
-    - "재고" 시트의 지정 범위를 클리어한 후, 미리 정의한 매핑에 따라 각 품목의 수량을 업데이트
-    """
-    yogiyo_id, yogiyo_pw, service_account_json_b64 = get_environment_variables()
+def open_gspread_client():
+    _, _, service_account_json_b64 = get_environment_variables()
     service_account_json = base64.b64decode(service_account_json_b64)
     service_account_info = json.loads(service_account_json)
     scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
     creds = ServiceAccountCredentials.from_json_keyfile_dict(service_account_info, scopes)
-    gc = gspread.authorize(creds)
+    return gspread.authorize(creds)
+
 
-    sh = gc.open("송도 일일/월말 정산서")
+def update_google_sheets(gc, store, total_order_amount, aggregated_products):
+    """
+    - 매장 정산서 스프레드시트의 일일 시트에서 U3:U33(날짜)와 W3:W33(주문 총액)을 업데이트
+    - "재고" 시트의 지정 범위를 클리어한 후, 매장별 매핑(yogiyo_stores)에 따라 각 품목의 수량을 업데이트
+    """
+    config = STORES[store]
+    sh = gc.open(config["spreadsheet"])
 
-    # 1) "송도" 시트: 총 주문금액 업데이트
-    sheet_daily = sh.worksheet("송도")
+    # 1) 일일 시트: 총 주문금액 업데이트
+    sheet_daily = sh.worksheet(config["daily_sheet"])
     date_values = sheet_daily.get("U3:U33")
     today_day = str(datetime.datetime.today().day)
     row_index = None
@@ -420,58 +616,19 @@ def update_google_sheets(total_order_amount, aggregated_products):
     if row_index:
         cell = f"W{row_index}"
         sheet_daily.update_acell(cell, total_order_amount)
-        logging.info(f"송도 시트 {cell}에 오늘 주문 총액 {total_order_amount} 업데이트")
+        logging.info(f"{config['daily_sheet']} 시트 {cell}에 오늘 주문 총액 {total_order_amount} 업데이트")
     else:
-        logging.warning("오늘 날짜에 해당하는 셀을 송도 시트에서 찾지 못함")
+        logging.warning(f"오늘 날짜에 해당하는 셀을 {config['daily_sheet']} 시트에서 찾지 못함")
 
     # 2) "재고" 시트 업데이트
     sheet_inventory = sh.worksheet("재고")
-    clear_ranges = ["F38:F45", "Q38:Q45", "AF38:AF45", "AR38:AR45", "BC38:BC45"]
-    sheet_inventory.batch_clear(clear_ranges)
-
-    update_mapping = {
-        '백골뱅이숙회': 'F45',
-        '얼큰소국밥': 'Q38',
-        '낙지비빔밥': 'AF38',
-        '낙지볶음': 'AF40',
-        '낙지파전': 'AF39',
-        '우삼겹김치전': 'Q39',
-        '두부김치제육': 'Q40',
-        '육회비빔밥': 'F42',
-        '숙주갈비탕': 'F38',
-        '갈비찜덮밥': 'F39',
-        '육전': 'Q44',
-        '육회': 'F43',
-        '육사시미': 'F44',
-        '갈비수육': 'F40',
-        '소갈비찜': 'F41',
-        '소불고기': 'Q42',
-        '코카콜라': 'AF42',
-        '스프라이트': 'AF43',
-        '토닉워터': 'AF44',
-        '제로콜라': 'AF41',
-        '만월': 'AR39',
-        '문배술25': 'AR40',
-        '로아 화이트': 'AR43',
-        '황금보리': 'AR38',
-        '왕율주': 'AR41',
-        '왕주': 'AR42',
-        '청하': 'BC38',
-        '참이슬 후레쉬': 'BC39',
-        '처음처럼': 'BC40',
-        '새로': 'BC42',
-        '진로이즈백': 'BC41',
-        '카스': 'BC43',
-        '테라': 'BC44',
-        '켈리': 'BC45',
-        '소성주막걸리': 'AR45'
-    }
+    sheet_inventory.batch_clear(config["inventory_clear_ranges"])
 
     # (디버깅) aggregated_products 내용 로그
-    logging.info(f"[DEBUG] 최종 aggregated_products: {aggregated_products}")
+    logging.info(f"[DEBUG] {config['name']} 최종 aggregated_products: {aggregated_products}")
 
     batch_updates = []
-    for product, cell in update_mapping.items():
+    for product, cell in config["inventory_cells"].items():
         qty = aggregated_products.get(product, 0)
         value = "" if qty == 0 else qty
         batch_updates.append({
@@ -481,53 +638,101 @@ def update_google_sheets(total_order_amount, aggregated_products):
 
     if batch_updates:
         sheet_inventory.batch_update(batch_updates)
-        logging.info("재고 시트 업데이트 완료")
+        logging.info(f"{config['name']} 재고 시트 업데이트 완료")
 
         # 업데이트 후 셀 값 확인 (예: F42)
         debug_val = sheet_inventory.acell("F42").value
-        logging.info(f"[DEBUG] F42 셀 값: {debug_val}")
+        logging.info(f"[DEBUG] {config['name']} F42 셀 값: {debug_val}")
 
 ###############################################################################
-# 메인 실행
+# 10. 매장별 수집 (한 로그인에서 매장을 바꿔 가며)
 ###############################################################################
-def main():
-    setup_logging("script.log")
-    yogiyo_id, yogiyo_pw, _ = get_environment_variables()
-    driver = get_chrome_driver(use_profile=False)
-
+def scrape_store(driver, store):
+    """
+    매장을 고르고 주문내역에서 오늘 주문을 모은다.
+    :return: (총 주문금액, {품목: 수량})
+    """
+    # 매장 선택 → 주문내역 페이지 진입 (앞 매장은 주문내역 화면에 있으므로 홈으로 돌아가서)
+    if not driver.current_url.startswith(YOGIYO_HOME_URL):
+        driver.get(YOGIYO_HOME_URL)
+        wait_until(driver, element_present((By.XPATH, STORE_SELECTOR_XPATH)), 15, "요기요 홈")
+        wait_popups_cleared(driver, "yogiyo")
+    go_store_selector(driver)
+    select_store(driver, store)
+    wait_popups_cleared(driver, "yogiyo")
+    # (API 모드면 주문내역 화면이 받아 오는 주문 JSON을 함께 캡처)
+    capture = OrderApiCapture(driver).start() if ORDER_SOURCE == "api" else None
     try:
-        # 1. 로그인 및 초기 팝업 처리
-        login_yogiyo(driver, yogiyo_id, yogiyo_pw)
-        close_popup_if_exist(driver)
-
-        # 2. 매장(송도점) 선택 → 주문내역 페이지 진입
-        go_store_selector(driver)
-        go_songdo_selector(driver)
-        close_popup_if_exist(driver)
         go_order_history(driver)
+        # 다른 매장 주문을 이 매장 시트에 쓰지 않도록 수집 직전에 한 번 더 확인
+        check_selected_store(driver, store)
+
+        # 오늘의 주문내역 수집
+        orders_data = get_todays_orders(driver, capture)
+    finally:
+        if capture:
+            capture.stop()
+    total_order_amount = sum(order["fee"] for order in orders_data)
 
-        # 3. 오늘의 주문내역 수집
-        orders_data = get_todays_orders(driver)
-        total_order_amount = sum(order["fee"] for order in orders_data)
+    # 전체 상품 집계
+    aggregated_products = {}
+    for order in orders_data:
+        for product, qty in order["products"].items():
+            aggregated_products[product] = aggregated_products.get(product, 0) + qty
 
-        # 3-1. 전체 상품 집계
-        aggregated_products = {}
-        for order in orders_data:
-            for product, qty in order["products"].items():
-                aggregated_products[product] = aggregated_products.get(product, 0) + qty
+    # (디버깅) 어떤 상품들이 몇 개 들어왔는지
+    logging.info(f"[DEBUG] {STORES[store]['name']} orders_data: {orders_data}")
+    return total_order_amount, aggregated_products
 
-        # (디버깅) 어떤 상품들이 몇 개 들어왔는지
-        logging.info(f"[DEBUG] orders_data: {orders_data}")
+###############################################################################
+# 메인 실행
+###############################################################################
+def main():
+    setup_logging("script.log")
+    yogiyo_id, yogiyo_pw, _ = get_environment_variables()
+    stores = target_stores(STORE)
+    driver = instrument(get_chrome_driver(use_profile=False), "1-songdo-yogiyo-auto")
 
-        # 4. Google Sheets 업데이트
-        update_google_sheets(total_order_amount, aggregated_products)
+    # 시트 쓰기는 한 줄로 세워 두고, 앞 매장을 쓰는 동안 다음 매장을 수집한다
+    writer = ThreadPoolExecutor(max_workers=1)
+    writes = []
+    try:
+        # 1. 로그인 및 초기 팝업 처리 (저장된 세션이 살아 있으면 로그인 생략)
+        restore_or_login(
+            driver, STORE, "yogiyo",
+            lambda: login_yogiyo(driver, yogiyo_id, yogiyo_pw)
+        )
+        wait_popups_cleared(driver, "yogiyo")
+        gc = open_gspread_client()
+
+        # 2. 매장마다 수집 → 3. Google Sheets 업데이트 (백그라운드)
+        for store in stores:
+            try:
+                total_order_amount, aggregated_products = scrape_store(driver, store)
+            except Exception as e:
+                logging.error(f"{STORES[store]['name']} 수집 중 에러 발생: {e}")
+                traceback.print_exc()
+                continue
+            writes.append((store, writer.submit(
+                update_google_sheets, gc, store, total_order_amount, aggregated_products
+            )))
 
     except Exception as e:
         logging.error(f"에러 발생: {e}")
         traceback.print_exc()
     finally:
+        log_dismissed_popups(driver)
         driver.quit()
         logging.info("WebDriver 종료")
+        for store, future in writes:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"{STORES[store]['name']} 시트 업데이트 중 에러 발생: {e}")
+                traceback.print_exc()
+        writer.shutdown()
+        log_wait_summary("1-songdo-yogiyo-auto")
+        log_command_summary()
 
 if __name__ == "__main__":
     main()
@@ -15,18 +15,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.action_chains import ActionChains  # 🚨 마우스 이동용
-from selenium.common.exceptions import (
-    TimeoutException,
-    NoSuchElementException,
-    ElementClickInterceptedException,
-    WebDriverException
-)
+from selenium.common.exceptions import TimeoutException
 
 # Google Sheets
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from google.auth.exceptions import TransportError
 
+# 로그인 세션 저장소 / 요청 차단 / 팝업 자동 닫기
+from session_store import restore_or_login
+from request_blocking import block_requests
+from popup_dismisser import install_popup_dismisser, race_target, log_dismissed_popups
+
+# 성능 로그 (주문 조회 API 응답 캡처용)
+from network_idle import enable_network_log
+
+# WebDriver 명령 수 계측
+from command_budget import instrument, log_command_summary
+# 주문 조회 API 응답 캡처
+from coupang_api import OrderSearchCapture, is_canceled, looks_complete
+
 ###############################################################################
 # 1. 로깅 설정
 ###############################################################################
@@ -93,6 +101,11 @@ def get_chrome_driver():
     
     # 한국어 브라우저 설정
     options.add_argument("--lang=ko-KR")
+    enable_network_log(options)
+
+    # 백그라운드 탭도 타이머/렌더링을 늦추지 않게 (여러 탭 페이지 읽기용)
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
 
     try:
         # 🚨 version_main을 제거하여 uc가 내 컴퓨터 크롬 버전을 자동으로 잡게 합니다.
@@ -104,12 +117,14 @@ def get_chrome_driver():
         # 만약 uc가 환경 문제로 죽는다면 예비책으로 기본 selenium 드라이버 작동
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
+        from driver_resolver import resolve_chromedriver
         
         options.add_argument("--disable-blink-features=AutomationControlled")
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_chromedriver())
         driver = webdriver.Chrome(service=service, options=options)
 
+    block_requests(driver, "coupang")
+    install_popup_dismisser(driver, "coupang")
     logging.info("Chrome 실행 완료 (자동화 우회 활성화)")
     return driver
 ###############################################################################
@@ -198,69 +213,51 @@ def login_coupang_eats(driver, user_id, password):
             time.sleep(random.uniform(3.0, 5.0))
 
 def close_coupang_popup(driver):
-    popup_selectors = [
-        "#merchant-onboarding-body > div.dialog-modal-wrapper.ezi9xs118.css-1g106yu.e1gf2dph0 > div > div > div > div.css-rucxuz.ezi9xs112 > div",
-        "#merchant-onboarding-body > div.dialog-modal-wrapper.e462wnt15.css-1252kk2.e1gf2dph0 > div > div > div > div > div.css-2bi7a5.e462wnt4 > div",
-        "#merchant-onboarding-body > div.dialog-modal-wrapper.css-g20w7n.e1gf2dph0 > div > div > div > button"
-    ]
-
-    for idx, selector in enumerate(popup_selectors, start=1):
-        try:
-            logging.info(f"[팝업{idx}] 클릭 시도")
-            element = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(random.uniform(1.2, 2.4))
-            
-            # 팝업도 물리적 클릭 시도
-            human_click(driver, element)
-            logging.info(f"[팝업{idx}] 클릭 성공")
-            time.sleep(random.uniform(1.2, 2.4))
-        except TimeoutException:
-            logging.info(f"[팝업{idx}] 없음 또는 클릭 불가 → 스킵")
-        except Exception as e:
-            logging.info(f"[팝업{idx}] 예외 발생 → {e}")
+    # 팝업은 페이지 안 자동 닫기 스크립트가 처리. 버튼마다 '팝업이 뜸'과 '버튼 클릭 가능'을 한 대기로 경합시키고,
+    # 이미 다음 화면이면(done_selector) 바로 넘어간다.
+    time.sleep(random.uniform(1.2, 2.4))
 
     # 매출관리 버튼
-    try:
-        order_management_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "#merchant-management > div > nav > div.css-hd12du.esf794x2 > ul > li:nth-child(5) > a")
-            )
-        )
+    order_management_button = race_target(
+        driver, "coupang",
+        "#merchant-management > div > nav > div.css-hd12du.esf794x2 > ul > li:nth-child(5) > a",
+        label="매출관리 버튼", done_selector="div.sales-search-row"
+    )
+    if order_management_button:
         human_click(driver, order_management_button)
         logging.info("매출관리 버튼 클릭")
         time.sleep(random.uniform(1.5, 2.8))
-    except TimeoutException:
+    else:
         logging.info("매출관리가 나타나지 않아 스킵")
 
     # 펼쳐보기 버튼
-    try:
-        float_dropdown_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "#merchant-management > div > div > div.management-scroll > div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > div > div > div > div > div.mt-4.sales-search-row > div.sales-search-filters-date-picker.css-18vw3vd.e4pgcj010 > div > div > svg")
-            )
-        )
+    float_dropdown_button = race_target(
+        driver, "coupang",
+        "#merchant-management > div > div > div.management-scroll > div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > div > div > div > div > div.mt-4.sales-search-row > div.sales-search-filters-date-picker.css-18vw3vd.e4pgcj010 > div > div > svg",
+        label="펼쳐보기 버튼", done_selector=TODAY_BUTTON_SELECTOR
+    )
+    if float_dropdown_button:
         human_click(driver, float_dropdown_button)
         logging.info("펼쳐보기 버튼 클릭")
         time.sleep(random.uniform(1.2, 2.4))
-    except TimeoutException:
+    else:
         logging.info("펼처보기가 나타나지 않아 스킵")
 
 ###############################################################################
 # 5. '오늘' 버튼 + '조회' 버튼
 ###############################################################################
+TODAY_BUTTON_SELECTOR = (
+    "#merchant-management > div > div > div.management-scroll > "
+    "div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > "
+    "div > div > div > div > div.mt-4.sales-search-row > div.sales-search-filters-date-picker.css-18vw3vd.e4pgcj010 > "
+    "div > div.css-mc9tgf.e4pgcj05 > div.css-h5a8xm.e4pgcj04 > span:nth-child(1) > label > svg"
+)
+
+
 def click_today_and_search(driver):
     try:
         today_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((
-                By.CSS_SELECTOR,
-                "#merchant-management > div > div > div.management-scroll > "
-                "div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > "
-                "div > div > div > div > div.mt-4.sales-search-row > div.sales-search-filters-date-picker.css-18vw3vd.e4pgcj010 > "
-                "div > div.css-mc9tgf.e4pgcj05 > div.css-h5a8xm.e4pgcj04 > span:nth-child(1) > label > svg"
-            ))
+            EC.element_to_be_clickable((By.CSS_SELECTOR, TODAY_BUTTON_SELECTOR))
         )
         human_click(driver, today_button)
         logging.info("오늘 버튼 클릭")
@@ -316,90 +313,149 @@ def get_today_revenue(driver):
 ###############################################################################
 # 7. 주문 목록 스크래핑
 ###############################################################################
-def expand_and_parse_order(driver, order_index):
-    expand_selector = (
-        "#merchant-management > div > div > div.management-scroll > "
-        "div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > "
-        "div > div > div > div > div:nth-child(5) > "
-        f"div > ul.order-search-result-content.row > li:nth-child({order_index}) > "
-        "section.order-item.row.text-nowrap > div.order-price.col-4.col-md-3.text-right > button"
-    )
-
-    expand_btn = None
-    try:
-        expand_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, expand_selector))
-        )
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", expand_btn)
-        time.sleep(random.uniform(1.0, 2.0))
-
-        human_click(driver, expand_btn)
-        logging.info(f"{order_index}번째 주문 펼치기 버튼 클릭 성공")
-
-    except TimeoutException:
-        logging.warning(f"{order_index}번째 주문 펼치기 버튼을 찾지 못했습니다.")
-        return []
-    except ElementClickInterceptedException:
-        if expand_btn:
-            try:
-                time.sleep(random.uniform(0.5, 1.5))
-                driver.execute_script("arguments[0].click();", expand_btn)
-            except WebDriverException:
-                return []
-        return []
-    except WebDriverException:
-        return []
-
-    time.sleep(random.uniform(1.2, 2.4))  
-    return parse_expanded_order(driver)
-
-def parse_expanded_order(driver):
+# 현재 페이지의 주문을 차례로 펼쳐 품목명/수량을 페이지 안에서 모두 읽는다.
+# 주문마다 상세(li.expanded의 section.order-details)가 그려질 때까지 페이지 안에서 기다리고,
+# 이미 펼쳐진 주문은 누르지 않는다. pauseMs=[최소, 최대]면 주문 사이에 무작위로 쉰다.
+# 주문 요약에 취소/거절 표시가 있으면 canceled로 표시한다 (매출액 대사에서 제외).
+# stale()이 참이 되면 (탭 작업이 버려짐) 더 펼치지 않고 멈춘다.
+EXPAND_ORDERS_JS = """
+const [orderTimeoutMs, pauseMs, done, stale = () => false] = arguments;
+const list = document.querySelector('ul.order-search-result-content.row');
+if (!list) { done(null); return; }
+
+const DETAIL = 'section.order-details.initial-order-detail';
+const ITEM = 'div.order-detail-list > div > div.col-12.col-md-9 > ul > li';
+const CANCELED = /취소|거절/;
+const orders = [...list.children].filter(li => li.querySelector('section.order-item'));
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+const detailOf = li => {
+    const detail = li.classList.contains('expanded') ? li.querySelector(DETAIL) : null;
+    return detail && detail.querySelector(ITEM) ? detail : null;
+};
+const waitDetail = async li => {
+    const deadline = performance.now() + orderTimeoutMs;
+    while (performance.now() < deadline && !stale()) {
+        const detail = detailOf(li);
+        if (detail) return detail;
+        await sleep(50);
+    }
+    return null;
+};
+
+(async () => {
+    const started = performance.now();
+    const lines = [], failed = [], prices = [], canceled = [];
+    for (let i = 0; i < orders.length; i++) {
+        if (stale()) { done({error: 'stale'}); return; }
+        const li = orders[i];
+        const price = li.querySelector('section.order-item div.order-price');
+        const amount = price && price.innerText.match(/\\d[\\d,]*/);
+        prices.push(amount ? parseInt(amount[0].replace(/,/g, ''), 10) : null);
+        canceled.push(CANCELED.test(li.querySelector('section.order-item').innerText));
+        let detail = detailOf(li);
+        if (!detail) {
+            const button = li.querySelector('section.order-item div.order-price > button');
+            if (!button) { failed.push(i + 1); continue; }
+            if (i && pauseMs[1]) await sleep(pauseMs[0] + Math.random() * (pauseMs[1] - pauseMs[0]));
+            button.scrollIntoView({block: 'center'});
+            button.click();
+            detail = await waitDetail(li);
+            if (!detail) { failed.push(i + 1); continue; }
+        }
+        for (const item of detail.querySelectorAll(ITEM)) {
+            const name = item.querySelector('div > div:nth-child(1)');
+            const qty = item.querySelector('div > div.col-2.text-nowrap');
+            if (!name || !qty) continue;
+            lines.push([i + 1, name.innerText.trim().split('\\n')[0], qty.innerText.trim()]);
+        }
+    }
+    done({orders: orders.length, lines, failed, prices, canceled, elapsed: performance.now() - started});
+})().catch(e => done({error: String(e)}));
+"""
+ORDER_EXPAND_TIMEOUT = 5   # 주문 하나의 상세가 그려질 때까지 (초)
+ORDER_EXPAND_PAUSE_MS = [800, 1600]  # 사람처럼 주문 사이 0.8~1.6초 쉼
+
+
+def read_page_orders(driver):
+    """
+    현재 페이지의 주문을 모두 펼치고 품목을 execute_async_script 한 번으로 읽는다.
+    :return: {"orders": 주문 수, "lines": [(주문 순번, 품목명, 수량 텍스트), ...],
+              "prices": 주문별 금액, "canceled": 주문별 취소 여부, "failed": 펼치지 못한 주문 순번} 또는 None
+    """
+    # 한 페이지 최대 10건 × (상세 대기 + 주문 사이 쉼)
+    script_timeout = 10 * (ORDER_EXPAND_TIMEOUT + ORDER_EXPAND_PAUSE_MS[1] / 1000) + 10
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(script_timeout)
     try:
-        expanded_section = driver.find_element(
-            By.CSS_SELECTOR, "li.col-12.expanded section.order-details.initial-order-detail"
+        result = driver.execute_async_script(
+            EXPAND_ORDERS_JS, ORDER_EXPAND_TIMEOUT * 1000, ORDER_EXPAND_PAUSE_MS
         )
-    except NoSuchElementException:
-        logging.warning("펼쳐진 주문 섹션을 찾지 못했습니다.")
-        return []
-
-    item_elements = expanded_section.find_elements(
-        By.CSS_SELECTOR, "div.order-detail-list > div > div.col-12.col-md-9 > ul > li"
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
+    if not result:
+        logging.warning("주문 목록을 찾지 못했습니다.")
+        return None
+    if "error" in result:
+        logging.warning(f"주문 펼치기 스크립트 오류: {result['error']}")
+        return None
+
+    lines = result["lines"] = [tuple(line) for line in result["lines"]]
+    for order_no, item_name, item_qty in lines:
+        logging.info(f"  - ({order_no}) 품목명='{item_name}', 판매량='{item_qty}'")
+    if result["failed"]:
+        logging.warning(f"{result['failed']}번째 주문을 펼치지 못했습니다.")
+    if any(result["canceled"]):
+        canceled = [i + 1 for i, c in enumerate(result["canceled"]) if c]
+        logging.info(f"{canceled}번째 주문은 취소 주문 (매출액 대사에서 제외)")
+    logging.info(
+        f"주문 {result['orders']}건 / 품목 {len(lines)}줄 읽음 "
+        f"({result['elapsed'] / 1000:.1f}s, 스크립트 1회)"
     )
+    return result
+
+# dom: 항상 주문 펼치기 / api: 주문 조회 API 응답으로 집계 (실패하면 펼치기로 대체)
+# 응답 필드 이름이 실제 캡처로 확인되기 전까지는 dom이 기본값
+ORDER_SOURCE = os.getenv("COUPANG_ORDER_SOURCE", "dom")
+
+
+def scrape_orders_from_api(capture):
+    """
+    '조회' 응답과 재요청한 나머지 페이지로 품목/수량을 모은다 (취소 주문 제외).
+    :return: ([(품목명, 수량 텍스트), ...], API 매출 합계 또는 None, 취소 제외 주문 금액 합계)
+             쓸 수 없으면 (None, None, 0)
+    """
+    result = capture.fetch_all_pages()
+    if result is None or not looks_complete(result["orders"]):
+        logging.warning("[쿠팡 API] 주문 응답 없음/필드 불일치 → 주문 펼치기로 대체")
+        return None, None, 0
+
+    items = []
+    canceled = 0
+    orders_total = 0
+    for order in result["orders"]:
+        if is_canceled(order):
+            canceled += 1
+            continue
+        orders_total += order["total"] or 0
+        for item in order["items"]:
+            items.append((item["name"], str(item["qty"])))
+            logging.info(f"  - ({order['order_id']}) 품목명='{item['name']}', 판매량='{item['qty']}'")
+    logging.info(
+        f"[쿠팡 API] {result['pages']}페이지, 주문 {len(result['orders'])}건 "
+        f"(취소 {canceled}건 제외, 펼치기/페이지 버튼 없음)"
+    )
+    return items, result["revenue"], orders_total
 
-    results = []
-    for idx, item_el in enumerate(item_elements, start=1):
-        try:
-            name_el = item_el.find_element(By.CSS_SELECTOR, "div > div:nth-child(1)")
-            qty_el = item_el.find_element(By.CSS_SELECTOR, "div > div.col-2.text-nowrap")
-
-            raw_name = name_el.text.strip()
-            lines = raw_name.split('\n')
-            item_name = lines[0]
-            item_qty = qty_el.text.strip()
-
-            results.append((item_name, item_qty))
-            logging.info(f"  - ({idx}) 품목명='{item_name}', 판매량='{item_qty}'")
-        except Exception as e:
-            logging.warning(f"  - ({idx})번 아이템 파싱 실패: {e}")
-
-    return results
-
-def scrape_orders_in_page(driver):
-    all_items = []
-    for i in range(1, 11):  
-        items = expand_and_parse_order(driver, i)
-        if items:
-            all_items.extend(items)
-    return all_items
 
 def scrape_all_pages_by_buttons(driver):
-    all_data = []
+    """페이지 버튼으로 차례로 넘기며 읽는다. :return: {페이지: read_page_orders 결과 또는 None}"""
+    results = {}
     current_page = 1
 
     while True:
         logging.info(f"\n=== [PAGE {current_page}] ===")
-        items_in_this_page = scrape_orders_in_page(driver)
-        all_data.extend(items_in_this_page)
+        results[current_page] = read_page_orders(driver)
 
         next_page = current_page + 1
         success = go_to_page_button(driver, next_page)
@@ -410,27 +466,51 @@ def scrape_all_pages_by_buttons(driver):
         current_page = next_page
         time.sleep(random.uniform(1.5, 3.0))
 
-    return all_data
+    return results
 
-def go_to_page_button(driver, page_number):
-    if page_number == 1:
+
+def find_page_button(driver, page_number, timeout=10):
+    """
+    page_number 버튼으로 가는 다음 한 걸음 (pagination_state 결과, button/step 포함).
+    페이지 버튼 영역이 뜰 때까지만 기다리고, 갈 수 없는 페이지면 button이 None
+    """
+    try:
+        return WebDriverWait(driver, timeout).until(lambda d: pagination_state(d, page_number) or False)
+    except TimeoutException:
+        return None
+
+
+def go_to_page_button(driver, page_number, force=False):
+    # 처음 조회하면 1페이지이므로 건너뜀 (force면 다시 읽기용으로 1페이지 버튼도 누름)
+    if page_number == 1 and not force:
         return True
 
-    nth = page_number + 2  
-    selector = (
-        "#merchant-management > div > div > div.management-scroll > "
-        "div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > "
-        "div > div > div > div > div:nth-child(5) > div > div > div > div > ul > "
-        f"li:nth-child({nth}) > button"
-    )
+    # 이미 보고 있는 페이지면 누르지 않음 (첫 주문이 그대로라 페이지 전환 대기만 끝까지 씀)
+    # 페이지 버튼 영역이 없으면 한 페이지뿐이므로 1페이지가 열려 있는 것
+    state = pagination_state(driver)
+    if (state["current"] if state else 1) == page_number:
+        logging.info(f"{page_number}페이지가 이미 열려 있어 이동 생략")
+        return True
 
-    try:
-        page_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-        )
+    # 번호 버튼은 창 단위로만 보이므로 목표 번호가 보일 때까지 '다음/이전'으로 창을 옮긴다
+    for _ in range(PAGE_WINDOW_STEPS):
+        state = find_page_button(driver, page_number)
+        if not state or not state["button"]:
+            logging.info(f"{page_number}페이지 버튼 클릭 실패 또는 존재하지 않음")
+            return False
+        page_btn = state["button"]
         human_click(driver, page_btn)
-        logging.info(f"{page_number}페이지 버튼 클릭 성공")
-        time.sleep(random.uniform(1.5, 2.8)) 
+        if state["step"] == "page":
+            break
+        logging.info(f"{page_number}페이지가 보이지 않아 '{state['step']}' 버튼으로 창 이동")
+        time.sleep(random.uniform(1.5, 2.8))
+    else:
+        logging.info(f"{page_number}페이지 버튼 클릭 실패 또는 존재하지 않음")
+        return False
+
+    logging.info(f"{page_number}페이지 버튼 클릭 성공")
+    try:
+        time.sleep(random.uniform(1.5, 2.8))
 
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "ul.order-search-result-content.row"))
@@ -441,6 +521,302 @@ def go_to_page_button(driver, page_number):
         logging.info(f"{page_number}페이지 버튼 클릭 실패 또는 존재하지 않음")
         return False
 
+
+# ==============================
+# 여러 탭으로 페이지 나눠 읽기 (COUPANG_PAGE_TABS=K, 기본 1 = 한 탭에서 차례로)
+#   첫 탭에서 페이지 수를 센 뒤 같은 브라우저(로그인 유지)에 탭을 더 열어 페이지를 나눠 준다.
+#   페이지 이동은 탭마다 차례로 하지만 주문 펼치기(EXPAND_ORDERS_JS)는 탭마다 동시에 돌고,
+#   결과는 페이지 순서로 합친다.
+# ==============================
+PAGE_TABS = int(os.getenv("COUPANG_PAGE_TABS", "1"))
+MANAGEMENT_URL = "https://store.coupangeats.com/merchant/management"
+PAGINATION_SELECTOR = (
+    "#merchant-management > div > div > div.management-scroll > "
+    "div.management-page.p-2.p-md-4.p-lg-5.d-flex.flex-column > "
+    "div > div > div > div > div:nth-child(5) > div > div > div > div > ul"
+)
+
+# 페이지 버튼 상태. 번호 버튼은 창 단위(예: 1…5 + 다음)로만 보이므로 보이는 최대 번호가
+# 전체 페이지 수가 아닐 수 있다. target이 있으면 누를 버튼을 고른다: 보이면 그 번호,
+# 창보다 뒤면 번호 뒤의 '다음' 쪽 버튼, 앞이면 번호 앞의 '이전' 쪽 버튼 (없거나 비활성이면 null).
+# total은 조회 결과의 '총 N건' 표시가 있을 때의 주문 건수.
+PAGINATION_JS = """
+const [selector, target] = arguments;
+const pagination = document.querySelector(selector);
+if (!pagination) return null;
+const buttons = [...pagination.querySelectorAll('li > button')];
+const enabled = b => !b.disabled && !b.closest('li').classList.contains('disabled');
+const numberOf = b => /^\\d+$/.test(b.innerText.trim()) ? parseInt(b.innerText.trim(), 10) : null;
+const numbered = buttons.filter(b => numberOf(b) !== null);
+const numbers = numbered.map(numberOf);
+const isActive = b => b.classList.contains('active') || b.closest('li').classList.contains('active')
+    || b.getAttribute('aria-current') === 'page';
+const active = numbered.find(isActive);
+const firstIdx = buttons.indexOf(numbered[0]), lastIdx = buttons.indexOf(numbered[numbered.length - 1]);
+const next = numbered.length ? buttons.slice(lastIdx + 1).find(enabled) : null;
+const prev = numbered.length ? buttons.slice(0, firstIdx).reverse().find(enabled) : null;
+
+let button = null, step = null;
+if (target && numbered.length) {
+    const exact = numbered.find(b => numberOf(b) === target);
+    if (exact) { button = exact; step = 'page'; }
+    else if (target > Math.max(...numbers) && next) { button = next; step = 'next'; }
+    else if (target < Math.min(...numbers) && prev) { button = prev; step = 'prev'; }
+}
+const summary = document.querySelector('div.summary-wrapper') || document.querySelector('div.management-page');
+const count = summary && summary.innerText.match(/총\\s*([\\d,]+)\\s*건/);
+return {
+    numbers, current: active ? numberOf(active) : null, more: !!next,
+    total: count ? parseInt(count[1].replace(/,/g, ''), 10) : null,
+    button, step,
+};
+"""
+PAGE_WINDOW_STEPS = 20  # 목표 번호가 보일 때까지 '다음/이전'을 누르는 최대 횟수
+
+
+def pagination_state(driver, target=None):
+    return driver.execute_script(PAGINATION_JS, PAGINATION_SELECTOR, target or 0)
+
+
+def count_pages(driver):
+    """
+    :return: (페이지 수, 확정 여부). '총 N건'이 보이면 건수 ÷ ORDERS_PER_PAGE로 확정,
+             아니면 보이는 최대 번호이고 뒤로 더 갈 수 있으면 미확정 (창 밖 페이지가 있을 수 있음)
+    """
+    state = pagination_state(driver)
+    if not state or not state["numbers"]:
+        return 1, True
+    visible = max(state["numbers"])
+    if state["total"]:
+        return max(-(-state["total"] // ORDERS_PER_PAGE), visible), True
+    return visible, not state["more"]
+
+# EXPAND_ORDERS_JS를 기다리지 않고 시작만 한다. 결과는 window.__orderExpand = {token, result}에 남는다.
+# 시작할 때마다 token(arguments[2])을 바꾸므로, 시간 초과로 버린 이전 작업은 스스로 멈추고
+# 늦게 끝나도 결과를 덮어쓰지 않는다.
+START_EXPAND_JS = (
+    "const token = arguments[2];"
+    "window.__orderExpandToken = token;"
+    "window.__orderExpand = null;"
+    "(function () {" + EXPAND_ORDERS_JS + "}).apply(null, ["
+    "arguments[0], arguments[1], result => {"
+    " if (window.__orderExpandToken !== token) return;"
+    " window.__orderExpand = {token, result: result || {orders: 0, lines: [], failed: [], prices: [], canceled: []}};"
+    "}, () => window.__orderExpandToken !== token"
+    "]);"
+)
+# 시간 초과한 탭의 펼치기를 멈추게 한다 (token을 비움)
+STOP_EXPAND_JS = "window.__orderExpandToken = null;"
+
+
+def open_search_tab(driver):
+    """새 탭에서 매출관리 → 오늘/조회까지 마친다. :return: (탭 핸들, 준비 시간)"""
+    started = time.time()
+    driver.switch_to.new_window("tab")
+    block_requests(driver, "coupang")
+    install_popup_dismisser(driver, "coupang")
+    driver.get(MANAGEMENT_URL)
+    close_coupang_popup(driver)
+    click_today_and_search(driver)
+    return driver.current_window_handle, time.time() - started
+
+
+def scrape_pages_in_tabs(driver, tabs=PAGE_TABS):
+    """
+    페이지를 tabs개 탭에 나눠 주문을 펼쳐 읽는다 (첫 탭은 이미 조회된 현재 탭).
+    :return: {페이지: 결과 또는 None} (scrape_all_pages_by_buttons와 같은 형식)
+    """
+    page_total, exact = count_pages(driver)
+    tabs = max(1, min(tabs, page_total))
+    if tabs == 1:
+        return scrape_all_pages_by_buttons(driver)
+    logging.info(f"[탭] {page_total}페이지{'' if exact else ' 이상'}를 탭 {tabs}개로 나눠 읽기")
+
+    main_handle = driver.current_window_handle
+    workers = {main_handle: {"setup": 0.0, "pages": [], "busy": 0.0, "page": 1}}
+    for _ in range(tabs - 1):
+        try:
+            handle, setup = open_search_tab(driver)
+        except Exception as e:
+            logging.warning(f"[탭] 새 탭 준비 실패 → 나머지 탭으로 진행: {e}")
+            continue
+        workers[handle] = {"setup": setup, "pages": [], "busy": 0.0, "page": 1}
+
+    queue = list(range(1, page_total + 1))
+    results = {}
+    dispatched = 0
+    script_timeout = 10 * (ORDER_EXPAND_TIMEOUT + ORDER_EXPAND_PAUSE_MS[1] / 1000) + 10
+    while queue:
+        # 탭마다 다음 페이지로 이동해 펼치기 시작
+        running = {}
+        for handle, worker in workers.items():
+            if not queue:
+                break
+            page = queue.pop(0)
+            driver.switch_to.window(handle)
+            if page != worker["page"] and not go_to_page_button(driver, page):
+                logging.warning(f"[탭] {page}페이지로 이동 실패")
+                results[page] = None
+                continue
+            worker["page"] = page
+            dispatched += 1
+            token = f"{page}-{dispatched}"
+            driver.execute_script(START_EXPAND_JS, ORDER_EXPAND_TIMEOUT * 1000, ORDER_EXPAND_PAUSE_MS, token)
+            running[handle] = (page, time.time(), token)
+
+        # 끝난 탭부터 결과 회수
+        deadline = time.time() + script_timeout
+        while running and time.time() < deadline:
+            for handle in list(running):
+                driver.switch_to.window(handle)
+                state = driver.execute_script("return window.__orderExpand;")
+                if not state or state["token"] != running[handle][2]:
+                    continue
+                result = state["result"]
+                page, started, _ = running.pop(handle)
+                elapsed = time.time() - started
+                workers[handle]["pages"].append(page)
+                workers[handle]["busy"] += elapsed
+                if "error" in result:
+                    logging.warning(f"[탭] {page}페이지 펼치기 스크립트 오류: {result['error']}")
+                    results[page] = None
+                    continue
+                result["lines"] = [tuple(line) for line in result["lines"]]
+                results[page] = result
+                logging.info(
+                    f"[탭] {page}페이지: 주문 {result['orders']}건 / 품목 {len(result['lines'])}줄 ({elapsed:.1f}s)"
+                )
+                if result.get("failed"):
+                    logging.warning(f"[탭] {page}페이지 {result['failed']}번째 주문을 펼치지 못했습니다.")
+            time.sleep(0.2)
+        for handle, (page, _, _) in running.items():
+            logging.warning(f"[탭] {page}페이지 펼치기 시간 초과")
+            results[page] = None
+            driver.switch_to.window(handle)
+            driver.execute_script(STOP_EXPAND_JS)
+
+        # 번호 창 밖에 페이지가 더 있을 수 있으면 가장 뒤 페이지에 있는 탭에서 다시 센다
+        if not exact:
+            last_handle = max(workers, key=lambda h: workers[h]["page"])
+            driver.switch_to.window(last_handle)
+            counted, exact = count_pages(driver)
+            if counted > page_total:
+                queue.extend(range(page_total + 1, counted + 1))
+                logging.info(f"[탭] 페이지 {page_total + 1}~{counted} 추가 발견")
+                page_total = counted
+
+    for handle in workers:
+        if handle != main_handle:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(main_handle)
+
+    for n, worker in enumerate(workers.values(), start=1):
+        logging.info(
+            f"[탭] #{n}: 준비 {worker['setup']:.1f}s, 페이지 {worker['pages']}, 펼치기 {worker['busy']:.1f}s"
+        )
+    missing = [page for page, result in sorted(results.items()) if result is None]
+    if missing:
+        logging.warning(f"[탭] 읽지 못한 페이지: {missing}")
+    return results
+
+
+# ==============================
+# 매출액 대사 (주문 금액 합계 ↔ 매출액)
+#   페이지 이동이 실패하거나 주문을 못 펼친 페이지는 그대로 빠지면 재고가 덜 잡힌다.
+#   페이지별 주문 금액 합계를 매출액과 맞춰 보고, 어긋나면 주문 수가 모자라 보이는 페이지만 다시 읽는다.
+# ==============================
+ORDERS_PER_PAGE = 10
+
+
+def page_items(results):
+    """{페이지: 결과} → [(품목명, 수량 텍스트), ...] 페이지 순서"""
+    items = []
+    for page in sorted(results):
+        if results[page]:
+            items.extend((item_name, item_qty) for _, item_name, item_qty in results[page]["lines"])
+    return items
+
+
+def _looks_short(result, last_page):
+    if not result:
+        return True
+    if result["failed"]:
+        return True
+    return result["orders"] == 0 if last_page else result["orders"] < ORDERS_PER_PAGE
+
+
+def _orders_total(results):
+    """취소 주문을 뺀 주문 금액 합계 (매출액 / API 주문 금액과 같은 기준)"""
+    return sum(
+        price or 0
+        for r in results.values() if r
+        for price, canceled in zip(r["prices"], r["canceled"]) if not canceled
+    )
+
+
+def reconcile_pages(driver, results, revenue):
+    """
+    페이지별 주문 금액 합계를 매출액과 비교하고, 다르면 의심 페이지(빠진 페이지, 주문이 덜 찬 중간 페이지,
+    펼치지 못한 주문이 있는 페이지)만 한 번 다시 읽는다. results는 다시 읽은 결과로 갱신된다.
+    :return: 대사 요약 dict (log_reconciliation으로 출력)
+    """
+    page_total = max(count_pages(driver)[0], max(results, default=1))
+
+    def suspects():
+        return [page for page in range(1, page_total + 1)
+                if _looks_short(results.get(page), page == page_total)]
+
+    before = _orders_total(results)
+    suspect = suspects()
+    refetched = []
+    missing = [page for page in suspect if not results.get(page)]
+    if suspect and (before != revenue or missing):
+        logging.info(f"[대사] 주문 금액 합계 {before} ≠ 매출액 {revenue} → 의심 페이지 {suspect} 다시 읽기")
+        for page in suspect:
+            if not go_to_page_button(driver, page, force=True):
+                continue
+            result = read_page_orders(driver)
+            if result:
+                results[page] = result
+                refetched.append(page)
+
+    after = _orders_total(results)
+    return {
+        "source": "dom",
+        "revenue": revenue,
+        "orders_total": after,
+        "orders_total_before": before,
+        "diff": revenue - after,
+        "pages": page_total,
+        "orders": sum(r["orders"] for r in results.values() if r),
+        "canceled": sum(sum(r["canceled"]) for r in results.values() if r),
+        "suspect": suspect,
+        "refetched": refetched,
+        "still_short": suspects(),
+    }
+
+
+def log_reconciliation(summary):
+    if not summary:
+        return
+    state = "일치" if summary["diff"] == 0 else f"차이 {summary['diff']:,}원"
+    logging.info(
+        f"[대사] ({summary['source']}) 매출액 {summary['revenue']:,}원 / "
+        f"주문 금액 합계 {summary['orders_total']:,}원 → {state}"
+    )
+    if summary["source"] == "dom":
+        logging.info(
+            f"[대사] 페이지 {summary['pages']}개, 주문 {summary['orders']}건 (취소 {summary['canceled']}건), "
+            f"의심 페이지 {summary['suspect']}, 다시 읽음 {summary['refetched']} "
+            f"(다시 읽기 전 합계 {summary['orders_total_before']:,}원)"
+        )
+        if summary["still_short"]:
+            logging.warning(f"[대사] 여전히 주문이 모자라 보이는 페이지: {summary['still_short']}")
+    if summary["diff"]:
+        logging.warning("[대사] 매출액과 주문 금액이 달라 재고 수량이 덜/더 잡혔을 수 있습니다 (취소 주문 포함 여부 확인)")
+
+
 ###############################################################################
 # 8. 구글 시트
 ###############################################################################
@@ -520,24 +896,46 @@ def main():
     setup_logging('script.log')
 
     coupang_id, coupang_pw, service_account_json_b64 = get_environment_variables()
-    driver = get_chrome_driver()
+    driver = instrument(get_chrome_driver(), "2-chengla-coupang-auto")
     all_order_items = []
     today_revenue = 0
+    reconciliation = None
 
     try:
-        # 1) 로그인
-        login_coupang_eats(driver, user_id=coupang_id, password=coupang_pw)
+        # 1) 로그인 (저장된 세션이 살아 있으면 로그인 생략)
+        restore_or_login(
+            driver, "chengla", "coupang",
+            lambda: login_coupang_eats(driver, user_id=coupang_id, password=coupang_pw)
+        )
         close_coupang_popup(driver)
 
-        # 2) 오늘/조회
+        # 2) 오늘/조회 (API 모드면 조회 응답 JSON을 함께 캡처)
+        capture = OrderSearchCapture(driver).start() if ORDER_SOURCE == "api" else None
         click_today_and_search(driver)
 
         # 3) 매출액
         today_revenue = get_today_revenue(driver)
         logging.info(f"[결과] 오늘 매출액: {today_revenue}")
 
-        # 4) 주문 스크래핑
-        all_order_items = scrape_all_pages_by_buttons(driver)
+        # 4) 주문 스크래핑 + 매출액 대사
+        api_items = None
+        if capture:
+            api_items, api_revenue, api_orders_total = scrape_orders_from_api(capture)
+            capture.stop()
+            if api_revenue is not None:
+                logging.info(f"[쿠팡 API] 매출 합계: {api_revenue}")
+                if not today_revenue:
+                    today_revenue = api_revenue
+        if api_items is not None:
+            all_order_items = api_items
+            reconciliation = {
+                "source": "api", "revenue": today_revenue, "orders_total": api_orders_total,
+                "diff": today_revenue - api_orders_total,
+            }
+        else:
+            page_results = scrape_pages_in_tabs(driver)
+            reconciliation = reconcile_pages(driver, page_results, today_revenue)
+            all_order_items = page_items(page_results)
         logging.info(f"[결과] 수집된 메뉴 아이템 총 {len(all_order_items)}개")
 
     except Exception as e:
@@ -546,8 +944,11 @@ def main():
 
     finally:
         if 'driver' in locals():
+            log_dismissed_popups(driver)
             driver.quit()
             logging.info("WebDriver 종료")
+        log_reconciliation(reconciliation)
+        log_command_summary()
 
     # 5) 구글 시트 연동
     try:
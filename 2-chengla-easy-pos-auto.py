@@ -13,7 +13,12 @@ from selenium.common.exceptions import (
     TimeoutException,
     WebDriverException
 )
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolve_chromedriver
+from chrome_pool import lease_driver
+from session_store import restore_or_login
+from waits import wait_until, element_gone, text_of, text_changed, any_of, log_wait_summary
+from network_idle import network_idle, enable_network_log, log_network_summary
+from command_budget import instrument, log_command_summary
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -112,7 +117,118 @@ def process_rows_sequentially(driver, code_to_cell_inventory, special_prices, ma
     return update_cells_inventory
 
 
+LEFT_MENU_FIRST_ROW = "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement"
+
+
+def login_easypos(driver):
+    """
+    EasyPOS 로그인 페이지에 접속해 로그인하고, 비밀번호 변경 안내 팝업을 닫습니다.
+
+    :param driver: Selenium WebDriver 인스턴스
+    """
+    # ================================================
+    # 3. EasyPOS 로그인 페이지 접속 및 로그인 진행
+    # ================================================
+    url = "https://smart.easypos.net/index.jsp"
+    driver.get(url)
+    print("[INFO] EasyPOS 로그인 페이지에 접속했습니다.")
+
+    # 프레임 전환
+    driver.implicitly_wait(1)
+    driver.switch_to.frame("main")
+    print("[INFO] 'main' 프레임으로 전환했습니다.")
+
+    # ID 입력
+    WebDriverWait(driver, 10).until(
+        EC.visibility_of_element_located((By.ID, "mainframe_childframe_form_divMain_edtId_input"))
+    )
+    id_input = driver.find_element(By.ID, "mainframe_childframe_form_divMain_edtId_input")
+    id_input.click()
+    id_input.clear()
+    id_input.send_keys(os.getenv("CHENGLA_EASY_POS_ID"))
+    print("[INFO] ID 입력 완료.")
+
+    # PW 입력
+    WebDriverWait(driver, 10).until(
+        EC.visibility_of_element_located((By.ID, "mainframe_childframe_form_divMain_edtPw_input"))
+    )
+    pw_input = driver.find_element(By.ID, "mainframe_childframe_form_divMain_edtPw_input")
+    pw_input.click()
+    pw_input.clear()
+    pw_input.send_keys(os.getenv("CHENGLA_EASY_POS_PW"))
+    print("[INFO] PW 입력 완료.")
+
+    # 로그인 버튼 클릭
+    login_button = driver.find_element(By.ID, "mainframe_childframe_form_divMain_btnLogin")
+    login_button.click()
+    print("[INFO] 로그인 버튼 클릭 완료.")
+
+    # 로그인 후 상단 메뉴 또는 비밀번호 변경 안내 팝업이 뜰 때까지 대기
+    wait_until(driver, any_of(
+        EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu3 > div")),
+        EC.visibility_of_element_located((By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement")),
+    ), 10, "EasyPOS 로그인")
+
+    # ================================================
+    # 4. 팝업(비밀번호 변경 안내) 닫기
+    # ================================================
+    try:
+        WebDriverWait(driver, 3).until(
+            EC.visibility_of_element_located((By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement"))
+        )
+        close_btn = driver.find_element(
+            By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement"
+        )
+        close_btn.click()
+        print("[INFO] 비밀번호 변경 안내 팝업 닫기 완료.")
+        wait_until(driver, element_gone(
+            (By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement")
+        ), 3, "비밀번호 팝업 닫힘")
+    except TimeoutException:
+        # 팝업이 없으면 패스
+        print("[INFO] 비밀번호 변경 안내 팝업이 존재하지 않습니다.")
+        pass
+
+
+def create_easypos_driver(user_agent):
+    """
+    헤드리스 모드 + 한국어/ko-KR 설정으로 새 Chrome을 실행합니다.
+
+    :param user_agent: 사용할 User-Agent 문자열
+    :return: Selenium WebDriver 인스턴스
+    """
+    options = webdriver.ChromeOptions()
+
+    # 1) Headless (GUI 없이 동작)
+    options.add_argument("--headless=new")  # 최신 headless 모드 사용
+
+    # 2) 서버 환경 안정성 옵션
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+
+    # 3) 언어 설정
+    options.add_argument("--lang=ko-KR")
+    options.add_experimental_option("prefs", {
+        "intl.accept_languages": "ko,ko-KR"
+    })
+
+    # 4) 기타 설정
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"user-agent={user_agent}")
+
+    # 5) 조회 완료 감지용 성능 로그 (네트워크 이벤트)
+    enable_network_log(options)
+
+    # ChromeDriver 설치 및 WebDriver 초기화
+    return webdriver.Chrome(
+        service=ChromeService(resolve_chromedriver()),
+        options=options
+    )
+
+
 def main():
+    driver = None
     try:
         # 로그 시작 시간
         current_utc = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
@@ -149,182 +265,99 @@ def main():
         # ================================
         # 2. Chrome WebDriver 실행
         # ================================
-        # --- 헤드리스 모드 + 한국어/ko-KR 설정 ---
-        options = webdriver.ChromeOptions()
-
-        # 1) Headless (GUI 없이 동작)
-        options.add_argument("--headless=new")  # 최신 headless 모드 사용
-
-        # 2) 서버 환경 안정성 옵션
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-
-        # 3) 언어 설정
-        options.add_argument("--lang=ko-KR")
-        options.add_experimental_option("prefs", {
-            "intl.accept_languages": "ko,ko-KR"
-        })
-
-        # 4) 기타 설정
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument(f"user-agent={user_agent}")
-
-        # ChromeDriver 설치 및 WebDriver 초기화
-        driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=options
-        )
-        print("[INFO] Chrome WebDriver 초기화 완료.")
+        # 워밍 풀이 떠 있으면 탭 임대
+        driver = lease_driver(user_agent=user_agent, window_size=(1920, 1080))
+        if driver:
+            print("[INFO] Chrome 워밍 풀에서 탭 임대 완료.")
+        else:
+            driver = create_easypos_driver(user_agent)
+            print("[INFO] Chrome WebDriver 초기화 완료.")
+        instrument(driver, "2-chengla-easy-pos-auto")
 
         # ================================================
-        # 3. EasyPOS 로그인 페이지 접속 및 로그인 진행
+        # 3~4. EasyPOS 로그인 (저장된 세션이 살아 있으면 생략)
         # ================================================
-        url = "https://smart.easypos.net/index.jsp"
-        driver.get(url)
-        print("[INFO] EasyPOS 로그인 페이지에 접속했습니다.")
+        restore_or_login(driver, "chengla", "easypos", lambda: login_easypos(driver))
 
-        # 프레임 전환
-        driver.implicitly_wait(1)
+        # 이후 화면은 모두 'main' 프레임 안에 있음
+        driver.switch_to.default_content()
         driver.switch_to.frame("main")
-        print("[INFO] 'main' 프레임으로 전환했습니다.")
-
-        # ID 입력
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "mainframe_childframe_form_divMain_edtId_input"))
-        )
-        id_input = driver.find_element(By.ID, "mainframe_childframe_form_divMain_edtId_input")
-        id_input.click()
-        id_input.clear()
-        id_input.send_keys(os.getenv("CHENGLA_EASY_POS_ID"))
-        print("[INFO] ID 입력 완료.")
-
-        # PW 입력
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.ID, "mainframe_childframe_form_divMain_edtPw_input"))
-        )
-        pw_input = driver.find_element(By.ID, "mainframe_childframe_form_divMain_edtPw_input")
-        pw_input.click()
-        pw_input.clear()
-        pw_input.send_keys(os.getenv("CHENGLA_EASY_POS_PW"))
-        print("[INFO] PW 입력 완료.")
-
-        # 로그인 버튼 클릭
-        login_button = driver.find_element(By.ID, "mainframe_childframe_form_divMain_btnLogin")
-        login_button.click()
-        print("[INFO] 로그인 버튼 클릭 완료.")
-
-        time.sleep(3)  # 로그인 후 화면 로딩 대기
-
-        # ================================================
-        # 4. 팝업(비밀번호 변경 안내) 닫기
-        # ================================================
-        try:
-            WebDriverWait(driver, 3).until(
-                EC.visibility_of_element_located((By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement"))
-            )
-            close_btn = driver.find_element(
-                By.ID, "mainframe_childframe_popupChangePasswd_titlebar_closebuttonAlignImageElement"
-            )
-            close_btn.click()
-            print("[INFO] 비밀번호 변경 안내 팝업 닫기 완료.")
-            time.sleep(1)
-        except TimeoutException:
-            # 팝업이 없으면 패스
-            print("[INFO] 비밀번호 변경 안내 팝업이 존재하지 않습니다.")
-            pass
 
         # ================================================
         # 5. 매출분석 → 상품분석 → 상품별 일매출분석
         # ================================================
         # 매출분석 탭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu3 > div"))
-        )
-        sales_analysis_tab = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu3 > div"
+        sales_analysis_tab = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu3 > div")),
+            10, "매출분석 탭", raise_on_timeout=True
         )
+        left_menu_before = text_of(driver, (By.CSS_SELECTOR, LEFT_MENU_FIRST_ROW))
         sales_analysis_tab.click()
         print("[INFO] 매출분석 탭 클릭 완료.")
-        time.sleep(1)
+        # 왼쪽 메뉴가 새 탭 내용으로 바뀔 때까지 대기
+        wait_until(driver, text_changed((By.CSS_SELECTOR, LEFT_MENU_FIRST_ROW), left_menu_before), 3, "왼쪽 메뉴 갱신")
 
         # 상품분석 탭 클릭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement"))
-        )
-        period_sales = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement"
+        period_sales = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement")),
+            10, "상품분석 탭", raise_on_timeout=True
         )
         period_sales.click()
         print("[INFO] 상품분석 탭 클릭 완료.")
-        time.sleep(1)
 
         # 상품별 일매출분석 탭 클릭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_6_cell_6_0_controltreeTextBoxElement"))
-        )
-        specific_period_item = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_6_cell_6_0_controltreeTextBoxElement"
+        specific_period_item = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_6_cell_6_0_controltreeTextBoxElement")),
+            10, "상품별 일매출분석 탭", raise_on_timeout=True
         )
         specific_period_item.click()
         print("[INFO] 상품별 일매출분석 탭 클릭 완료.")
-        time.sleep(1)
 
         # ================================================
         # 6. 당일 버튼 → 상품코드 표기 버튼 → 부가메뉴 포함 버튼 → 조회 버튼
         # ================================================
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate_btnNowDay"))
-        )
-        today_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate_btnNowDay"
+        today_btn = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate_btnNowDay")),
+            10, "당일 버튼", raise_on_timeout=True
         )
         today_btn.click()
         print("[INFO] 당일 버튼 클릭 완료.")
-        time.sleep(1)
 
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_chkItemCd_chkimg"))
-        )
-        code_search_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_chkItemCd_chkimg"
+        code_search_btn = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_chkItemCd_chkimg")),
+            10, "상품코드 표기 버튼", raise_on_timeout=True
         )
         code_search_btn.click()
         print("[INFO] 상품코드 표기 버튼 클릭 완료.")
-        time.sleep(1)
 
         # ▼ 드롭다운 열기
-        WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_cboSrchFg_dropbutton"))
-        )
-        dropdown_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_cboSrchFg_dropbutton"
+        dropdown_btn = wait_until(
+            driver, EC.element_to_be_clickable((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_cboSrchFg_dropbutton")),
+            10, "부가메뉴 포함 드롭다운 열기", raise_on_timeout=True
         )
         dropdown_btn.click()
         print("[INFO] 부가메뉴 포함 드롭다운 열기 완료.")
-        time.sleep(1)
 
         # ▼ 드롭다운에서 "부가메뉴포함" 항목 선택
-        WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, '//div[contains(@id, "cboSrchFg_combopopup")]//div[contains(text(), "부가메뉴포함")]'))
-        )
-        menu_include_option = driver.find_element(
-            By.XPATH, '//div[contains(@id, "cboSrchFg_combopopup")]//div[contains(text(), "부가메뉴포함")]'
+        menu_include_option = wait_until(
+            driver, EC.element_to_be_clickable((By.XPATH, '//div[contains(@id, "cboSrchFg_combopopup")]//div[contains(text(), "부가메뉴포함")]')),
+            10, "부가메뉴포함 항목", raise_on_timeout=True
         )
         menu_include_option.click()
         print("[INFO] '부가메뉴포함' 항목 클릭 완료.")
-        time.sleep(1)
 
         # ▼ 조회 버튼 클릭
-        WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch"))
+        search_btn = wait_until(
+            driver, EC.element_to_be_clickable((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch")),
+            10, "조회 버튼", raise_on_timeout=True
         )
-        search_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch"
-        )
-        search_btn.click()
-        print("[INFO] 조회 버튼 클릭 완료.")
-        time.sleep(2)
+        with network_idle(driver, label="상품별 매출 조회 요청"):
+            search_btn.click()
+            print("[INFO] 조회 버튼 클릭 완료.")
+        # 첫 행 상품코드가 채워지면 조회 완료
+        wait_until(driver, lambda d: d.find_element(
+            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_grdProductSalesPerDayList_body_gridrow_0_cell_0_3"
+        ).text.strip(), 10, "상품별 매출 조회 결과")
 
         # ================================================
         # 7. 데이터 행 처리 및 스프레드시트 업데이트 ("재고" 시트)
@@ -390,60 +423,53 @@ def main():
         # 8. 영업속보 → 영업일보 → 영업일보 분석
         # ================================================
         # 영업속보 탭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu2"))
-        )
-        sales_news_tab = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu2"
+        sales_news_tab = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divTop_img_TA_top_menu2")),
+            10, "영업속보 탭", raise_on_timeout=True
         )
+        left_menu_before = text_of(driver, (By.CSS_SELECTOR, LEFT_MENU_FIRST_ROW))
         sales_news_tab.click()
         print("[INFO] 영업속보 탭 클릭 완료.")
-        time.sleep(1)
+        # 왼쪽 메뉴가 새 탭 내용으로 바뀔 때까지 대기
+        wait_until(driver, text_changed((By.CSS_SELECTOR, LEFT_MENU_FIRST_ROW), left_menu_before), 3, "왼쪽 메뉴 갱신")
 
         # 영업일보 탭 클릭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement"))
-        )
-        daily_sales_tab = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement"
+        daily_sales_tab = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_1_cell_1_0_controltreeTextBoxElement")),
+            10, "영업일보 탭", raise_on_timeout=True
         )
         daily_sales_tab.click()
         print("[INFO] 영업일보 탭 클릭 완료.")
-        time.sleep(1)
 
         # 영업일보 분석 탭 클릭
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_2_cell_2_0_controltreeTextBoxElement"))
-        )
-        sales_analysis_tab = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_2_cell_2_0_controltreeTextBoxElement"
+        sales_analysis_tab = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divLeftMenu_divLeftMainList_grdLeft_body_gridrow_2_cell_2_0_controltreeTextBoxElement")),
+            10, "영업일보 분석 탭", raise_on_timeout=True
         )
         sales_analysis_tab.click()
         print("[INFO] 영업일보 분석 탭 클릭 완료.")
-        time.sleep(1)
 
         # ================================================
         # 9. 당일 버튼 → 조회 버튼
         # ================================================
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate3_btnNowDay"))
-        )
-        today_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate3_btnNowDay"
+        today_btn = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_divSalesDate3_btnNowDay")),
+            10, "당일 버튼", raise_on_timeout=True
         )
         today_btn.click()
         print("[INFO] 당일 버튼 클릭 완료.")
-        time.sleep(1)
 
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch"))
-        )
-        search_btn = driver.find_element(
-            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch"
+        search_btn = wait_until(
+            driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divMainNavi_divCommonBtn_btnCommSearch")),
+            10, "조회 버튼", raise_on_timeout=True
         )
-        search_btn.click()
-        print("[INFO] 조회 버튼 클릭 완료.")
-        time.sleep(2)
+        with network_idle(driver, label="영업일보 조회 요청"):
+            search_btn.click()
+            print("[INFO] 조회 버튼 클릭 완료.")
+        # 카드 매출 칸이 채워지면 조회 완료
+        wait_until(driver, lambda d: d.find_element(
+            By.CSS_SELECTOR, "#mainframe_childframe_form_divMain_divWork_grdPaymentSale_body_gridrow_2_cell_2_2"
+        ).text.strip(), 10, "영업일보 조회 결과")
 
         # ================================================
         # 10. 데이터 추출 및 스프레드시트 업데이트 ("청라" 시트)
@@ -670,10 +696,14 @@ def main():
     finally:
         # 브라우저를 자동으로 종료
         try:
-            driver.quit()
-            print("[INFO] 브라우저 종료 완료.")
+            if driver:
+                driver.quit()
+                print("[INFO] 브라우저 종료 완료.")
         except Exception as e:
             print(f"[ERROR] 브라우저 종료 중 예외 발생: {e}")
+        log_network_summary(log=print)
+        log_wait_summary("2-chengla-easy-pos-auto", log=print)
+        log_command_summary(log=print)
 
 if __name__ == "__main__":
     main()
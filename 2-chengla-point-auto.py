@@ -1,7 +1,6 @@
 import os
 import sys
 import re
-import time
 import datetime
 import logging
 import traceback
@@ -24,8 +23,18 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-# WebDriver Manager
-from webdriver_manager.chrome import ChromeDriverManager
+# chromedriver 고정 캐시 (오프라인)
+from driver_resolver import resolve_chromedriver
+
+# Chrome 워밍 풀 / 로그인 세션 저장소 / 요청 차단
+from chrome_pool import lease_driver
+from session_store import restore_or_login
+from request_blocking import block_requests
+# 조건 기반 대기
+from waits import wait_until, element_present, css, log_wait_summary
+
+# WebDriver 명령 수 계측
+from command_budget import instrument, log_command_summary
 
 # Google Sheets
 import gspread
@@ -71,13 +80,22 @@ def get_environment_variables():
 # 3. Chrome 드라이버 세팅
 ###############################################################################
 def get_chrome_driver(use_profile=False):
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    user_agent = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/110.0.5481.77 Safari/537.36"
     )
+
+    # 워밍 풀이 떠 있으면 탭 임대 (없으면 새 Chrome 실행)
+    driver = lease_driver(user_agent=user_agent, window_size=(1200, 700))
+    if driver:
+        hide_webdriver_flag(driver)
+        block_requests(driver, "point")
+        return driver
+
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"user-agent={user_agent}")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--disable-infobars")
     chrome_options.add_argument("--disable-gpu")
@@ -85,23 +103,31 @@ def get_chrome_driver(use_profile=False):
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1200,700")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(resolve_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
 
+    hide_webdriver_flag(driver)
+    block_requests(driver, "point")
+    logging.info("ChromeDriver 초기화 성공")
+    return driver
+
+def hide_webdriver_flag(driver):
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
         {
             "source": "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
         }
     )
-    logging.info("ChromeDriver 초기화 성공")
-    return driver
 
 ###############################################################################
 # 4. 로그인 및 팝업 닫기
 ###############################################################################
+POINT_STATS_URL = "https://xn--3j1b74x8mfjtk.com/visits/stats/549"
+# 로그인 후 통계 화면에만 있는 카드 목록 (session_store의 point ready_marker와 동일)
+POINT_READY_SELECTOR = "section > div.grid.grid-cols-2"
+
 def login_point(driver, point_id, point_pw):
-    driver.get("https://xn--3j1b74x8mfjtk.com/visits/stats/549")
+    driver.get(POINT_STATS_URL)
     logging.info("포인트 로그인 페이지 접속 완료")
 
     id_selector = "#mid"
@@ -118,7 +144,10 @@ def login_point(driver, point_id, point_pw):
         logging.info("로그인 버튼 클릭")
     except TimeoutException:
         logging.warning("로그인 페이지 로딩 Timeout")
-    time.sleep(5)
+        return False
+
+    # 통계 카드가 뜨면 로그인 완료 (고정 5초 대기 대체)
+    return bool(wait_until(driver, element_present(css(POINT_READY_SELECTOR)), 15, "포인트 로그인"))
 
 ###############################################################################
 # 5. 포인트 적립&사용 조회
@@ -268,9 +297,14 @@ def main():
 
     try:
         point_id, point_pw, service_account_json_b64 = get_environment_variables()
-        driver = get_chrome_driver(use_profile=False)
+        driver = instrument(get_chrome_driver(use_profile=False), "2-chengla-point-auto")
 
-        login_point(driver, point_id, point_pw)
+        # 저장된 세션이 살아 있으면 로그인 생략
+        restore_or_login(
+            driver, "chengla", "point",
+            lambda: login_point(driver, point_id, point_pw),
+            home_url=POINT_STATS_URL
+        )
 
         usage_value = get_today_usage(driver)
         visitor_count = get_today_saved_count(driver)
@@ -293,6 +327,8 @@ def main():
     finally:
         if 'driver' in locals():
             driver.quit()
+        log_wait_summary("2-chengla-point-auto")
+        log_command_summary()
 
 if __name__ == "__main__":
     main()
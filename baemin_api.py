@@ -0,0 +1,83 @@
+"""
+배민 셀프서비스 주문내역 API 응답 캡처 / 파서
+
+주문내역 화면은 목록을 그리기 위해 이미 주문 JSON을 받아 온다. 행을 하나씩 펼쳐
+메뉴를 읽는 대신, 그 응답을 성능 로그 + CDP Network.getResponseBody로 받아
+메뉴명 / 수량 / 금액 / 주문 상태를 바로 꺼낸다.
+
+    capture = OrderApiCapture(driver).start()    # 주문내역 화면 진입 전
+    ...                                          # 필터 적용 / 페이지 이동
+    orders = capture.take_new()                  # 새로 받은 주문들
+
+- 응답 필드 이름은 화면 버전에 따라 달라질 수 있어 후보 키 목록(FIELDS)으로 찾는다
+  (파서 / 캡처 본체는 order_api 공용)
+- BAEMIN_CAPTURE_DIR 환경변수가 있으면 받은 응답 원문을 저장 (오프라인 파서 확인용 픽스처)
+
+오프라인 확인 (저장해 둔 응답으로 파서만 실행):
+
+    python baemin_api.py parse captures/baemin-orders-*.json
+
+픽스처 테스트: python -m pytest tests (tests/fixtures/baemin-orders-*.json)
+"""
+import os
+import sys
+
+import order_api
+
+###############################################################################
+# 설정값
+###############################################################################
+ORDER_API_PATTERNS = ["*self-api.baemin.com/*order*", "*self.baemin.com/api/*order*"]
+CAPTURE_DIR = os.getenv("BAEMIN_CAPTURE_DIR")
+
+# 응답 필드 후보 (앞에서부터 먼저 찾은 키 사용)
+FIELDS = {
+    "id": "order_no",
+    "order_id": ("orderNumber", "orderNo", "orderId"),
+    "items": ("items", "orderItems", "menus", "menuItems", "orderMenus"),
+    "item_name": ("name", "menuName", "itemName", "productName"),
+    "item_qty": ("quantity", "count", "qty", "menuCount"),
+    "item_price": ("totalPrice", "price", "menuPrice", "amount"),
+    "status": ("status", "orderStatus", "statusName"),
+    "total": ("payAmount", "totalPayAmount", "paymentAmount", "orderPrice", "totalPrice"),
+    "canceled_markers": ("CANCEL", "취소"),
+}
+
+
+###############################################################################
+# 파서 (브라우저 없이 JSON만으로 동작)
+###############################################################################
+def parse_orders(payload):
+    """:return: [{order_no, status, total, items: [{name, qty, price}]}]"""
+    return order_api.parse_orders(payload, FIELDS)
+
+
+def is_canceled(order):
+    return order_api.is_canceled(order, FIELDS)
+
+
+def looks_complete(orders):
+    """모든 주문에 메뉴가 있고, 모든 메뉴에 이름/수량이 있음"""
+    return order_api.looks_complete(orders, FIELDS)
+
+
+###############################################################################
+# 캡처
+###############################################################################
+class OrderApiCapture(order_api.OrderApiCapture):
+    label = "배민 API"
+    file_prefix = "baemin-orders"
+    fields = FIELDS
+    patterns = ORDER_API_PATTERNS
+    save_dir = CAPTURE_DIR
+
+
+###############################################################################
+# 오프라인 확인
+###############################################################################
+def main():
+    return order_api.parse_cli("배민 주문내역 API 응답 파서", FIELDS)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+"""
+Chrome 워밍 풀 (warm pool)
+
+스크립트마다 Chrome을 새로 띄우고 driver.quit()으로 죽이는 대신,
+헤드리스 Chrome N개를 미리 띄워두고 각 작업이 깨끗한 탭을 임대해서 쓴다.
+
+- 데몬:   python chrome_pool.py start --size 3 --max-jobs 20
+- 상태:   python chrome_pool.py status
+- 종료:   python chrome_pool.py stop
+
+스크립트 쪽에서는 lease_driver()를 호출한다. 풀이 떠 있지 않으면 None을
+돌려주므로 기존의 새 Chrome 실행 경로로 그대로 진행하면 된다.
+임대한 드라이버의 quit()은 브라우저를 끄지 않고 탭을 정리한 뒤 반납한다.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import logging
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+from driver_resolver import find_chrome_binary, resolve_chromedriver
+
+###############################################################################
+# 설정값
+###############################################################################
+DEFAULT_POOL_DIR = os.getenv(
+    "CHROME_POOL_DIR", os.path.join(tempfile.gettempdir(), "mugung-chrome-pool")
+)
+DEFAULT_BASE_PORT = 9310      # 네이버 체커가 쓰는 9222와 겹치지 않게
+DEFAULT_SIZE = 2
+DEFAULT_MAX_JOBS = 20         # 브라우저 하나당 최대 작업 수 (초과 시 재시작)
+LEASE_TTL = 60 * 30           # 30분 넘게 반납 안 된 임대는 버려진 것으로 간주
+HEARTBEAT_INTERVAL = 5
+STALE_LOCK_SEC = 30
+
+
+###############################################################################
+# 레지스트리 (풀 상태 파일) + 파일 잠금
+###############################################################################
+class _RegistryLock:
+    """여러 프로세스가 registry.json을 동시에 고치지 않도록 하는 단순 파일 잠금"""
+
+    def __init__(self, pool_dir, timeout=10):
+        self.path = os.path.join(pool_dir, "registry.lock")
+        self.timeout = timeout
+
+    def __enter__(self):
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                # 잠금을 잡은 프로세스가 비정상 종료된 경우 대비
+                try:
+                    if time.time() - os.path.getmtime(self.path) > STALE_LOCK_SEC:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    pass
+                if time.time() > deadline:
+                    raise TimeoutError(f"풀 레지스트리 잠금 획득 실패: {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _registry_path(pool_dir):
+    return os.path.join(pool_dir, "registry.json")
+
+
+def _read_registry(pool_dir):
+    try:
+        with open(_registry_path(pool_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_registry(pool_dir, registry):
+    tmp_path = _registry_path(pool_dir) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(registry, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, _registry_path(pool_dir))
+
+
+def _devtools_alive(port, timeout=1.0):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+###############################################################################
+# 풀 데몬
+###############################################################################
+class ChromePool:
+    def __init__(self, size=DEFAULT_SIZE, max_jobs=DEFAULT_MAX_JOBS, base_port=DEFAULT_BASE_PORT,
+                 headless=True, pool_dir=DEFAULT_POOL_DIR):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.base_port = base_port
+        self.headless = headless
+        self.pool_dir = pool_dir
+        self.chrome_binary = find_chrome_binary()
+        self.processes = {}  # slot -> Popen
+
+    def _launch(self, slot, generation):
+        port = self.base_port + slot
+        user_data_dir = os.path.join(self.pool_dir, f"profile-{slot}-{generation}")
+        args = [
+            self.chrome_binary,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-infobars",
+            "--disable-blink-features=AutomationControlled",
+            # 백그라운드 탭도 타이머/렌더링을 늦추지 않게 (여러 탭 페이지 읽기용)
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--lang=ko-KR",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+
+        proc = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.processes[slot] = proc
+
+        # DevTools 포트가 열릴 때까지 대기
+        deadline = time.time() + 30
+        while time.time() < deadline and not _devtools_alive(port):
+            time.sleep(0.2)
+
+        logging.info(f"[풀] 브라우저 #{slot} 실행 (port={port}, pid={proc.pid}, 세대={generation})")
+        return {
+            "slot": slot,
+            "port": port,
+            "pid": proc.pid,
+            "user_data_dir": user_data_dir,
+            "generation": generation,
+            "state": "ready",
+            "jobs": 0,
+            "leased_by": None,
+            "leased_at": None,
+            "started_at": time.time(),
+        }
+
+    def _kill(self, entry):
+        proc = self.processes.pop(entry["slot"], None)
+        try:
+            if proc:
+                proc.terminate()
+                proc.wait(timeout=10)
+            else:
+                os.kill(entry["pid"], signal.SIGTERM)
+        except Exception as e:
+            logging.warning(f"[풀] 브라우저 #{entry['slot']} 종료 실패: {e}")
+        shutil.rmtree(entry["user_data_dir"], ignore_errors=True)
+
+    def _recycle(self, entry, reason):
+        logging.info(f"[풀] 브라우저 #{entry['slot']} 재시작 ({reason}, 작업 {entry['jobs']}회)")
+        self._kill(entry)
+        new_entry = self._launch(entry["slot"], entry["generation"] + 1)
+        new_entry["total_jobs"] = entry.get("total_jobs", 0)
+        new_entry["recycles"] = entry.get("recycles", 0) + 1
+        return new_entry
+
+    def start(self):
+        os.makedirs(self.pool_dir, exist_ok=True)
+        registry = _read_registry(self.pool_dir)
+        if registry and time.time() - registry.get("heartbeat", 0) < HEARTBEAT_INTERVAL * 3:
+            raise RuntimeError(f"이미 실행 중인 풀이 있습니다: {self.pool_dir}")
+
+        browsers = []
+        for slot in range(self.size):
+            entry = self._launch(slot, 0)
+            entry["total_jobs"] = 0
+            entry["recycles"] = 0
+            browsers.append(entry)
+
+        with _RegistryLock(self.pool_dir):
+            _write_registry(self.pool_dir, {
+                "daemon_pid": os.getpid(),
+                "max_jobs": self.max_jobs,
+                "headless": self.headless,
+                "heartbeat": time.time(),
+                "stopping": False,
+                "browsers": browsers,
+            })
+        logging.info(f"[풀] 워밍 완료: 브라우저 {self.size}개, 브라우저당 최대 {self.max_jobs}작업")
+
+    def run_forever(self):
+        try:
+            while True:
+                time.sleep(HEARTBEAT_INTERVAL)
+                if not self._tick():
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def _tick(self):
+        """
+        상태 점검 한 번: 죽은/과사용/방치된 브라우저를 재시작. 종료 요청 시 False
+
+        브라우저 실행(_launch, 최대 30초)과 종료(_kill, 최대 10초)는 STALE_LOCK_SEC보다
+        오래 걸릴 수 있어 잠금 밖에서 한다. 잠금 안에서는 재시작할 슬롯을 고르고
+        "recycling"으로 표시(임대 대상에서 빠짐)만 한 뒤, 끝나면 다시 잠가 새 항목을 기록한다.
+        """
+        snapshot = _read_registry(self.pool_dir)
+        if snapshot is None or snapshot.get("stopping"):
+            return False
+        # DevTools 응답 확인도 브라우저마다 최대 1초라 잠금 밖에서
+        dead = {e["slot"] for e in snapshot["browsers"] if not _devtools_alive(e["port"])}
+
+        to_recycle = []
+        with _RegistryLock(self.pool_dir):
+            registry = _read_registry(self.pool_dir)
+            if registry is None or registry.get("stopping"):
+                return False
+
+            now = time.time()
+            for entry in registry["browsers"]:
+                if entry["state"] == "recycling":
+                    continue
+                leased = entry["leased_by"] is not None
+                if leased and now - (entry["leased_at"] or now) > LEASE_TTL:
+                    reason = "임대 시간 초과"
+                elif not leased and entry["state"] == "broken":
+                    reason = "연결 실패 보고"
+                elif not leased and entry["jobs"] >= registry["max_jobs"]:
+                    reason = "작업 횟수 한도"
+                elif entry["slot"] in dead:
+                    reason = "응답 없음"
+                else:
+                    continue
+                to_recycle.append((dict(entry), reason))
+                entry["state"] = "recycling"
+                entry["leased_by"] = None
+                entry["leased_at"] = None
+
+            registry["heartbeat"] = now
+            _write_registry(self.pool_dir, registry)
+
+        # 슬롯마다 새 브라우저가 뜨는 대로 기록 (heartbeat도 같이 갱신)
+        for entry, reason in to_recycle:
+            new_entry = self._recycle(entry, reason)
+            with _RegistryLock(self.pool_dir):
+                registry = _read_registry(self.pool_dir)
+                if registry is None:
+                    return False
+                for idx, current in enumerate(registry["browsers"]):
+                    if current["slot"] == new_entry["slot"]:
+                        registry["browsers"][idx] = new_entry
+                registry["heartbeat"] = time.time()
+                _write_registry(self.pool_dir, registry)
+        return True
+
+    def shutdown(self):
+        # 종료(_kill)는 브라우저마다 최대 10초라 잠금 안에서는 목록만 꺼낸다
+        with _RegistryLock(self.pool_dir):
+            registry = _read_registry(self.pool_dir) or {"browsers": []}
+            registry["stopping"] = True
+            if os.path.exists(_registry_path(self.pool_dir)):
+                _write_registry(self.pool_dir, registry)
+        for entry in registry["browsers"]:
+            self._kill(entry)
+        with _RegistryLock(self.pool_dir):
+            try:
+                os.remove(_registry_path(self.pool_dir))
+            except OSError:
+                pass
+        logging.info("[풀] 모든 브라우저 종료")
+
+
+###############################################################################
+# 작업 쪽: 임대 / 반납
+###############################################################################
+def _release_slot(pool_dir, slot, broken=False):
+    with _RegistryLock(pool_dir):
+        registry = _read_registry(pool_dir)
+        if not registry:
+            return
+        for entry in registry["browsers"]:
+            if entry["slot"] == slot and entry["leased_by"] == os.getpid():
+                entry["leased_by"] = None
+                entry["leased_at"] = None
+                if broken:
+                    entry["state"] = "broken"
+        _write_registry(pool_dir, registry)
+
+
+class PooledChrome(webdriver.Chrome):
+    """풀에서 임대한 드라이버. quit()은 브라우저를 끄지 않고 탭 정리 후 반납한다."""
+
+    def __init__(self, pool_dir, slot, *args, **kwargs):
+        self._pool_dir = pool_dir
+        self._slot = slot
+        self._released = False
+        super().__init__(*args, **kwargs)
+
+    def _reset_tab(self):
+        origin = self.execute_script("return location.origin;")
+        if origin and origin.startswith("http"):
+            self.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        self.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.get("about:blank")
+
+    def quit(self):
+        if not self._released:
+            self._released = True
+            try:
+                self._reset_tab()
+            except WebDriverException as e:
+                logging.warning(f"[풀] 탭 정리 실패: {e}")
+            _release_slot(self._pool_dir, self._slot)
+            logging.info(f"[풀] 브라우저 #{self._slot} 반납")
+        super().quit()
+
+
+def _pick_slot(pool_dir):
+    """비어있는 브라우저 하나를 임대 표시하고 돌려준다. 풀이 없으면 False, 전부 사용 중이면 None"""
+    with _RegistryLock(pool_dir):
+        registry = _read_registry(pool_dir)
+        if not registry or registry.get("stopping"):
+            return False
+        if time.time() - registry.get("heartbeat", 0) > HEARTBEAT_INTERVAL * 3:
+            return False
+
+        free = [e for e in registry["browsers"] if e["leased_by"] is None and e["state"] == "ready"]
+        if not free:
+            return None
+
+        # 작업 횟수가 가장 적은 브라우저부터 사용 (재시작 시점을 분산)
+        entry = min(free, key=lambda e: e["jobs"])
+        entry["leased_by"] = os.getpid()
+        entry["leased_at"] = time.time()
+        entry["jobs"] += 1
+        entry["total_jobs"] = entry.get("total_jobs", 0) + 1
+        _write_registry(pool_dir, registry)
+        return dict(entry)
+
+
+def lease_driver(user_agent=None, window_size=None, page_load_strategy=None,
+                 wait_timeout=20, pool_dir=DEFAULT_POOL_DIR):
+    """
+    워밍 풀에서 브라우저를 임대해 깨끗한 탭이 붙은 드라이버를 돌려준다.
+    풀이 떠 있지 않거나 연결에 실패하면 None (호출 쪽에서 기존 방식으로 실행).
+    """
+    if not os.path.exists(_registry_path(pool_dir)):
+        return None
+
+    started = time.time()
+    while True:
+        try:
+            entry = _pick_slot(pool_dir)
+        except TimeoutError as e:
+            logging.warning(f"[풀] {e} → 새 Chrome으로 진행")
+            return None
+        if entry is False:
+            return None
+        if entry:
+            break
+        if time.time() - started > wait_timeout:
+            logging.warning("[풀] 모든 브라우저가 사용 중 → 새 Chrome으로 진행")
+            return None
+        time.sleep(0.5)
+    waited = time.time() - started
+
+    options = webdriver.ChromeOptions()
+    options.debugger_address = f"127.0.0.1:{entry['port']}"
+    # 네트워크 유휴 대기(network_idle)용 성능 로그
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+
+    attach_started = time.time()
+    try:
+        driver = PooledChrome(
+            pool_dir, entry["slot"],
+            service=Service(resolve_chromedriver()),
+            options=options
+        )
+        # 이전 작업의 탭은 닫고 새 탭 하나만 남긴다
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        fresh_handle = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh_handle)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+        if user_agent:
+            driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+        if window_size:
+            driver.set_window_size(*window_size)
+    except WebDriverException as e:
+        logging.warning(f"[풀] 브라우저 #{entry['slot']} 연결 실패 → 새 Chrome으로 진행: {e}")
+        _release_slot(pool_dir, entry["slot"], broken=True)
+        return None
+
+    logging.info(
+        f"[풀] 브라우저 #{entry['slot']} 임대 (세대 {entry['generation']}, 재사용 {entry['jobs']}회째, "
+        f"대기 {waited:.1f}s, 연결 {time.time() - attach_started:.2f}s)"
+    )
+    return driver
+
+
+###############################################################################
+# CLI
+###############################################################################
+def print_status(pool_dir):
+    registry = _read_registry(pool_dir)
+    if not registry:
+        print(f"실행 중인 풀이 없습니다: {pool_dir}")
+        return
+    age = time.time() - registry.get("heartbeat", 0)
+    print(f"데몬 pid={registry['daemon_pid']}, 최대 작업={registry['max_jobs']}, 마지막 점검 {age:.0f}초 전")
+    for e in registry["browsers"]:
+        state = f"임대중(pid={e['leased_by']})" if e["leased_by"] else e["state"]
+        print(
+            f"  #{e['slot']} port={e['port']} {state} | 현재 세대 작업 {e['jobs']}회, "
+            f"누적 {e.get('total_jobs', 0)}회, 재시작 {e.get('recycles', 0)}회"
+        )
+
+
+def request_stop(pool_dir):
+    with _RegistryLock(pool_dir):
+        registry = _read_registry(pool_dir)
+        if not registry:
+            print(f"실행 중인 풀이 없습니다: {pool_dir}")
+            return
+        registry["stopping"] = True
+        _write_registry(pool_dir, registry)
+    print("풀 종료 요청 완료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chrome 워밍 풀")
+    parser.add_argument("command", choices=["start", "status", "stop"])
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS)
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT)
+    parser.add_argument("--headed", action="store_true", help="화면 있는 Chrome으로 실행")
+    parser.add_argument("--pool-dir", default=DEFAULT_POOL_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    if args.command == "status":
+        print_status(args.pool_dir)
+    elif args.command == "stop":
+        request_stop(args.pool_dir)
+    else:
+        pool = ChromePool(
+            size=args.size,
+            max_jobs=args.max_jobs,
+            base_port=args.base_port,
+            headless=not args.headed,
+            pool_dir=args.pool_dir,
+        )
+        pool.start()
+        pool.run_forever()
+
+
+if __name__ == "__main__":
+    main()
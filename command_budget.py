@@ -0,0 +1,181 @@
+"""
+WebDriver 명령 수 계측 / 예산
+
+find_element, click, execute_script 같은 명령은 모두 chromedriver로 가는 HTTP 왕복이다.
+드라이버의 execute()를 감싸서 명령 종류별, 호출 위치(스크립트 파일:줄)별로
+횟수와 소요 시간을 모으고, 작업별 예산을 넘으면 경고한다.
+
+    driver = instrument(driver, "1-songdo-baemin-auto")
+    ...
+    log_command_summary()
+
+- 예산: instrument(budget=...) → WEBDRIVER_COMMAND_BUDGET 환경변수 →
+  COMMAND_STATS_FILE에 남은 같은 작업의 최근 실행 중앙값 × BUDGET_GROWTH 순으로 정한다
+- COMMAND_STATS_FILE 환경변수가 있으면 실행 요약을 JSON Lines로 추가 저장
+- 호출 위치는 selenium과 공용 헬퍼(waits 등)를 건너뛴 첫 스크립트 프레임 기준
+"""
+import os
+import sys
+import json
+import time
+import logging
+import statistics
+
+###############################################################################
+# 설정값
+###############################################################################
+COMMAND_STATS_FILE = os.getenv("COMMAND_STATS_FILE")
+BUDGET_ENV = os.getenv("WEBDRIVER_COMMAND_BUDGET")
+BUDGET_GROWTH = 1.5   # 최근 실행 중앙값보다 이만큼 늘면 경고
+BASELINE_RUNS = 10
+
+# 호출 위치로 치지 않는 모듈 (공용 헬퍼 안의 명령은 그 헬퍼를 부른 줄로 집계)
+LIBRARY_DIRS = ("selenium", "undetected_chromedriver")
+HELPER_MODULES = {
+    "command_budget.py", "waits.py", "network_idle.py", "selector_cache.py",
+    "popup_dismisser.py", "request_blocking.py", "session_store.py", "chrome_pool.py",
+}
+
+_stats = {
+    "job": None,
+    "budget": None,
+    "warned": False,
+    "commands": {},   # 명령 -> [소요 시간(초), ...]
+    "sites": {},      # 파일:줄 (함수) -> 횟수
+}
+
+
+def _call_site():
+    frame = sys._getframe(2)
+    while frame:
+        path = frame.f_code.co_filename
+        name = os.path.basename(path)
+        in_library = any(f"{os.sep}{d}{os.sep}" in path for d in LIBRARY_DIRS)
+        if not in_library and name not in HELPER_MODULES:
+            return f"{name}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "?"
+
+
+def _baseline_budget(job):
+    """이전 실행 기록(COMMAND_STATS_FILE)의 명령 수 중앙값 × BUDGET_GROWTH"""
+    if not COMMAND_STATS_FILE or not os.path.exists(COMMAND_STATS_FILE):
+        return None
+    totals = []
+    with open(COMMAND_STATS_FILE, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if row.get("job") == job:
+                totals.append(row["total"])
+    if not totals:
+        return None
+    return int(statistics.median(totals[-BASELINE_RUNS:]) * BUDGET_GROWTH)
+
+
+###############################################################################
+# 계측
+###############################################################################
+def instrument(driver, job, budget=None):
+    """
+    driver.execute()를 감싸 명령을 기록한다. 같은 드라이버에 두 번 적용해도 한 번만 감싼다.
+    :param budget: 명령 수 예산 (없으면 환경변수 → 이전 실행 기준)
+    :return: 같은 driver (체이닝용)
+    """
+    if getattr(driver, "_command_budget_wrapped", False):
+        return driver
+
+    if budget is None and BUDGET_ENV:
+        budget = int(BUDGET_ENV)
+    if budget is None:
+        budget = _baseline_budget(job)
+
+    _stats.update(job=job, budget=budget)
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return original_execute(driver_command, params)
+        finally:
+            _record(driver_command, time.perf_counter() - started, _call_site())
+
+    driver.execute = execute
+    driver._command_budget_wrapped = True
+    if budget:
+        logging.info(f"[명령] {job} WebDriver 명령 예산 {budget}회")
+    return driver
+
+
+def _record(command, seconds, site):
+    _stats["commands"].setdefault(command, []).append(seconds)
+    _stats["sites"][site] = _stats["sites"].get(site, 0) + 1
+
+    budget = _stats["budget"]
+    if budget and not _stats["warned"] and command_count() > budget:
+        _stats["warned"] = True
+        top = sorted(_stats["sites"].items(), key=lambda kv: -kv[1])[:3]
+        logging.warning(
+            f"[명령] {_stats['job']} WebDriver 명령이 예산 {budget}회를 넘음 "
+            f"(많은 위치: {', '.join(f'{s} {n}회' for s, n in top)})"
+        )
+
+
+def command_count():
+    return sum(len(v) for v in _stats["commands"].values())
+
+
+###############################################################################
+# 요약
+###############################################################################
+def command_stats():
+    commands = {
+        name: {
+            "count": len(v),
+            "total": round(sum(v), 3),
+            "median_ms": round(statistics.median(v) * 1000, 1),
+        }
+        for name, v in _stats["commands"].items()
+    }
+    total = command_count()
+    return {
+        "job": _stats["job"],
+        "total": total,
+        "seconds": round(sum(c["total"] for c in commands.values()), 3),
+        "budget": _stats["budget"],
+        "over_budget": bool(_stats["budget"]) and total > _stats["budget"],
+        "commands": commands,
+        "sites": dict(sorted(_stats["sites"].items(), key=lambda kv: -kv[1])),
+    }
+
+
+def log_command_summary(log=logging.info, top=10):
+    """명령 종류별 / 호출 위치별 횟수와 왕복 시간 출력 (print 로그를 쓰는 스크립트는 log=print)"""
+    stats = command_stats()
+    if not stats["total"]:
+        return stats
+
+    budget = f", 예산 {stats['budget']}회" if stats["budget"] else ""
+    log(f"[명령] WebDriver 명령 {stats['total']}회, 왕복 합계 {stats['seconds']:.1f}s{budget}")
+    for name, c in sorted(stats["commands"].items(), key=lambda kv: -kv[1]["count"])[:top]:
+        log(f"  {name}: {c['count']}회, 중앙값 {c['median_ms']:.0f}ms, 합계 {c['total']:.1f}s")
+    log(f"[명령] 호출 위치 상위 {top}")
+    for site, count in list(stats["sites"].items())[:top]:
+        log(f"  {site}: {count}회")
+    if stats["over_budget"]:
+        log(f"[명령] ⚠️ 예산 초과: {stats['total']}회 > {stats['budget']}회")
+
+    if COMMAND_STATS_FILE:
+        with open(COMMAND_STATS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "job": stats["job"],
+                "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "total": stats["total"],
+                "seconds": stats["seconds"],
+                "budget": stats["budget"],
+                "commands": {k: v["count"] for k, v in stats["commands"].items()},
+                "top_sites": dict(list(stats["sites"].items())[:top]),
+            }, ensure_ascii=False) + "\n")
+    return stats
@@ -0,0 +1,351 @@
+"""
+쿠팡이츠 매출관리 주문 조회 API 응답 캡처 / 파서
+
+매출관리 화면에서 '조회'를 누르면 화면은 주문 목록 JSON을 받아 와서 그린다.
+주문마다 펼치기를 누르고 CSS 체인으로 품목을 읽는 대신, 그 응답을 성능 로그 +
+CDP Network.getResponseBody로 받아 품목 / 수량 / 취소 여부 / 매출 합계를 꺼낸다.
+다음 페이지는 페이지 버튼을 누르지 않고, 캡처한 요청의 페이지 번호만 바꿔
+페이지 안에서 fetch로 다시 보낸다 (쿠키/헤더는 화면 요청과 동일).
+
+    capture = OrderSearchCapture(driver).start()   # '조회' 누르기 전
+    click_today_and_search(driver)
+    orders = capture.fetch_all_pages()             # 첫 페이지 응답 + 나머지 페이지 재요청
+
+- 응답 필드 / 페이지 파라미터 이름은 후보 키 목록(FIELDS, *_KEYS)으로 찾는다
+  (주문 파서 / 응답 읽기는 order_api 공용, 여기에는 매출 합계와 페이지 처리만)
+- COUPANG_CAPTURE_DIR 환경변수가 있으면 요청 + 응답 원문을 저장 (오프라인 파서 확인용 픽스처)
+
+오프라인 확인 (저장해 둔 응답으로 파서 / 다음 페이지 요청만 계산, 네트워크 없음):
+
+    python coupang_api.py parse captures/coupang-orders-*.json
+
+픽스처 테스트: python -m pytest tests (tests/fixtures/coupang-orders-*.json)
+"""
+import os
+import sys
+import json
+import logging
+import fnmatch
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from selenium.common.exceptions import WebDriverException
+
+import order_api
+from order_api import first_value, to_int
+from network_idle import add_event_listener, remove_event_listener, pump_events
+
+###############################################################################
+# 설정값
+###############################################################################
+ORDER_SEARCH_PATTERNS = ["*store.coupangeats.com/api/*order*", "*store.coupangeats.com/api/*sales*"]
+CAPTURE_DIR = os.getenv("COUPANG_CAPTURE_DIR")
+MAX_PAGES = 50
+
+# 응답 필드 후보 (앞에서부터 먼저 찾은 키 사용)
+FIELDS = {
+    "id": "order_id",
+    "order_id": ("orderId", "abbrOrderId", "uniqueOrderId", "orderNo"),
+    "items": ("items", "orderItems", "orderDetails", "menus", "dishes"),
+    "item_name": ("itemName", "dishName", "menuName", "name"),
+    "item_qty": ("quantity", "qty", "count"),
+    "item_price": ("salePrice", "totalPrice", "price", "unitSalePrice"),
+    "status": ("status", "orderStatus", "statusName"),
+    "total": ("salePrice", "totalPrice", "actuallyPaidPrice", "totalAmount", "orderPrice"),
+    "canceled_markers": ("CANCEL", "REJECT", "취소"),
+}
+REVENUE_KEYS = ("totalSalePrice", "totalSalesAmount", "totalSales", "salesAmount", "totalAmount")
+TOTAL_PAGES_KEYS = ("totalPages", "totalPage", "lastPage", "pageCount")
+# 전체 주문 건수. 그냥 "total"은 금액 합계에도 쓰이므로 여기 넣지 않고,
+# 페이지 정보(page/size 등)와 같은 객체에 있을 때만 건수로 본다 (_paging_total)
+TOTAL_COUNT_KEYS = ("totalElements", "totalCount", "totalOrderCount")
+
+# 요청 쪽 페이지 파라미터 후보 (쿼리스트링 또는 JSON 본문 최상위)
+PAGE_KEYS = ("pageNumber", "pageNo", "page", "pageIndex", "currentPage")
+PAGE_SIZE_KEYS = ("pageSize", "size", "limit", "rows")
+
+# 재요청에 다시 실을 수 없는 헤더 (브라우저가 직접 채움)
+SKIP_HEADERS = ("cookie", "host", "origin", "referer", "user-agent", "content-length", "connection")
+
+REPLAY_JS = """
+const [url, method, headers, body, done] = arguments;
+fetch(url, {method, headers, body, credentials: 'include'})
+    .then(r => r.text().then(text => done({status: r.status, text})))
+    .catch(e => done({error: String(e)}));
+"""
+
+
+###############################################################################
+# 파서 (브라우저 없이 JSON만으로 동작)
+###############################################################################
+def parse_orders(payload):
+    """:return: [{order_id, status, total, items: [{name, qty, price}]}]"""
+    return order_api.parse_orders(payload, FIELDS)
+
+
+def is_canceled(order):
+    return order_api.is_canceled(order, FIELDS)
+
+
+def looks_complete(orders):
+    """모든 주문에 품목이 있고, 모든 품목에 이름/수량이 있음"""
+    return order_api.looks_complete(orders, FIELDS)
+
+
+def _outside_orders(payload):
+    """주문 객체 바깥(요약/페이지 정보)의 dict를 위에서부터 차례로"""
+    queue = [payload]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            if order_api.parse_order(node, FIELDS):
+                continue
+            yield node
+            queue.extend(node.values())
+        elif isinstance(node, list):
+            queue.extend(node)
+
+
+def _find_outside_orders(payload, keys):
+    """주문 객체 바깥에서 처음 나오는 숫자 값"""
+    for node in _outside_orders(payload):
+        value = to_int(first_value(node, keys))
+        if value is not None:
+            return value
+    return None
+
+
+def _paging_total(payload):
+    """페이지 정보(page/size/totalPages 등)와 같은 객체에 있는 "total" (전체 건수)"""
+    paging_keys = PAGE_KEYS + PAGE_SIZE_KEYS + TOTAL_PAGES_KEYS
+    for node in _outside_orders(payload):
+        if "total" in node and any(key in node for key in paging_keys):
+            return to_int(node["total"])
+    return None
+
+
+def parse_revenue(payload):
+    """응답의 매출 합계 (없으면 None)"""
+    return _find_outside_orders(payload, REVENUE_KEYS)
+
+
+def page_count(payload, page_size=None):
+    """응답의 전체 페이지 수 (페이지 수 또는 전체 건수 ÷ 페이지 크기, 모르면 None)"""
+    pages = _find_outside_orders(payload, TOTAL_PAGES_KEYS)
+    if pages is not None:
+        return pages
+    total = _find_outside_orders(payload, TOTAL_COUNT_KEYS)
+    if total is None:
+        total = _paging_total(payload)
+    if total is not None and page_size:
+        return -(-total // page_size)
+    return None
+
+
+###############################################################################
+# 페이지 파라미터 (요청 재구성)
+###############################################################################
+def _json_body(request):
+    try:
+        body = json.loads(request.get("postData") or "")
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def find_paging(request):
+    """
+    캡처한 요청에서 페이지 번호 위치를 찾는다.
+    :return: {"where": "query"|"body", "key", "page", "size"} 또는 None
+    """
+    query = dict(parse_qsl(urlsplit(request["url"]).query))
+    body = _json_body(request)
+    for where, params in (("query", query), ("body", body)):
+        if not params:
+            continue
+        key = next((k for k in PAGE_KEYS if k in params), None)
+        if key is None:
+            continue
+        size_key = next((k for k in PAGE_SIZE_KEYS if k in params), None)
+        return {
+            "where": where,
+            "key": key,
+            "page": to_int(params[key]) or 0,
+            "size": to_int(params[size_key]) if size_key else None,
+        }
+    return None
+
+
+def request_for_page(request, paging, page):
+    """같은 요청에서 페이지 번호만 바꾼 {url, method, headers, postData}"""
+    url = request["url"]
+    body = request.get("postData")
+    if paging["where"] == "query":
+        parts = urlsplit(url)
+        query = [(k, str(page) if k == paging["key"] else v) for k, v in parse_qsl(parts.query)]
+        url = urlunsplit(parts._replace(query=urlencode(query)))
+    else:
+        data = _json_body(request)
+        data[paging["key"]] = page
+        body = json.dumps(data, ensure_ascii=False)
+
+    headers = {
+        k: v for k, v in (request.get("headers") or {}).items()
+        if k.lower() not in SKIP_HEADERS and not k.lower().startswith("sec-") and not k.startswith(":")
+    }
+    return {"url": url, "method": request.get("method", "GET"), "headers": headers, "postData": body}
+
+
+###############################################################################
+# 캡처
+###############################################################################
+class OrderSearchCapture:
+    def __init__(self, driver, patterns=ORDER_SEARCH_PATTERNS, save_dir=CAPTURE_DIR):
+        self.driver = driver
+        self.patterns = patterns
+        self.save_dir = save_dir
+        self.requests = {}    # requestId -> 요청 {url, method, headers, postData}
+        self.pending = set()  # JSON 응답을 받은 requestId
+        self.last = None      # 마지막 주문 조회 (요청, 응답 JSON)
+        self.responses = 0
+
+    def start(self):
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        except WebDriverException as e:
+            logging.warning(f"[쿠팡 API] Network.enable 실패: {e}")
+        add_event_listener(self._on_event)
+        return self
+
+    def stop(self):
+        remove_event_listener(self._on_event)
+
+    def _matches(self, url):
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.patterns)
+
+    def _on_event(self, driver, event):
+        method, params = event["method"], event["params"]
+        if method == "Network.requestWillBeSent":
+            request = params["request"]
+            if params.get("type") in ("XHR", "Fetch", None) and self._matches(request["url"]):
+                self.requests[params["requestId"]] = {
+                    "url": request["url"],
+                    "method": request.get("method", "GET"),
+                    "headers": request.get("headers", {}),
+                    "postData": request.get("postData"),
+                }
+        elif method == "Network.responseReceived":
+            if params["requestId"] in self.requests and "json" in params["response"].get("mimeType", ""):
+                self.pending.add(params["requestId"])
+        elif method == "Network.loadingFinished" and params["requestId"] in self.pending:
+            self.pending.discard(params["requestId"])
+            self._read_body(driver, params["requestId"])
+
+    def _read_body(self, driver, request_id):
+        request = self.requests.pop(request_id)
+        try:
+            payload = order_api.read_json_body(driver, request_id)
+        except (WebDriverException, ValueError) as e:
+            logging.warning(f"[쿠팡 API] 응답 본문 읽기 실패 {request['url']}: {e}")
+            return
+        self._save(request, payload)
+        if parse_orders(payload) or find_paging(request):
+            self.last = (request, payload)
+
+    def _save(self, request, payload):
+        self.responses += 1
+        if self.save_dir:
+            order_api.save_capture(self.save_dir, "coupang-orders", self.responses,
+                                   {"url": request["url"], "request": request, "payload": payload})
+
+    def replay(self, request):
+        """요청을 페이지 안 fetch로 다시 보내 응답 JSON을 돌려준다 (실패 시 None)"""
+        try:
+            result = self.driver.execute_async_script(
+                REPLAY_JS, request["url"], request["method"], request["headers"], request["postData"]
+            )
+        except WebDriverException as e:
+            logging.warning(f"[쿠팡 API] 재요청 실패 {request['url']}: {e}")
+            return None
+        if "error" in result or result["status"] != 200:
+            logging.warning(f"[쿠팡 API] 재요청 실패 {request['url']}: {result.get('error') or result['status']}")
+            return None
+        try:
+            payload = json.loads(result["text"])
+        except ValueError:
+            logging.warning(f"[쿠팡 API] 재요청 응답이 JSON이 아님 {request['url']}")
+            return None
+        self._save(request, payload)
+        return payload
+
+    def fetch_all_pages(self, max_pages=MAX_PAGES):
+        """
+        '조회' 응답(첫 페이지)을 파싱하고 나머지 페이지는 요청을 다시 보내 모은다.
+        :return: {"orders": [...], "revenue": 매출 합계 또는 None, "pages": 읽은 페이지 수}
+                 조회 응답을 못 받았거나 뒤 페이지를 못 받으면 None
+        """
+        pump_events(self.driver)
+        if self.last is None:
+            logging.warning("[쿠팡 API] 주문 조회 응답을 받지 못함")
+            return None
+
+        request, payload = self.last
+        orders = {o["order_id"]: o for o in parse_orders(payload)}
+        revenue = parse_revenue(payload)
+        paging = find_paging(request)
+        last_count = len(orders)
+        total_pages = page_count(payload, paging and paging["size"])
+        pages = 1
+
+        if paging is None:
+            if total_pages and total_pages > 1:
+                logging.warning(f"[쿠팡 API] 페이지 파라미터를 찾지 못함 (전체 {total_pages}페이지)")
+                return None
+            return {"orders": list(orders.values()), "revenue": revenue, "pages": pages}
+
+        page = paging["page"]
+        while pages < max_pages:
+            if total_pages is not None and pages >= total_pages:
+                break
+            if total_pages is None and (not last_count or (paging["size"] and last_count < paging["size"])):
+                break  # 전체 페이지 수를 모르면 덜 찬 페이지를 마지막으로 본다
+            page += 1
+            next_payload = self.replay(request_for_page(request, paging, page))
+            if next_payload is None:
+                return None
+            new = [o for o in parse_orders(next_payload) if o["order_id"] not in orders]
+            if not new:
+                break
+            for order in new:
+                orders[order["order_id"]] = order
+            pages += 1
+            last_count = len(new)
+            logging.info(f"[쿠팡 API] {page}페이지 재요청: 주문 {len(new)}건")
+
+        return {"orders": list(orders.values()), "revenue": revenue, "pages": pages}
+
+
+###############################################################################
+# 오프라인 확인
+###############################################################################
+def _print_paging(path, request, payload, orders):
+    print(f"[{os.path.basename(path)}] 주문 {len(orders)}건, 매출 합계 {parse_revenue(payload)}")
+    if not request:
+        return
+    paging = find_paging(request)
+    if not paging:
+        print("  페이지 파라미터 없음")
+        return
+    next_request = request_for_page(request, paging, paging["page"] + 1)
+    print(f"  페이지 {paging['key']}={paging['page']} ({paging['where']}), "
+          f"전체 {page_count(payload, paging['size'])}페이지")
+    print(f"  다음 페이지 요청: {next_request['method']} {next_request['url']}")
+    if next_request["postData"]:
+        print(f"    {next_request['postData']}")
+
+
+def main():
+    return order_api.parse_cli("쿠팡이츠 주문 조회 API 응답 파서", FIELDS, per_file=_print_paging)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
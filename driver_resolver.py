@@ -0,0 +1,206 @@
+"""
+chromedriver 오프라인 고정(pin) 캐시
+
+ChromeDriverManager().install()은 실행할 때마다 버전 조회(네트워크)를 하고
+경우에 따라 다운로드까지 한다. 여기서는 설치된 Chrome의 메이저 버전을
+로컬에서만 확인하고, 그 버전용 chromedriver를 체크섬과 함께 디스크에 고정해 둔다.
+
+- Chrome 메이저 버전이 같고 체크섬이 맞으면 네트워크 없이 바로 경로 반환
+- Chrome이 업그레이드된 경우(또는 파일 손상)에만 ChromeDriverManager로 갱신
+
+    python driver_resolver.py          # 현재 고정 상태 + 경로 확인 시간 출력
+    python driver_resolver.py --refresh
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import subprocess
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+###############################################################################
+# 설정값
+###############################################################################
+CACHE_DIR = os.getenv(
+    "CHROMEDRIVER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "mugung-chromedriver")
+)
+PIN_FILE = "pin.json"
+
+CHROME_CANDIDATES = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+CHROME_COMMANDS = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+VERSION_RE = re.compile(r"(\d+)\.\d+\.\d+\.\d+")
+
+
+###############################################################################
+# 설치된 Chrome 찾기 / 버전 확인 (네트워크 없음)
+###############################################################################
+def find_chrome_binary():
+    """설치된 Chrome 실행 파일 경로를 찾는다. (CHROME_BINARY 환경변수 우선)"""
+    env_path = os.getenv("CHROME_BINARY")
+    if env_path and os.path.exists(env_path):
+        return env_path
+    for path in CHROME_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    for cmd in CHROME_COMMANDS:
+        found = shutil.which(cmd)
+        if found:
+            return found
+    raise RuntimeError("Chrome 실행 파일을 찾지 못했습니다. CHROME_BINARY 환경변수를 설정하세요.")
+
+
+def _windows_chrome_version(chrome_binary):
+    # 1) 레지스트리 (사용자 설치 / 시스템 설치)
+    try:
+        import winreg
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+    except ImportError:
+        pass
+
+    # 2) chrome.exe 옆의 버전 폴더 (예: Application\120.0.6099.109)
+    app_dir = os.path.dirname(chrome_binary)
+    versions = [d for d in os.listdir(app_dir) if VERSION_RE.fullmatch(d)]
+    if versions:
+        return max(versions, key=lambda v: [int(p) for p in v.split(".")])
+    return None
+
+
+def get_chrome_version(chrome_binary=None):
+    """설치된 Chrome 전체 버전 문자열 (예: '120.0.6099.109')"""
+    chrome_binary = chrome_binary or find_chrome_binary()
+
+    if sys.platform.startswith("win"):
+        version = _windows_chrome_version(chrome_binary)
+    else:
+        out = subprocess.run(
+            [chrome_binary, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+        m = VERSION_RE.search(out)
+        version = m.group(0) if m else None
+
+    if not version:
+        raise RuntimeError(f"Chrome 버전을 확인하지 못했습니다: {chrome_binary}")
+    return version
+
+
+###############################################################################
+# 고정(pin) 캐시
+###############################################################################
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_pin(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, PIN_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_pin(cache_dir, pin):
+    tmp_path = os.path.join(cache_dir, PIN_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pin, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, PIN_FILE))
+
+
+def _refresh_pin(cache_dir, chrome_version):
+    """ChromeDriverManager로 받은 드라이버를 캐시 폴더에 복사하고 고정"""
+    started = time.time()
+    downloaded = ChromeDriverManager().install()
+
+    major = chrome_version.split(".")[0]
+    suffix = ".exe" if downloaded.lower().endswith(".exe") else ""
+    pinned_path = os.path.join(cache_dir, f"chromedriver-{major}{suffix}")
+    shutil.copy2(downloaded, pinned_path)
+
+    pin = {
+        "chrome_major": major,
+        "chrome_version": chrome_version,
+        "driver_path": pinned_path,
+        "sha256": _sha256(pinned_path),
+        "pinned_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "online_seconds": round(time.time() - started, 3),
+    }
+    _write_pin(cache_dir, pin)
+    return pin
+
+
+def resolve_chromedriver(cache_dir=CACHE_DIR, force_refresh=False):
+    """
+    설치된 Chrome 메이저 버전에 맞는 chromedriver 경로를 돌려준다.
+    고정된 드라이버가 유효하면 네트워크 없이 반환, 아니면 한 번 갱신 후 고정.
+    """
+    started = time.time()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    chrome_version = get_chrome_version()
+    major = chrome_version.split(".")[0]
+    pin = _read_pin(cache_dir)
+
+    reason = None
+    if force_refresh:
+        reason = "강제 갱신"
+    elif not pin:
+        reason = "고정된 드라이버 없음"
+    elif pin["chrome_major"] != major:
+        reason = f"Chrome 업그레이드 ({pin['chrome_major']} → {major})"
+    elif not os.path.exists(pin["driver_path"]):
+        reason = "드라이버 파일 없음"
+    elif _sha256(pin["driver_path"]) != pin["sha256"]:
+        reason = "체크섬 불일치"
+
+    if reason is None:
+        elapsed = time.time() - started
+        logging.info(
+            f"[드라이버] 고정 chromedriver 사용 (Chrome {major}) {elapsed:.3f}s "
+            f"| 마지막 온라인 조회 {pin.get('online_seconds', 0):.2f}s 대비 절약"
+        )
+        return pin["driver_path"]
+
+    logging.info(f"[드라이버] chromedriver 갱신 필요: {reason}")
+    pin = _refresh_pin(cache_dir, chrome_version)
+    logging.info(
+        f"[드라이버] chromedriver 고정 완료 (Chrome {major}) {time.time() - started:.3f}s "
+        f"→ {pin['driver_path']}"
+    )
+    return pin["driver_path"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chromedriver 오프라인 고정 캐시")
+    parser.add_argument("--refresh", action="store_true", help="Chrome 버전과 무관하게 다시 받기")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    path = resolve_chromedriver(args.cache_dir, force_refresh=args.refresh)
+    print(json.dumps(_read_pin(args.cache_dir), ensure_ascii=False, indent=2))
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
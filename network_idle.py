@@ -0,0 +1,216 @@
+"""
+네트워크 유휴 대기 (CDP Network 이벤트 기반)
+
+조회 버튼이나 fnSearch()처럼 XHR을 일으키는 동작을 감싸고, 해당 요청들이
+전부 끝날 때까지 (진행 중인 요청 0개 + quiet_ms 동안 새 요청 없음) 기다린다.
+이벤트는 Chrome 성능 로그(goog:loggingPrefs performance)에서 읽으므로
+드라이버 생성 시 enable_network_log(options)가 필요하다.
+
+    with network_idle(driver, "*/api/*", label="조회"):
+        search_button.click()
+
+요청별 소요 시간을 모아 두었다가 log_network_summary()로 느린 백엔드 호출을 보여준다.
+성능 로그는 읽으면 비워지므로, 응답 본문 캡처처럼 같은 이벤트가 필요한 곳은
+add_event_listener()로 등록해 두면 누가 로그를 읽든 이벤트를 함께 받는다.
+"""
+import json
+import time
+import logging
+import fnmatch
+import statistics
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from waits import record_wait
+
+###############################################################################
+# 설정값
+###############################################################################
+TRACKED_TYPES = ("XHR", "Fetch")
+SLOW_REQUEST_SEC = 1.0
+POLL_INTERVAL = 0.1
+
+# 끝난 요청 기록: {label, url, method, status, seconds, bytes}
+_requests = []
+_log_unavailable_warned = False
+_listeners = []
+
+
+def enable_network_log(options):
+    """ChromeOptions에 성능 로그(네트워크 이벤트) 수집을 켠다."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def _read_events(driver):
+    """쌓인 성능 로그에서 Network 이벤트만 꺼낸다. 로그가 꺼져 있으면 None"""
+    global _log_unavailable_warned
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException as e:
+        if not _log_unavailable_warned:
+            logging.warning(f"[네트워크] 성능 로그를 읽을 수 없어 네트워크 대기를 건너뜀: {e}")
+            _log_unavailable_warned = True
+        return None
+
+    events = []
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"].startswith("Network."):
+            events.append(message)
+
+    for listener in list(_listeners):
+        for event in events:
+            listener(driver, event)
+    return events
+
+
+def add_event_listener(listener):
+    """listener(driver, event)가 성능 로그에서 읽힌 모든 Network 이벤트를 받는다."""
+    _listeners.append(listener)
+
+
+def remove_event_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def pump_events(driver):
+    """기다리지 않고 지금까지 쌓인 이벤트를 리스너에게 넘긴다. 로그를 못 읽으면 False"""
+    return _read_events(driver) is not None
+
+
+###############################################################################
+# 대기
+###############################################################################
+class network_idle:
+    """
+    with 블록 안의 동작이 일으킨 요청(url_pattern, XHR/Fetch)이 모두 끝날 때까지 대기.
+
+    :param url_pattern: fnmatch 패턴 (기본 "*" = 모든 XHR/Fetch)
+    :param timeout: 전체 대기 한도 (초)
+    :param quiet_ms: 진행 중 요청이 0개가 된 뒤 연쇄 요청을 기다리는 시간
+    :param start_timeout: 이 시간 안에 요청이 하나도 없으면 기다리지 않고 종료
+    """
+
+    def __init__(self, driver, url_pattern="*", label="네트워크", timeout=15, quiet_ms=300,
+                 start_timeout=3, resource_types=TRACKED_TYPES):
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self.label = label
+        self.timeout = timeout
+        self.quiet_ms = quiet_ms
+        self.start_timeout = start_timeout
+        self.resource_types = resource_types
+        self.inflight = {}   # requestId -> {url, method, started}
+        self.finished = []   # 이번 대기에서 끝난 요청
+        self.idle = False
+
+    def __enter__(self):
+        # 이전 동작의 이벤트는 버린다
+        _read_events(self.driver)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.wait()
+        return False
+
+    def _matches(self, params):
+        if self.resource_types and params.get("type") not in self.resource_types:
+            return False
+        return fnmatch.fnmatch(params["request"]["url"], self.url_pattern)
+
+    def _apply(self, event):
+        method, params = event["method"], event["params"]
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            if self._matches(params):
+                self.inflight[request_id] = {
+                    "url": params["request"]["url"],
+                    "method": params["request"]["method"],
+                    "started": params["timestamp"],
+                    "status": None,
+                }
+        elif request_id in self.inflight:
+            if method == "Network.responseReceived":
+                self.inflight[request_id]["status"] = params["response"]["status"]
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                request = self.inflight.pop(request_id)
+                request["seconds"] = round(params["timestamp"] - request.pop("started"), 3)
+                request["bytes"] = params.get("encodedDataLength", 0)
+                if method == "Network.loadingFailed":
+                    request["status"] = params.get("errorText", "failed")
+                request["label"] = self.label
+                self.finished.append(request)
+                _requests.append(request)
+                if request["seconds"] >= SLOW_REQUEST_SEC:
+                    logging.info(
+                        f"[네트워크] 느린 요청 {request['seconds']:.2f}s {request['method']} "
+                        f"{request['url']} ({request['status']})"
+                    )
+
+    def wait(self):
+        started = time.time()
+        deadline = started + self.timeout
+        quiet_since = None
+
+        while time.time() < deadline:
+            events = _read_events(self.driver)
+            if events is None:
+                return False
+            for event in events:
+                self._apply(event)
+
+            seen_any = bool(self.inflight or self.finished)
+            if not seen_any:
+                if time.time() - started > self.start_timeout:
+                    break  # 요청이 발생하지 않음
+            elif not self.inflight:
+                if quiet_since is None:
+                    quiet_since = time.time()
+                elif (time.time() - quiet_since) * 1000 >= self.quiet_ms:
+                    self.idle = True
+                    break
+            else:
+                quiet_since = None
+            time.sleep(POLL_INTERVAL)
+
+        elapsed = time.time() - started
+        record_wait(self.label, elapsed, self.idle)
+        if self.idle:
+            slowest = max(r["seconds"] for r in self.finished)
+            logging.info(
+                f"[네트워크] {self.label} 완료 {elapsed:.2f}s (요청 {len(self.finished)}개, 최장 {slowest:.2f}s)"
+            )
+        elif self.inflight:
+            pending = ", ".join(r["url"] for r in self.inflight.values())
+            logging.warning(f"[네트워크] {self.label} 시간 초과 ({self.timeout}s), 미완료: {pending}")
+        else:
+            logging.info(f"[네트워크] {self.label} 요청 없음 ({elapsed:.2f}s)")
+        return self.idle
+
+
+###############################################################################
+# 백엔드 호출 요약 (프로파일러)
+###############################################################################
+def log_network_summary(log=logging.info, top=10):
+    """경로(쿼리 제외)별 요청 수 / 중앙값 / 최대 소요 시간을 느린 순으로 출력"""
+    if not _requests:
+        return {}
+
+    grouped = {}
+    for r in _requests:
+        parts = urlsplit(r["url"])
+        grouped.setdefault(f"{r['method']} {parts.netloc}{parts.path}", []).append(r["seconds"])
+
+    summary = {
+        key: {"count": len(v), "median": round(statistics.median(v), 3), "max": round(max(v), 3)}
+        for key, v in grouped.items()
+    }
+    log(f"[네트워크] 요청 {len(_requests)}개, 경로 {len(summary)}종 (느린 순 상위 {top})")
+    for key, s in sorted(summary.items(), key=lambda kv: -kv[1]["max"])[:top]:
+        log(f"  {key}: {s['count']}회, 중앙값 {s['median']:.2f}s, 최대 {s['max']:.2f}s")
+    return summary
@@ -0,0 +1,283 @@
+"""
+주문 조회 API 응답 공용 파서 / 캡처 (배민 · 쿠팡이츠 · 요기요)
+
+사장님 사이트의 주문 목록 화면은 모두 주문 JSON을 받아 와서 그린다. 플랫폼마다
+응답 필드 이름만 다르므로, 필드 후보 키 목록(fields)만 플랫폼 모듈에 두고
+'주문 찾기 → 품목 읽기 → 완결성 확인 → 픽스처 확인 CLI'는 여기서 같이 쓴다.
+
+    FIELDS = {
+        "id": "order_no",                  # 주문 dict에서 주문 번호를 담을 키
+        "order_id": ("orderNumber", ...),  # 응답 필드 후보 (앞에서부터 먼저 찾은 키 사용)
+        "items": (...), "item_name": (...), "item_qty": (...), "item_price": (...),
+        "status": (...), "total": (...),
+        "canceled_markers": ("CANCEL", "취소"),
+        # 선택: "extra": {"date": (키 후보, 변환 함수)}, "skip_items": (품목명 표식, ...),
+        #       "required": ("date", "total")  ← looks_complete에서 주문마다 있어야 하는 값
+    }
+    orders = parse_orders(payload, FIELDS)
+
+- 수량 키를 못 찾은 품목은 qty=None으로 남긴다 (1로 채우지 않음). looks_complete가
+  False가 되어 호출 쪽이 화면(DOM) 읽기로 대체한다.
+"""
+import os
+import json
+import time
+import base64
+import logging
+import fnmatch
+import argparse
+
+from selenium.common.exceptions import WebDriverException
+
+from network_idle import add_event_listener, remove_event_listener, pump_events
+
+
+###############################################################################
+# 파서 (브라우저 없이 JSON만으로 동작)
+###############################################################################
+def first_value(d, keys):
+    """keys 중 값이 있는 첫 키의 값 (없으면 None)"""
+    for key in keys:
+        if key in d and d[key] not in (None, ""):
+            return d[key]
+    return None
+
+
+def to_int(value):
+    """숫자 / '31,000원' 같은 문자열 → int (모르면 None)"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def parse_item(raw, fields):
+    if not isinstance(raw, dict):
+        return None
+    name = first_value(raw, fields["item_name"])
+    if not isinstance(name, str) or any(marker in name for marker in fields.get("skip_items", ())):
+        return None
+    return {
+        "name": name.strip(),
+        "qty": to_int(first_value(raw, fields["item_qty"])),
+        "price": to_int(first_value(raw, fields["item_price"])),
+    }
+
+
+def parse_order(raw, fields):
+    """주문 번호 + 품목 목록이 있는 dict면 주문, 아니면 None"""
+    order_id = first_value(raw, fields["order_id"])
+    items = first_value(raw, fields["items"])
+    if order_id is None or not isinstance(items, list):
+        return None
+    status = first_value(raw, fields["status"])
+    order = {
+        fields["id"]: str(order_id),
+        "status": status if isinstance(status, str) else None,
+        "total": to_int(first_value(raw, fields["total"])),
+    }
+    for name, (keys, convert) in fields.get("extra", {}).items():
+        order[name] = convert(first_value(raw, keys))
+    order["items"] = [item for item in (parse_item(i, fields) for i in items) if item]
+    return order
+
+
+def parse_orders(payload, fields):
+    """
+    응답 JSON 어디에 있든 '주문 번호 + 품목 목록'을 가진 객체를 찾아 주문으로 만든다.
+    :return: [{<fields["id"]>, status, total, (extra...), items: [{name, qty, price}]}]
+    """
+    orders = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            order = parse_order(node, fields)
+            if order:
+                orders.append(order)
+                return
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(payload)
+    return orders
+
+
+def is_canceled(order, fields):
+    status = (order.get("status") or "").upper()
+    return any(marker in status for marker in fields["canceled_markers"])
+
+
+def looks_complete(orders, fields):
+    """
+    파서가 필드를 제대로 찾았는지: 모든 주문에 품목이 있고, 모든 품목에 이름/수량이 있으며,
+    fields["required"]의 값(주문 일시, 금액 등)도 주문마다 있음
+    """
+    required = fields.get("required", ())
+    return bool(orders) and all(
+        order["items"]
+        and all(item["name"] and (item["qty"] or 0) > 0 for item in order["items"])
+        and all(order.get(name) is not None for name in required)
+        for order in orders
+    )
+
+
+###############################################################################
+# 캡처
+###############################################################################
+def read_json_body(driver, request_id):
+    """CDP Network.getResponseBody → JSON (WebDriverException / ValueError는 호출 쪽에서 처리)"""
+    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    text = body["body"]
+    if body.get("base64Encoded"):
+        text = base64.b64decode(text).decode("utf-8")
+    return json.loads(text)
+
+
+def save_capture(save_dir, prefix, seq, record):
+    """응답 원문을 {prefix}-{시각}-{seq}.json으로 저장 (오프라인 파서 확인용 픽스처)"""
+    os.makedirs(save_dir, exist_ok=True)
+    path = os.path.join(save_dir, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{seq}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+
+
+class OrderApiCapture:
+    """
+    주소가 patterns에 맞는 XHR/Fetch JSON 응답을 받아 주문으로 파싱해 둔다.
+    플랫폼 모듈에서 label / file_prefix / fields / patterns를 정해 상속한다.
+    """
+    label = "API"
+    file_prefix = "orders"
+    fields = None
+    patterns = ()
+    save_dir = None
+
+    def __init__(self, driver, patterns=None, save_dir=None):
+        self.driver = driver
+        if patterns is not None:
+            self.patterns = patterns
+        if save_dir is not None:
+            self.save_dir = save_dir
+        self.pending = {}     # requestId -> url
+        self.orders = {}      # 주문 번호 -> order (나중 응답이 우선)
+        self.new_orders = []
+        self.responses = 0
+
+    def start(self):
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        except WebDriverException as e:
+            logging.warning(f"[{self.label}] Network.enable 실패: {e}")
+        add_event_listener(self._on_event)
+        return self
+
+    def stop(self):
+        remove_event_listener(self._on_event)
+
+    def clear(self):
+        """지금까지 받은 응답은 버린다 (필터 적용 전 기본 목록, 다른 매장 목록 등)"""
+        pump_events(self.driver)
+        self.pending.clear()
+        self.orders.clear()
+        self.new_orders = []
+
+    def take_new(self):
+        """마지막 호출 이후 새로 받은 주문"""
+        pump_events(self.driver)
+        new, self.new_orders = self.new_orders, []
+        return new
+
+    def all_orders(self):
+        pump_events(self.driver)
+        return list(self.orders.values())
+
+    def _matches(self, url):
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.patterns)
+
+    def _on_event(self, driver, event):
+        method, params = event["method"], event["params"]
+        if method == "Network.responseReceived":
+            response = params["response"]
+            if (params.get("type") in ("XHR", "Fetch") and "json" in response.get("mimeType", "")
+                    and self._matches(response["url"])):
+                self.pending[params["requestId"]] = response["url"]
+        elif method == "Network.loadingFinished" and params["requestId"] in self.pending:
+            url = self.pending.pop(params["requestId"])
+            self._read_body(driver, params["requestId"], url)
+
+    def _read_body(self, driver, request_id, url):
+        try:
+            payload = read_json_body(driver, request_id)
+        except (WebDriverException, ValueError) as e:
+            logging.warning(f"[{self.label}] 응답 본문 읽기 실패 {url}: {e}")
+            return
+
+        self.responses += 1
+        if self.save_dir:
+            save_capture(self.save_dir, self.file_prefix, self.responses, {"url": url, "payload": payload})
+
+        orders = parse_orders(payload, self.fields)
+        for order in orders:
+            self.orders[order[self.fields["id"]]] = order
+        self.new_orders.extend(orders)
+        if orders:
+            logging.info(f"[{self.label}] 주문 {len(orders)}건 수신 ({url.split('?')[0]})")
+
+
+###############################################################################
+# 오프라인 확인
+###############################################################################
+def load_fixture(path):
+    """
+    캡처로 저장한 파일({"url", ["request",] "payload"}) 또는 응답 원문 JSON
+    :return: (요청 또는 None, 응답 JSON)
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "payload" in data and "url" in data:
+        return data.get("request"), data["payload"]
+    return None, data
+
+
+def parse_cli(description, fields, per_file=None):
+    """
+    `python <플랫폼>_api.py parse 파일...`: 저장해 둔 응답을 파싱해 주문/품목 합계를 출력한다.
+    per_file(path, request, payload, orders)가 있으면 파일마다 추가 정보를 출력한다.
+    :return: 종료 코드 (주문을 하나도 못 찾으면 1)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    sub = parser.add_subparsers(dest="command", required=True)
+    parse = sub.add_parser("parse", help="저장해 둔 응답 JSON을 파싱해 주문/품목 합계 출력")
+    parse.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    orders = {}
+    for path in args.files:
+        request, payload = load_fixture(path)
+        parsed = parse_orders(payload, fields)
+        if per_file:
+            per_file(path, request, payload, parsed)
+        for order in parsed:
+            orders[order[fields["id"]]] = order
+
+    item_totals = {}
+    for order in orders.values():
+        canceled = is_canceled(order, fields)
+        extra = "".join(f" {order[name]}" for name in fields.get("extra", {}))
+        print(f"{order[fields['id']]}{extra} {order['status']} 합계 {order['total']}"
+              + (" (취소)" if canceled else ""))
+        for item in order["items"]:
+            print(f"  {item['name']} x{item['qty']} ({item['price']})")
+            if not canceled:
+                item_totals[item["name"]] = item_totals.get(item["name"], 0) + (item["qty"] or 0)
+
+    ok = looks_complete(list(orders.values()), fields)
+    print(f"\n주문 {len(orders)}건, 파서 필드 확인: {'OK' if ok else '실패'}")
+    for name, qty in sorted(item_totals.items(), key=lambda kv: -kv[1]):
+        print(f"  {name}: {qty}")
+    return 0 if orders else 1
@@ -0,0 +1,256 @@
+"""
+페이지 안 팝업 자동 닫기 (MutationObserver)
+
+공지/온보딩 팝업은 뜰 수도 있고 안 뜰 수도 있어서, 파이썬에서 팝업마다
+WebDriverWait(10초)로 기다리면 팝업이 없는 날에 그 시간을 그대로 버린다.
+여기서는 드라이버 생성 직후 플랫폼별 닫기 스크립트를 한 번 설치한다.
+스크립트가 페이지 안에서 DOM 변경을 지켜보다가 알려진 닫기 버튼은 누르고
+배경(backdrop)은 숨긴다. 파이썬은 팝업을 기다리지 않는다.
+
+    install_popup_dismisser(driver, "coupang")      # 이후 모든 페이지/프레임에 적용
+    with popup_dismisser_paused(driver):            # 일부러 여는 팝업(주문 상세 등)을 읽을 때
+        ...
+    button = race_target(driver, "coupang", MENU)   # 팝업과 대상 버튼 중 먼저 뜨는 쪽에 반응
+    log_dismissed_popups(driver)
+
+- 스크립트는 CDP Page.addScriptToEvaluateOnNewDocument로 등록되므로 이동/새로고침 후에도 유지
+- CDP를 쓸 수 없으면 현재 문서에만 설치하고 경고를 남긴다
+"""
+import json
+import logging
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from waits import wait_until
+
+###############################################################################
+# 플랫폼별 팝업 셀렉터
+#   close: 보이면 클릭할 닫기 버튼
+#   hide : 보이면 display:none 처리할 배경 (사이트 스크립트가 참조할 수 있어 삭제하지 않음)
+###############################################################################
+DISMISS_PROFILES = {
+    "coupang": {
+        "close": [
+            "#merchant-onboarding-body > div.dialog-modal-wrapper.ezi9xs118.css-1g106yu.e1gf2dph0 > div > div > div > div.css-rucxuz.ezi9xs112 > div",
+            "#merchant-onboarding-body > div.dialog-modal-wrapper.e462wnt15.css-1252kk2.e1gf2dph0 > div > div > div > div > div.css-2bi7a5.e462wnt4 > div",
+            "#merchant-onboarding-body > div.dialog-modal-wrapper.css-1pi72m7.e1gf2dph0 > div > div > div > button",
+            "#merchant-onboarding-body > div.dialog-modal-wrapper.css-g20w7n.e1gf2dph0 > div > div > div > button",
+        ],
+        "hide": [],
+    },
+    "okpos": {
+        "close": ["#divPopupCloseButton0 > button", "#divPopupCloseButton1 > button"],
+        "hide": ["[id^='divPopupBackground']"],
+    },
+    "yogiyo": {
+        # 주문 상세도 같은 FullScreenModal이므로 상세를 읽는 동안은 popup_dismisser_paused 사용
+        "close": ["#portal-root > div > div > div.FullScreenModal__Header-sc-7lyzl-1.eQqjUi > svg"],
+        "hide": [],
+    },
+    "baemin": {
+        "close": [
+            "div.OverlayHeader_b_r4ax_5xyph31.c_qx9u_13c33de0.c_qx9u_13ysz3p2.c_qx9u_13ysz3p0 div:nth-child(1) > button",
+            "div.Dialog_b_c9kn_3pnjmu3",  # 공지 다이얼로그 배경 (클릭하면 닫힘)
+        ],
+        "hide": [],
+    },
+}
+
+# __PROFILE__ 자리에 플랫폼 셀렉터(JSON)가 들어간다.
+# 같은 요소는 한 번만 누르고, DOM 변경이 몰려도 다음 틱에 한 번만 훑는다.
+DISMISSER_JS = """
+(() => {
+    const profile = __PROFILE__;
+    if (window.__popupDismisser) { window.__popupDismisser.profile = profile; return; }
+
+    const state = {profile, paused: false, dismissed: [], scheduled: false};
+    window.__popupDismisser = state;
+
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const click = el => {
+        if (typeof el.click === 'function') el.click();
+        else el.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true}));  // svg 등
+    };
+    const sweep = () => {
+        state.scheduled = false;
+        if (state.paused) return;
+        for (const selector of state.profile.close) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (el.__popupDismissed || !visible(el)) continue;
+                el.__popupDismissed = true;
+                try { click(el); } catch (e) { continue; }
+                state.dismissed.push({action: 'click', selector, at: Date.now()});
+            }
+        }
+        for (const selector of state.profile.hide) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (!visible(el)) continue;
+                el.style.setProperty('display', 'none', 'important');
+                state.dismissed.push({action: 'hide', selector, at: Date.now()});
+            }
+        }
+    };
+    state.sweep = sweep;
+
+    const schedule = () => {
+        if (state.scheduled) return;
+        state.scheduled = true;
+        setTimeout(sweep, 0);
+    };
+    new MutationObserver(schedule).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class']
+    });
+    schedule();
+})();
+"""
+
+# 닫아야 할 팝업/배경이 지금 보이는지 (설치 직후 이미 떠 있던 팝업 정리 확인용)
+PENDING_JS = """
+const profile = arguments[0];
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+return [...profile.close, ...profile.hide].some(
+    selector => [...document.querySelectorAll(selector)].some(visible)
+);
+"""
+
+# 팝업 / 대상 요소 / 이미 끝난 상태 중 지금 어느 쪽인지 한 번에 확인한다.
+# 대상은 보이고, 비활성이 아니고, 가운데 지점이 다른 요소(팝업 배경 등)에 가리지 않아야 클릭 가능으로 본다.
+RACE_JS = """
+const [profile, selector, doneSelector] = arguments;
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const popup = [...profile.close, ...profile.hide].find(
+    sel => [...document.querySelectorAll(sel)].some(visible)
+);
+if (popup) {
+    if (window.__popupDismisser && !window.__popupDismisser.paused) window.__popupDismisser.sweep();
+    return {popup};
+}
+if (doneSelector && document.querySelector(doneSelector)) return {done: true};
+
+const target = document.querySelector(selector);
+if (!target || !visible(target) || target.disabled) return {};
+let rect = target.getBoundingClientRect();
+if (rect.top < 0 || rect.bottom > window.innerHeight) {
+    target.scrollIntoView({block: 'center'});
+    rect = target.getBoundingClientRect();
+}
+const hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+if (hit && !target.contains(hit) && !hit.contains(target)) return {};  // 다른 요소에 가림
+return {target};
+"""
+
+
+###############################################################################
+# 설치 / 제어
+###############################################################################
+def _script(platform):
+    profile = DISMISS_PROFILES[platform]
+    return DISMISSER_JS.replace("__PROFILE__", json.dumps(profile, ensure_ascii=False))
+
+
+def install_popup_dismisser(driver, platform):
+    """
+    드라이버에 플랫폼 팝업 닫기 스크립트를 설치한다 (새 문서마다 자동 실행 + 현재 문서에 즉시 실행).
+    :return: 새 문서에도 적용되면 True, 현재 문서에만 적용되면 False
+    """
+    source = _script(platform)
+    persistent = True
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    except WebDriverException as e:
+        logging.warning(f"[팝업] {platform} 자동 닫기 등록 실패 → 현재 페이지에만 적용: {e}")
+        persistent = False
+
+    try:
+        driver.execute_script(source)
+    except WebDriverException as e:
+        logging.warning(f"[팝업] {platform} 자동 닫기 현재 페이지 적용 실패: {e}")
+    logging.info(f"[팝업] {platform} 자동 닫기 설치 (닫기 {len(DISMISS_PROFILES[platform]['close'])}종)")
+    return persistent
+
+
+def _set_paused(driver, paused):
+    driver.execute_script(
+        "if (window.__popupDismisser) {"
+        "  window.__popupDismisser.paused = arguments[0];"
+        "  if (!arguments[0]) window.__popupDismisser.sweep();"
+        "}",
+        paused
+    )
+
+
+@contextmanager
+def popup_dismisser_paused(driver):
+    """일부러 연 팝업을 읽는 동안 자동 닫기를 멈춘다 (현재 문서 기준)."""
+    _set_paused(driver, True)
+    try:
+        yield
+    finally:
+        _set_paused(driver, False)
+
+
+def wait_popups_cleared(driver, platform, timeout=3):
+    """
+    지금 떠 있는 팝업이 닫힐 때까지만 기다린다. 팝업이 없으면 바로 True.
+    (팝업이 나타나기를 기다리지는 않는다)
+    """
+    profile = DISMISS_PROFILES[platform]
+    return wait_until(
+        driver, lambda d: not d.execute_script(PENDING_JS, profile), timeout, "팝업 자동 닫힘"
+    )
+
+
+def race_target(driver, platform, selector, timeout=10, label="대상", done_selector=None):
+    """
+    '알려진 팝업이 떴다'와 '대상 요소가 클릭 가능해졌다'를 한 대기 안에서 경합시킨다.
+    팝업이 먼저면 자동 닫기를 바로 돌리고 계속 기다리고, 대상이 가리지 않고 클릭 가능해지면 돌려준다.
+    팝업이 없는 날은 대상이 준비되는 즉시 끝난다.
+    :param done_selector: 이 요소가 이미 있으면 대상을 누를 필요가 없는 상태 (바로 None)
+    :return: 대상 WebElement, 이미 끝난 상태거나 시간 초과면 None
+    """
+    profile = DISMISS_PROFILES[platform]
+    seen = {"popups": [], "done": False}
+
+    def _condition(d):
+        state = d.execute_script(RACE_JS, profile, selector, done_selector)
+        if state.get("popup"):
+            if state["popup"] not in seen["popups"]:
+                seen["popups"].append(state["popup"])
+                logging.info(f"[팝업] {label} 대기 중 팝업 먼저 뜸 → 닫기: {state['popup']}")
+            return False
+        if state.get("done"):
+            seen["done"] = True
+            return True
+        return state.get("target") or False
+
+    result = wait_until(driver, _condition, timeout, f"{label} (팝업 경합)")
+    if seen["done"]:
+        logging.info(f"[팝업] {label}: 이미 완료된 화면 → 건너뜀")
+        return None
+    return result or None
+
+
+def dismissed_popups(driver):
+    """현재 문서에서 자동으로 닫은 팝업 기록 [{action, selector, at}]"""
+    try:
+        return driver.execute_script(
+            "return window.__popupDismisser ? window.__popupDismisser.dismissed : [];"
+        ) or []
+    except WebDriverException:
+        return []
+
+
+def log_dismissed_popups(driver, log=logging.info):
+    records = dismissed_popups(driver)
+    if records:
+        counts = {}
+        for r in records:
+            key = f"{r['action']} {r['selector']}"
+            counts[key] = counts.get(key, 0) + 1
+        log(f"[팝업] 자동으로 닫은 팝업 {len(records)}건 (현재 페이지 기준)")
+        for key, count in counts.items():
+            log(f"  {key}: {count}회")
+    else:
+        log("[팝업] 현재 페이지에서 자동으로 닫은 팝업 없음")
+    return records
@@ -0,0 +1,180 @@
+"""
+셀렉터 후보 순서 학습 캐시
+
+여러 후보 셀렉터를 정해진 순서로 하나씩 기다리면 (후보당 WebDriverWait 5초)
+맨 앞 후보가 낡았을 때 매 실행마다 몇 초씩 버린다. 여기서는 그룹별로
+지난번에 맞았던 후보를 기억해 두고 먼저 시도한다.
+
+1) 학습된 순서대로 모든 후보를 대기 없이 find_elements로 한 번씩 확인
+2) 아무것도 없으면 그때만 timeout 동안 모든 후보를 함께 폴링
+
+    el = find_first_match(driver, "baemin.login.password", ["input[type='password']", ...],
+                          timeout=5, predicate=is_usable)
+
+- "li", "div a" 같은 최후 후보는 catch_all로 넘기면 학습과 상관없이 항상 맨 뒤에서 시도
+  (넓은 셀렉터가 한 번 맞았다고 앞으로 올라오면 구체적인 후보를 다시는 못 쓴다)
+- 저장 위치: SELECTOR_CACHE_FILE 환경변수 (기본 ~/.cache/mugung-selectors.json)
+- log_selector_stats()로 그룹별 적중/실패 통계 출력 (실행 끝에 한 번 호출하면 저장도 함께)
+"""
+import os
+import json
+import time
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+###############################################################################
+# 설정값
+###############################################################################
+CACHE_FILE = os.getenv(
+    "SELECTOR_CACHE_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "mugung-selectors.json")
+)
+POLL_INTERVAL = 0.1
+
+
+def is_usable(element):
+    """보이고 활성화된 요소만 인정 (입력창/버튼용)"""
+    return element.is_displayed() and element.is_enabled()
+
+
+def has_text(element):
+    return bool(element.text.strip())
+
+
+###############################################################################
+# 캐시
+###############################################################################
+class SelectorCache:
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.groups = self._load()
+        self.run_stats = {}  # 이번 실행: group -> {"hits", "misses", "not_found"}
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self):
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.groups, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logging.warning(f"[셀렉터] 캐시 저장 실패: {e}")
+
+    def order(self, group, candidates, catch_all=()):
+        """마지막으로 맞은 후보 → 누적 적중 많은 후보 → 원래 순서 (catch_all은 항상 맨 뒤)"""
+        entry = self.groups.get(group, {})
+        wins = entry.get("wins", {})
+        last = entry.get("last")
+        return sorted(
+            candidates,
+            key=lambda sel: (
+                sel in catch_all, sel != last, -wins.get(sel, 0), candidates.index(sel)
+            )
+        )
+
+    def record(self, group, candidates, matched, catch_all=()):
+        stats = self.run_stats.setdefault(group, {"hits": 0, "misses": 0, "not_found": 0})
+        entry = self.groups.setdefault(group, {"wins": {}, "last": None, "hits": 0, "misses": 0})
+
+        if matched is None:
+            stats["not_found"] += 1
+            return
+
+        # 학습된 순서의 첫 후보가 맞았으면 적중
+        if self.order(group, candidates, catch_all)[0] == matched:
+            stats["hits"] += 1
+            entry["hits"] += 1
+        else:
+            stats["misses"] += 1
+            entry["misses"] += 1
+
+        entry["wins"][matched] = entry["wins"].get(matched, 0) + 1
+        self._dirty = True
+        if matched in catch_all:
+            logging.debug(f"[셀렉터] {group} 최후 후보로 찾음 → {matched}")
+        elif entry["last"] != matched:
+            entry["last"] = matched
+            entry["changed_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            logging.info(f"[셀렉터] {group} 우선 후보 변경 → {matched}")
+            self.flush()  # 순서가 바뀐 경우는 바로 저장
+
+    def _probe(self, ctx, by, ordered, single, predicate):
+        for sel in ordered:
+            try:
+                elements = ctx.find_elements(by, sel)
+                if predicate:
+                    elements = [e for e in elements if predicate(e)]
+            except WebDriverException:
+                continue
+            if elements:
+                return sel, (elements[0] if single else elements)
+        return None, None
+
+    def find(self, ctx, group, candidates, timeout=0, by=By.CSS_SELECTOR, single=True,
+             predicate=None, catch_all=()):
+        """
+        후보 중 처음 맞는 요소(single=False면 요소 목록)를 돌려준다. 없으면 None / [].
+        :param ctx: driver 또는 기준 WebElement
+        :param predicate: 요소별 추가 조건 (is_usable, has_text 등)
+        :param catch_all: 학습으로 앞당기지 않는 최후 후보
+        """
+        ordered = self.order(group, candidates, catch_all)
+        deadline = time.time() + timeout
+        while True:
+            matched, result = self._probe(ctx, by, ordered, single, predicate)
+            if matched or time.time() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        self.record(group, candidates, matched, catch_all)
+        if matched is None:
+            return None if single else []
+        return result
+
+    def stats(self):
+        return {
+            group: dict(run, last=self.groups.get(group, {}).get("last"))
+            for group, run in self.run_stats.items()
+        }
+
+
+_default_cache = None
+
+
+def _cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SelectorCache()
+    return _default_cache
+
+
+def find_first_match(ctx, group, candidates, timeout=0, by=By.CSS_SELECTOR, single=True,
+                     predicate=None, catch_all=()):
+    return _cache().find(ctx, group, candidates, timeout, by, single, predicate, catch_all)
+
+
+def log_selector_stats(log=logging.info):
+    """이번 실행의 그룹별 적중/실패 통계를 출력하고 캐시를 저장한다."""
+    cache = _cache()
+    cache.flush()
+    stats = cache.stats()
+    for group, s in sorted(stats.items()):
+        total = s["hits"] + s["misses"] + s["not_found"]
+        log(
+            f"[셀렉터] {group}: 적중 {s['hits']}/{total}, 대체 후보 {s['misses']}, "
+            f"못 찾음 {s['not_found']} (우선 후보: {s['last']})"
+        )
+    return stats
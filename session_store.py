@@ -0,0 +1,291 @@
+"""
+로그인 세션 저장소 (매장별 / 플랫폼별)
+
+로그인에 성공하면 쿠키 + localStorage를 암호화해서 디스크에 저장해 두고,
+다음 실행 때는 페이지 이동 전에 복원한 뒤 가볍게 "로그인 상태인가?"만 확인한다.
+세션이 만료된 경우에만 기존 로그인 함수를 실행한다.
+
+- 암호화 키: SESSION_STORE_KEY 환경변수 (Fernet 키, 없으면 저장소 비활성화)
+  키 만들기: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
+- 저장 위치: SESSION_STORE_DIR 환경변수 (기본 ~/.cache/mugung-sessions)
+
+    restore_or_login(driver, "songdo", "baemin",
+                     lambda: login_and_close_popup(driver, wait, baemin_id, baemin_pw))
+"""
+import os
+import json
+import time
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # 암호화 모듈이 없으면 저장소 없이 매번 로그인
+    Fernet = None
+    InvalidToken = Exception
+
+###############################################################################
+# 설정값
+###############################################################################
+STORE_DIR = os.getenv(
+    "SESSION_STORE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "mugung-sessions")
+)
+SNAPSHOT_MAX_AGE = 60 * 60 * 24 * 7  # 7일 지난 스냅샷은 확인 없이 버림
+PROBE_TIMEOUT = 6
+
+# 플랫폼별 로그인 확인 기준
+# - home_url: 복원 후 이동할 주소 (None이면 로그인 직후 주소를 저장해서 사용)
+# - login_marker: 보이면 "로그인 안 됨"
+# - ready_marker: 보이면 "로그인 됨"
+PLATFORMS = {
+    "baemin": {
+        "home_url": "https://self.baemin.com/",
+        "login_marker": "input[type='password']",
+        "ready_marker": "div.frame-container",
+    },
+    "coupang": {
+        "home_url": "https://store.coupangeats.com/merchant/management",
+        "login_marker": "#loginId",
+        "ready_marker": "#merchant-management",
+    },
+    "yogiyo": {
+        "home_url": "https://ceo.yogiyo.co.kr/self-service-home/",
+        "login_marker": "input[type='password']",
+        "ready_marker": "#common-layout-wrapper-id",
+    },
+    "point": {
+        "home_url": None,
+        "login_marker": "#mid",
+        "ready_marker": "section > div.grid.grid-cols-2",  # 방문 통계 카드 (로그인 후 통계 화면에만 있음)
+    },
+    "okpos": {
+        "home_url": None,
+        "login_marker": "#user_id",
+        "ready_marker": "#divTopFrameHead",
+    },
+    "easypos": {
+        "home_url": "https://smart.easypos.net/index.jsp",
+        "login_marker": "#mainframe_childframe_form_divMain_edtId_input",
+        "ready_marker": "#mainframe_childframe_form_divTop_img_TA_top_menu3",
+    },
+}
+
+# 메인 문서 + 1단계 하위 프레임까지 확인 (OKPOS/EasyPOS는 프레임 안에 화면이 있음)
+PROBE_JS = """
+const [loginSel, readySel] = arguments;
+const docs = [document];
+for (let i = 0; i < window.frames.length; i++) {
+    try { if (window.frames[i].document) docs.push(window.frames[i].document); } catch (e) {}
+}
+const visible = sel => docs.some(d => {
+    const el = d.querySelector(sel);
+    return !!el && el.getClientRects().length > 0;
+});
+if (document.readyState === 'loading') return null;
+if (visible(loginSel)) return false;
+if (visible(readySel)) return true;
+return null;
+"""
+
+# 새 문서가 열릴 때 해당 origin이면 localStorage를 한 번만 채워 넣음
+RESTORE_STORAGE_JS = """
+(function () {
+    const origin = %s;
+    const items = %s;
+    if (location.origin !== origin || sessionStorage.getItem('__mugung_restored')) return;
+    for (const [k, v] of Object.entries(items)) localStorage.setItem(k, v);
+    sessionStorage.setItem('__mugung_restored', '1');
+})();
+"""
+
+COOKIE_PARAM_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+###############################################################################
+# 저장소
+###############################################################################
+class SessionStore:
+    def __init__(self, store, platform, store_dir=STORE_DIR, key=None):
+        self.store = store
+        self.platform = platform
+        self.config = PLATFORMS[platform]
+        self.store_dir = store_dir
+        key = key or os.getenv("SESSION_STORE_KEY")
+        self.fernet = Fernet(key.encode()) if (key and Fernet) else None
+
+    @property
+    def enabled(self):
+        return self.fernet is not None
+
+    @property
+    def path(self):
+        return os.path.join(self.store_dir, f"{self.store}-{self.platform}.bin")
+
+    # ---------------------------------------------------------------
+    # 스냅샷 읽기/쓰기
+    # ---------------------------------------------------------------
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = json.loads(self.fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken):
+            return None
+        if time.time() - snapshot.get("saved_at", 0) > SNAPSHOT_MAX_AGE:
+            return None
+        return snapshot
+
+    def save(self, driver, login_seconds):
+        """로그인 직후 호출. (localStorage는 최상위 문서 기준이라 default_content로 전환됨)"""
+        driver.switch_to.default_content()
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        origin = driver.execute_script("return location.origin;")
+        local_storage = driver.execute_script(
+            "const o = {}; for (let i = 0; i < localStorage.length; i++) {"
+            " const k = localStorage.key(i); o[k] = localStorage.getItem(k); } return o;"
+        )
+        snapshot = {
+            "saved_at": time.time(),
+            "home_url": driver.current_url,
+            "origin": origin,
+            "cookies": cookies,
+            "local_storage": local_storage or {},
+            "login_seconds": round(login_seconds, 2),
+        }
+        os.makedirs(self.store_dir, exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(self.fernet.encrypt(json.dumps(snapshot, ensure_ascii=False).encode()))
+        logging.info(f"[세션] {self.store}/{self.platform} 세션 저장 (쿠키 {len(cookies)}개)")
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    # ---------------------------------------------------------------
+    # 복원 + 로그인 상태 확인
+    # ---------------------------------------------------------------
+    def restore(self, driver, snapshot, home_url=None):
+        cookies = [
+            {k: c[k] for k in COOKIE_PARAM_KEYS if k in c and not (k == "expires" and c[k] < 0)}
+            for c in snapshot["cookies"]
+        ]
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+        script_id = None
+        if snapshot["local_storage"]:
+            source = RESTORE_STORAGE_JS % (
+                json.dumps(snapshot["origin"]), json.dumps(snapshot["local_storage"], ensure_ascii=False)
+            )
+            script_id = driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )["identifier"]
+
+        driver.get(home_url or self.config["home_url"] or snapshot["home_url"])
+        logged_in = self.probe(driver)
+
+        if script_id:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+        return logged_in
+
+    def probe(self, driver, timeout=PROBE_TIMEOUT):
+        """로그인 상태면 True. 로그인 화면이 보이거나 시간 안에 판단이 안 되면 False"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                state = driver.execute_script(
+                    PROBE_JS, self.config["login_marker"], self.config["ready_marker"]
+                )
+            except WebDriverException:
+                state = None
+            if state is not None:
+                return state
+            time.sleep(0.2)
+        return False
+
+
+###############################################################################
+# 적중률 통계
+###############################################################################
+def _record_stats(store_dir, key, hit, saved_seconds):
+    path = os.path.join(store_dir, "stats.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        stats = {}
+
+    entry = stats.setdefault(key, {"hits": 0, "misses": 0, "saved_seconds": 0.0})
+    if hit:
+        entry["hits"] += 1
+        entry["saved_seconds"] = round(entry["saved_seconds"] + max(saved_seconds, 0), 2)
+    else:
+        entry["misses"] += 1
+
+    os.makedirs(store_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    return entry
+
+
+def restore_or_login(driver, store, platform, login_func, home_url=None, store_dir=STORE_DIR):
+    """
+    저장된 세션으로 로그인 상태 복원을 시도하고, 실패할 때만 login_func()을 실행한다.
+    새 로그인은 login_func()이 False를 돌려주지 않고 로그인 확인을 통과할 때만 저장한다.
+    :return: True면 세션 복원, False면 새로 로그인
+    """
+    session = SessionStore(store, platform, store_dir=store_dir)
+    key = f"{store}/{platform}"
+
+    if not session.enabled:
+        logging.info(f"[세션] SESSION_STORE_KEY 없음 → {key} 일반 로그인")
+        login_func()
+        return False
+
+    started = time.time()
+    snapshot = session.load()
+    if snapshot:
+        try:
+            if session.restore(driver, snapshot, home_url):
+                elapsed = time.time() - started
+                saved = snapshot.get("login_seconds", 0) - elapsed
+                entry = _record_stats(store_dir, key, True, saved)
+                total = entry["hits"] + entry["misses"]
+                logging.info(
+                    f"[세션] {key} 세션 복원 성공 {elapsed:.1f}s (로그인 대비 {saved:.1f}s 절약) "
+                    f"| 적중률 {entry['hits']}/{total} ({entry['hits'] / total:.0%}), "
+                    f"누적 절약 {entry['saved_seconds']:.0f}s"
+                )
+                return True
+            logging.info(f"[세션] {key} 세션 만료 → 로그인 진행")
+        except WebDriverException as e:
+            logging.warning(f"[세션] {key} 세션 복원 실패 → 로그인 진행: {e}")
+        session.discard()
+    else:
+        logging.info(f"[세션] {key} 저장된 세션 없음 → 로그인 진행")
+
+    login_started = time.time()
+    result = login_func()
+    login_seconds = time.time() - login_started
+
+    # 실패했거나 덜 끝난 로그인을 저장하면 다음 실행부터 그 상태가 복원되므로,
+    # login_func이 False를 돌려주지 않았고 로그인 확인(ready_marker)도 통과할 때만 저장
+    try:
+        driver.switch_to.default_content()
+        if result is not False and session.probe(driver):
+            session.save(driver, login_seconds)
+        else:
+            logging.warning(f"[세션] {key} 로그인 상태가 확인되지 않아 세션 저장 안 함")
+    except WebDriverException as e:
+        logging.warning(f"[세션] {key} 세션 저장 실패: {e}")
+
+    entry = _record_stats(store_dir, key, False, 0)
+    total = entry["hits"] + entry["misses"]
+    logging.info(
+        f"[세션] {key} 로그인 {login_seconds:.1f}s | 적중률 {entry['hits']}/{total} "
+        f"({entry['hits'] / total:.0%})"
+    )
+    return False
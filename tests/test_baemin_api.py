@@ -0,0 +1,39 @@
+import os
+
+from order_api import load_fixture
+from baemin_api import parse_orders, is_canceled, looks_complete
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def payload_of(name):
+    _, payload = load_fixture(os.path.join(FIXTURE_DIR, name))
+    return payload
+
+
+def test_parse_orders_reads_order_no_total_and_qty():
+    orders = parse_orders(payload_of("baemin-orders-page1.json"))
+
+    assert [o["order_no"] for o in orders] == ["B2610161A2B3", "B2610161C4D5", "B2610161E6F7"]
+    assert [o["total"] for o in orders] == [47000, 21000, 31000]
+    assert [(i["name"], i["qty"]) for i in orders[0]["items"]] == [("낙지볶음", 2), ("코카콜라", 1)]
+    assert [(i["name"], i["qty"]) for i in orders[2]["items"]] == [("낙지비빔밥", 3), ("제로콜라", 1)]
+    assert looks_complete(orders)
+
+
+def test_canceled_orders_are_marked():
+    orders = parse_orders(payload_of("baemin-orders-page1.json"))
+
+    assert [is_canceled(o) for o in orders] == [False, True, False]
+
+
+def test_missing_qty_is_not_defaulted_and_fails_completeness():
+    orders = parse_orders(payload_of("baemin-orders-no-qty.json"))
+
+    assert [i["qty"] for i in orders[0]["items"]] == [2, None]
+    assert not looks_complete(orders)
+
+
+def test_empty_payload_is_not_complete():
+    assert parse_orders({"data": {"contents": []}}) == []
+    assert not looks_complete([])
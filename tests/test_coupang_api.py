@@ -0,0 +1,72 @@
+import os
+import json
+
+from order_api import load_fixture
+from coupang_api import (
+    parse_orders, is_canceled, looks_complete, parse_revenue, page_count, find_paging, request_for_page
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture(name):
+    return load_fixture(os.path.join(FIXTURE_DIR, name))
+
+
+def test_parse_orders_reads_order_id_total_and_qty():
+    _, payload = fixture("coupang-orders-page1.json")
+    orders = parse_orders(payload)
+
+    assert [o["order_id"] for o in orders] == ["1A2B3C", "4D5E6F", "7G8H9I"]
+    assert [o["total"] for o in orders] == [41000, 21000, 47000]
+    assert [(i["name"], i["qty"]) for i in orders[0]["items"]] == [("낙지볶음", 2), ("코카콜라", 2)]
+    assert [(i["name"], i["qty"]) for i in orders[2]["items"]] == [("낙지비빔밥", 4), ("카스", 1)]
+    assert [is_canceled(o) for o in orders] == [False, True, False]
+    assert looks_complete(orders)
+
+
+def test_revenue_and_page_count_come_from_outside_the_orders():
+    _, payload = fixture("coupang-orders-page1.json")
+
+    assert parse_revenue(payload) == 88000
+    assert page_count(payload, 3) == 2
+
+
+def test_money_total_is_not_read_as_order_count():
+    payload = {"summary": {"total": 88000}, "orders": []}
+
+    assert page_count(payload, 10) is None
+
+
+def test_total_next_to_paging_info_is_order_count():
+    _, payload = fixture("coupang-orders-body-paging.json")
+
+    assert page_count(payload, 10) == 3
+
+
+def test_missing_qty_is_not_defaulted_and_fails_completeness():
+    _, payload = fixture("coupang-orders-body-paging.json")
+    orders = parse_orders(payload)
+
+    assert orders[0]["items"][0]["qty"] is None
+    assert not looks_complete(orders)
+
+
+def test_next_page_request_in_query():
+    request, _ = fixture("coupang-orders-page1.json")
+    paging = find_paging(request)
+
+    assert paging == {"where": "query", "key": "pageNumber", "page": 0, "size": 3}
+    next_request = request_for_page(request, paging, 1)
+    assert "pageNumber=1" in next_request["url"] and "pageNumber=0" not in next_request["url"]
+    assert next_request["headers"] == {"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"}
+
+
+def test_next_page_request_in_json_body():
+    request, _ = fixture("coupang-orders-body-paging.json")
+    paging = find_paging(request)
+
+    assert paging == {"where": "body", "key": "page", "page": 1, "size": 10}
+    next_request = request_for_page(request, paging, 2)
+    assert json.loads(next_request["postData"]) == {"storeId": 123, "page": 2, "size": 10}
+    assert next_request["headers"] == {"Content-Type": "application/json"}
@@ -0,0 +1,53 @@
+import os
+import datetime
+
+from order_api import load_fixture
+from yogiyo_api import parse_orders, is_canceled, looks_complete
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def payload_of(name):
+    _, payload = load_fixture(os.path.join(FIXTURE_DIR, name))
+    return payload
+
+
+def test_parse_orders_reads_order_no_date_total_and_qty():
+    orders = parse_orders(payload_of("yogiyo-orders-page1.json"))
+
+    assert [o["order_no"] for o in orders] == ["2610161234", "2610161235", "2610151198"]
+    assert [o["total"] for o in orders] == [40000, 15000, 33000]
+    assert [o["date"] for o in orders] == [
+        datetime.date(2026, 10, 16), datetime.date(2026, 10, 16), datetime.date(2026, 10, 15)
+    ]
+    assert [is_canceled(o) for o in orders] == [False, True, False]
+    assert looks_complete(orders)
+
+
+def test_delivery_fee_is_not_an_item():
+    orders = parse_orders(payload_of("yogiyo-orders-page1.json"))
+
+    assert [(i["name"], i["qty"]) for i in orders[0]["items"]] == [("낙지볶음", 2), ("코카콜라", 1)]
+
+
+def test_amount_is_not_read_as_qty():
+    orders = parse_orders(payload_of("yogiyo-orders-page1.json"))
+
+    assert [(i["name"], i["qty"]) for i in orders[2]["items"]] == [("낙지파전", 1), ("낙지비빔밥", 1)]
+
+
+def test_missing_qty_is_not_defaulted_and_fails_completeness():
+    orders = parse_orders(payload_of("yogiyo-orders-no-qty.json"))
+
+    assert [i["qty"] for i in orders[0]["items"]] == [2, None]
+    assert not looks_complete(orders)
+
+
+def test_order_without_date_is_not_complete():
+    orders = parse_orders({"results": [{
+        "order_number": "1", "total_price": 18000,
+        "order_items": [{"menu_name": "낙지볶음", "quantity": 1}],
+    }]})
+
+    assert orders[0]["date"] is None
+    assert not looks_complete(orders)
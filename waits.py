@@ -0,0 +1,256 @@
+"""
+조건 기반 대기 (고정 time.sleep 대체)
+
+"3초면 되겠지" 대신 화면이 실제로 준비됐다는 조건을 짧은 간격으로 확인하고,
+조건마다 실제로 걸린 시간을 기록해서 실행이 끝날 때 요약을 남긴다.
+
+    wait_until(driver, url_contains("management"), 10, "로그인 후 이동")
+    wait_until(driver, text_changed(FIRST_ROW, before), 10, "페이지 전환")
+    wait_dom_settled(driver, "table tbody", quiet_ms=300, label="목록 렌더링")
+    log_wait_summary()
+
+- 시간 안에 조건이 안 맞으면 False를 돌려주고 진행 (raise_on_timeout=True면 TimeoutException)
+- WAIT_STATS_FILE 환경변수가 있으면 요약을 JSON Lines로 추가 저장
+"""
+import os
+import json
+import time
+import logging
+import statistics
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException
+)
+
+###############################################################################
+# 설정값
+###############################################################################
+POLL_INTERVAL = 0.1
+WAIT_STATS_FILE = os.getenv("WAIT_STATS_FILE")
+
+# (이름, 걸린 시간, 성공 여부)
+_records = []
+
+# 대상 하위 트리에 quietMs 동안 변경(MutationObserver)이 없으면 완료.
+# requireChange면 첫 변경이 생긴 뒤부터 조용한 시간을 잰다 (클릭 직후 렌더링 시작 전 오판 방지).
+DOM_SETTLED_JS = """
+const [selector, quietMs, timeoutMs, requireChange, done] = arguments;
+const started = performance.now();
+let mutations = 0, quietTimer = null, finished = false, observer = null;
+
+const finish = (settled, reason) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    clearInterval(finder);
+    done({settled, reason, mutations, elapsed: performance.now() - started});
+};
+const armQuietTimer = () => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true, 'quiet'), quietMs);
+};
+const attach = target => {
+    observer = new MutationObserver(list => { mutations += list.length; armQuietTimer(); });
+    observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+    if (!requireChange) armQuietTimer();
+};
+const deadline = setTimeout(() => finish(false, observer ? 'timeout' : 'missing'), timeoutMs);
+
+// 대상이 아직 없으면 나타날 때까지 찾는다
+const find = () => selector ? document.querySelector(selector) : document.body;
+let finder = null;
+const first = find();
+if (first) {
+    attach(first);
+} else {
+    finder = setInterval(() => {
+        const target = find();
+        if (target) { clearInterval(finder); attach(target); }
+    }, 50);
+}
+"""
+
+
+###############################################################################
+# 대기
+###############################################################################
+def record_wait(label, elapsed, ok):
+    """다른 대기 방식(네트워크 유휴 등)도 같은 요약에 남긴다."""
+    _records.append((label, elapsed, ok))
+
+
+def wait_until(driver, condition, timeout=10, label="조건", poll=POLL_INTERVAL, raise_on_timeout=False):
+    """
+    condition(driver)가 참이 될 때까지 poll 간격으로 확인한다.
+    :return: 조건 함수의 결과 (시간 초과 시 False)
+    """
+    started = time.time()
+    try:
+        result = WebDriverWait(
+            driver, timeout, poll_frequency=poll,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        ).until(condition)
+    except TimeoutException:
+        elapsed = time.time() - started
+        record_wait(label, elapsed, False)
+        logging.info(f"[대기] {label} 시간 초과 ({timeout}s)")
+        if raise_on_timeout:
+            raise
+        return False
+
+    elapsed = time.time() - started
+    record_wait(label, elapsed, True)
+    logging.debug(f"[대기] {label} {elapsed:.2f}s")
+    return result
+
+
+def wait_dom_settled(driver, selector=None, quiet_ms=300, timeout=10, label="DOM 안정",
+                     require_change=False):
+    """
+    selector 하위 트리(None이면 body)에 quiet_ms 동안 DOM 변경이 없을 때까지 기다린다.
+    브라우저 안에서 MutationObserver로 판단하므로 execute_async_script 한 번으로 끝난다.
+    :return: 안정되면 True, 시간 초과/대상 없음이면 False
+    """
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        result = driver.execute_async_script(
+            DOM_SETTLED_JS, selector, quiet_ms, int(timeout * 1000), require_change
+        )
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
+    elapsed = result["elapsed"] / 1000
+    record_wait(label, elapsed, result["settled"])
+    if result["settled"]:
+        logging.debug(f"[대기] {label} {elapsed:.2f}s (변경 {result['mutations']}회)")
+    else:
+        logging.info(f"[대기] {label} 안정되지 않음 ({result['reason']}, {timeout}s)")
+    return result["settled"]
+
+
+###############################################################################
+# 조건 (driver를 받아 참/거짓을 돌려주는 함수)
+###############################################################################
+def url_contains(text):
+    return lambda d: text in d.current_url
+
+
+def document_ready():
+    return lambda d: d.execute_script("return document.readyState") == "complete"
+
+
+def element_present(locator):
+    return lambda d: d.find_element(*locator)
+
+
+def element_gone(locator):
+    """요소가 없거나 보이지 않으면 참 (팝업 닫힘, 로딩 오버레이 사라짐 등)"""
+    def _condition(d):
+        elements = d.find_elements(*locator)
+        return not any(e.is_displayed() for e in elements)
+    return _condition
+
+
+def element_stale(element):
+    """클릭 전에 잡아둔 요소가 DOM에서 교체되면 참"""
+    def _condition(_):
+        try:
+            element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+    return _condition
+
+
+def text_of(driver, locator):
+    """현재 텍스트 (요소가 없으면 None). text_changed와 짝으로 사용"""
+    try:
+        return driver.find_element(*locator).text
+    except (NoSuchElementException, StaleElementReferenceException):
+        return None
+
+
+def text_changed(locator, before):
+    """요소 텍스트가 before와 달라지면 참 (목록 페이지 전환, 조회 결과 갱신 등)"""
+    def _condition(d):
+        current = d.find_element(*locator).text
+        return current != before and current.strip() != ""
+    return _condition
+
+
+def count_at_least(locator, count):
+    return lambda d: len(d.find_elements(*locator)) >= count
+
+
+def frame_ready(frame_reference, locator):
+    """프레임으로 전환한 뒤 그 안에 locator가 보이면 참 (EasyPOS/OKPOS 프레임 화면용)"""
+    def _condition(d):
+        d.switch_to.default_content()
+        d.switch_to.frame(frame_reference)
+        return d.find_element(*locator).is_displayed()
+    return _condition
+
+
+def any_of(*conditions):
+    """조건 중 하나라도 참이면 참"""
+    return EC.any_of(*conditions)
+
+
+def css(selector):
+    return (By.CSS_SELECTOR, selector)
+
+
+###############################################################################
+# 기록 요약
+###############################################################################
+def wait_stats():
+    """이름별 {count, median, max, timeouts} (초)"""
+    grouped = {}
+    for label, elapsed, ok in _records:
+        grouped.setdefault(label, []).append((elapsed, ok))
+
+    stats = {}
+    for label, rows in grouped.items():
+        done = [e for e, ok in rows if ok]
+        stats[label] = {
+            "count": len(rows),
+            "median": round(statistics.median(done), 3) if done else None,
+            "max": round(max(done), 3) if done else None,
+            "timeouts": sum(1 for _, ok in rows if not ok),
+            "total": round(sum(e for e, _ in rows), 3),
+        }
+    return stats
+
+
+def log_wait_summary(script_name=None, log=logging.info):
+    """실행 중 기록된 대기 시간 요약 출력 (print 로그를 쓰는 스크립트는 log=print)"""
+    stats = wait_stats()
+    if not stats:
+        return stats
+
+    total = sum(s["total"] for s in stats.values())
+    log(f"[대기] 조건 대기 요약: {len(_records)}회, 합계 {total:.1f}s")
+    for label, s in sorted(stats.items(), key=lambda kv: -kv[1]["total"]):
+        median = f"{s['median']:.2f}s" if s["median"] is not None else "-"
+        worst = f"{s['max']:.2f}s" if s["max"] is not None else "-"
+        log(
+            f"  {label}: {s['count']}회, 중앙값 {median}, 최대 {worst}, "
+            f"시간 초과 {s['timeouts']}회, 합계 {s['total']:.1f}s"
+        )
+
+    if WAIT_STATS_FILE:
+        with open(WAIT_STATS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "script": script_name,
+                "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "waits": stats,
+            }, ensure_ascii=False) + "\n")
+    return stats
@@ -0,0 +1,113 @@
+"""
+요기요 사장님 사이트 주문내역 API 응답 캡처 / 파서
+
+주문내역 화면은 목록을 그리기 위해 이미 주문 JSON을 받아 온다. 행마다 상세 팝업을
+열고(3초 대기) 닫는 대신, 그 응답을 성능 로그 + CDP Network.getResponseBody로 받아
+메뉴명 / 수량 / 주문금액 / 주문 일시 / 상태를 바로 꺼낸다.
+
+    capture = OrderApiCapture(driver).start()    # 주문내역 화면 진입 전
+    go_order_history(driver)
+    orders = capture.take_new()                  # 새로 받은 주문들
+
+- 응답 필드 이름은 화면 버전에 따라 달라질 수 있어 후보 키 목록(FIELDS)으로 찾는다
+  (파서 / 캡처 본체는 order_api 공용)
+- YOGIYO_CAPTURE_DIR 환경변수가 있으면 받은 응답 원문을 저장 (오프라인 파서 확인용 픽스처)
+
+오프라인 확인 (저장해 둔 응답으로 파서만 실행):
+
+    python yogiyo_api.py parse captures/yogiyo-orders-*.json
+
+픽스처 테스트: python -m pytest tests (tests/fixtures/yogiyo-orders-*.json)
+"""
+import os
+import re
+import sys
+import datetime
+
+import order_api
+
+###############################################################################
+# 설정값
+###############################################################################
+ORDER_API_PATTERNS = ["*ceo.yogiyo.co.kr/api/*order*", "*ceo-api.yogiyo.co.kr/*order*"]
+CAPTURE_DIR = os.getenv("YOGIYO_CAPTURE_DIR")
+
+DATE_RE = re.compile(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})")
+
+
+def _to_date(value):
+    """ISO 문자열 / 'YYYY.MM.DD ...' / epoch(초·밀리초) → date (모르면 None)"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 10 ** 11 else value
+        return datetime.datetime.fromtimestamp(seconds).date()
+    match = DATE_RE.search(str(value))
+    if not match:
+        return None
+    try:
+        return datetime.date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+# 응답 필드 후보 (앞에서부터 먼저 찾은 키 사용)
+# 수량 후보에 "amount"는 넣지 않는다 (요기요 응답에서 amount는 금액일 수 있음)
+FIELDS = {
+    "id": "order_no",
+    "order_id": ("orderNumber", "orderNo", "orderId", "order_number", "order_id"),
+    "items": ("items", "orderItems", "menus", "menuItems", "orderMenus", "order_items"),
+    "item_name": ("name", "menuName", "itemName", "productName", "menu_name"),
+    "item_qty": ("quantity", "count", "qty"),
+    "item_price": ("totalPrice", "price", "menuPrice", "total_price"),
+    "status": ("status", "orderStatus", "statusName", "order_status"),
+    "total": ("totalOrderPrice", "orderPrice", "totalPrice", "paymentAmount", "totalAmount", "total_price"),
+    "canceled_markers": ("CANCEL", "REJECT", "취소"),
+    "extra": {
+        "date": (("orderedAt", "orderDate", "orderTime", "createdAt", "submittedAt",
+                  "ordered_at", "created_at"), _to_date),
+    },
+    # 상세 팝업에서도 품목으로 세지 않던 줄
+    "skip_items": ("배달요금",),
+    # 시트에 금액과 날짜 기준 집계가 들어가므로 둘 다 필요
+    "required": ("date", "total"),
+}
+
+
+###############################################################################
+# 파서 (브라우저 없이 JSON만으로 동작)
+###############################################################################
+def parse_orders(payload):
+    """:return: [{order_no, status, total, date, items: [{name, qty, price}]}]"""
+    return order_api.parse_orders(payload, FIELDS)
+
+
+def is_canceled(order):
+    return order_api.is_canceled(order, FIELDS)
+
+
+def looks_complete(orders):
+    """모든 주문에 주문 일시 / 주문금액이 있고, 모든 메뉴에 이름/수량이 있음"""
+    return order_api.looks_complete(orders, FIELDS)
+
+
+###############################################################################
+# 캡처
+###############################################################################
+class OrderApiCapture(order_api.OrderApiCapture):
+    label = "요기요 API"
+    file_prefix = "yogiyo-orders"
+    fields = FIELDS
+    patterns = ORDER_API_PATTERNS
+    save_dir = CAPTURE_DIR
+
+
+###############################################################################
+# 오프라인 확인
+###############################################################################
+def main():
+    return order_api.parse_cli("요기요 주문내역 API 응답 파서", FIELDS)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+요기요 매장 설정 (한 계정에 송도점 / 청라점이 함께 등록되어 있음)
+
+매장 셀렉터에서의 순서, 정산서 스프레드시트 / 시트 이름, 재고 시트 품목 → 셀 매핑.
+1-songdo-yogiyo-auto.py / 2-chengla-yogiyo-auto.py가 함께 쓰며, 기본은 스크립트 자기 매장만 집계한다.
+
+    YOGIYO_STORES=songdo,chengla    # 한 번 로그인해서 적은 순서대로 매장을 바꿔 가며 집계
+"""
+import os
+
+STORES = {
+    "songdo": {
+        "name": "송도점",
+        "selector_index": 1,    # 매장 셀렉터 목록의 li 순서
+        "spreadsheet": "송도 일일/월말 정산서",
+        "daily_sheet": "송도",
+        "inventory_clear_ranges": ["F38:F45", "Q38:Q45", "AF38:AF45", "AR38:AR45", "BC38:BC45"],
+        "inventory_cells": {
+            '백골뱅이숙회': 'F45',
+            '얼큰소국밥': 'Q38',
+            '낙지비빔밥': 'AF38',
+            '낙지볶음': 'AF40',
+            '낙지파전': 'AF39',
+            '우삼겹김치전': 'Q39',
+            '두부김치제육': 'Q40',
+            '육회비빔밥': 'F42',
+            '숙주갈비탕': 'F38',
+            '갈비찜덮밥': 'F39',
+            '육전': 'Q44',
+            '육회': 'F43',
+            '육사시미': 'F44',
+            '갈비수육': 'F40',
+            '소갈비찜': 'F41',
+            '소불고기': 'Q42',
+            '코카콜라': 'AF42',
+            '스프라이트': 'AF43',
+            '토닉워터': 'AF44',
+            '제로콜라': 'AF41',
+            '만월': 'AR39',
+            '문배술25': 'AR40',
+            '로아 화이트': 'AR43',
+            '황금보리': 'AR38',
+            '왕율주': 'AR41',
+            '왕주': 'AR42',
+            '청하': 'BC38',
+            '참이슬 후레쉬': 'BC39',
+            '처음처럼': 'BC40',
+            '새로': 'BC42',
+            '진로이즈백': 'BC41',
+            '카스': 'BC43',
+            '테라': 'BC44',
+            '켈리': 'BC45',
+            '소성주막걸리': 'AR45'
+        },
+    },
+    "chengla": {
+        "name": "청라점",
+        "selector_index": 2,
+        "spreadsheet": "청라 일일/월말 정산서",
+        "daily_sheet": "청라",
+        "inventory_clear_ranges": ["F38:F45", "Q38:Q45", "AG38:AG45", "AS38:AS45", "BD38:BD45"],
+        "inventory_cells": {
+            '백골뱅이숙회': 'F45',
+            '얼큰소국밥': 'Q38',
+            '낙지비빔밥': 'AG38',
+            '낙지볶음': 'AG40',
+            '낙지파전': 'AG39',
+            '우삼겹김치전': 'Q39',
+            '두부김치제육': 'Q40',
+            '육회비빔밥': 'F42',
+            '숙주갈비탕': 'F38',
+            '갈비찜덮밥': 'F39',
+            '육전': 'Q44',
+            '육회': 'F43',
+            '육사시미': 'F44',
+            '갈비수육': 'F40',
+            '소갈비찜': 'F41',
+            '소불고기': 'Q42',
+            '코카콜라': 'AG42',
+            '스프라이트': 'AG43',
+            '토닉워터': 'AG44',
+            '제로콜라': 'AG41',
+            '만월': 'AS39',
+            '문배술25': 'AS40',
+            '로아 화이트': 'AS43',
+            '황금보리': 'AS38',
+            '왕율주': 'AS41',
+            '왕주': 'AS42',
+            '청하': 'BD38',
+            '참이슬 후레쉬': 'BD39',
+            '처음처럼': 'BD40',
+            '새로': 'BD42',
+            '진로이즈백': 'BD41',
+            '카스': 'BD43',
+            '테라': 'BD44',
+            '켈리': 'BD45',
+            '소성주막걸리': 'AS45'
+        },
+    },
+}
+
+
+def target_stores(default):
+    """집계할 매장 키 목록 (YOGIYO_STORES가 없으면 스크립트 기본 매장 하나)"""
+    raw = os.getenv("YOGIYO_STORES")
+    if not raw:
+        return [default]
+    stores = [key.strip() for key in raw.split(",") if key.strip()]
+    unknown = [key for key in stores if key not in STORES]
+    if unknown:
+        raise ValueError(f"YOGIYO_STORES에 알 수 없는 매장: {unknown} (가능: {', '.join(STORES)})")
+    return list(dict.fromkeys(stores))